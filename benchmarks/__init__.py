@@ -0,0 +1 @@
+"""Reproducible benchmarks for the Sensyva audit engine. Run each module with ``python -m benchmarks.<name>``."""
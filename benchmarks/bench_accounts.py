@@ -0,0 +1,210 @@
+"""Insert latency and match quality of LeadIndex as it grows to a million leads.
+
+A synthetic lead stream mimics the form traffic: about half of all
+submissions are repeats by a contact trying another scenario (sometimes
+with the email's case or a ``+tag`` changed), and new contacts often join
+an account that already exists. Company names arrive with legal suffixes,
+job titles, odd casing and the occasional typo; most accounts use a
+corporate domain, the rest free mail, where only the company name can tie
+colleagues together.
+
+The benchmark times every ``LeadIndex.add`` and reports the latency
+percentiles per tenth of the stream, so any growth with the size of the
+index shows up, then scores the result against the generator's ground
+truth: repeat-submission precision/recall, and pairwise precision/recall
+of the account assignment (two leads filed together that belong together).
+Finally it writes the stream to a ``data_gap_leads`` table and times
+``LeadIndex.from_sqlite``. It exits non-zero if the overall p99 insert
+latency reaches ``--p99-budget-ms``.
+
+Usage:
+    python -m benchmarks.bench_accounts [--leads 1000000] [--p99-budget-ms 1.0] [--skip-rebuild]
+"""
+import argparse
+import gc
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from sensyva_audit.accounts import LeadIndex, normalize_company
+from sensyva_audit.leads import Lead, LeadWriter
+
+CONSONANTS = "bcdfghjklmnprstvz"
+VOWELS = "aeiou"
+INDUSTRY_WORDS = (
+    "Steel", "Power", "Logistics", "Forge", "Motors", "Chemicals", "Textiles", "Cement", "Engineering",
+    "Dynamics", "Industries", "Energy", "Castings", "Polymers", "Rail", "Marine", "Refineries", "Foods",
+)
+LEGAL_SUFFIXES = ("", "", " Pvt Ltd", " Private Limited", " Ltd.", " Limited", " Inc", " LLP")
+TITLES = (", Plant Head", " - Maintenance Manager", " | CTO", ", VP Operations", " (Reliability Lead)")
+FREE_MAIL = ("gmail.com", "yahoo.co.in", "outlook.com", "rediffmail.com", "hotmail.com")
+CORPORATE_SUFFIXES = (".com", ".in", ".co.in")
+INDUSTRIES = ("Manufacturing", "Energy", "Logistics", "Defense", "Other")
+
+
+def _word(rng, syllables: int) -> str:
+    return "".join(CONSONANTS[rng.integers(len(CONSONANTS))] + VOWELS[rng.integers(len(VOWELS))] for _ in range(syllables))
+
+
+def _typo(rng, text: str) -> str:
+    """One substituted, dropped or swapped letter inside the first word."""
+    end = text.find(" ")
+    position = int(rng.integers(1, max(end - 1, 2)))
+    kind = rng.integers(3)
+    if kind == 0:
+        return text[:position] + "xqwy"[rng.integers(4)] + text[position + 1:]
+    if kind == 1:
+        return text[:position] + text[position + 1:]
+    return text[:position] + text[position + 1] + text[position] + text[position + 2:]
+
+
+def make_leads(count: int, repeat_share: float = 0.45, colleague_share: float = 0.45, seed: int = 0):
+    """
+    Synthetic lead stream with ground truth.
+
+    Returns:
+        tuple: (list of Lead, true account id per lead, True where the lead's contact had submitted before)
+    """
+    rng = np.random.default_rng(seed)
+    accounts, contacts = [], []
+    leads, truth, repeats = [], np.empty(count, dtype=np.int64), np.zeros(count, dtype=bool)
+    names = set()
+    for i in range(count):
+        if contacts and rng.random() < repeat_share:
+            contact = int(rng.integers(len(contacts)))
+            repeats[i] = True
+        else:
+            if accounts and rng.random() < colleague_share:
+                account = int(rng.integers(len(accounts)))
+            else:
+                while True:
+                    root = f"{_word(rng, 3).title()} {_word(rng, 2).title()}"
+                    name = f"{root} {INDUSTRY_WORDS[rng.integers(len(INDUSTRY_WORDS))]}"
+                    if normalize_company(name) not in names:
+                        break
+                names.add(normalize_company(name))
+                corporate = rng.random() < 0.7
+                domain = root.replace(" ", "").lower() + CORPORATE_SUFFIXES[rng.integers(3)] if corporate else None
+                account = len(accounts)
+                accounts.append((name, domain))
+            name, domain = accounts[account]
+            local = f"{_word(rng, 2)}.{_word(rng, 3)}{len(contacts)}"
+            if domain is None or rng.random() < 0.15:
+                email = f"{local}@{FREE_MAIL[rng.integers(len(FREE_MAIL))]}"
+            else:
+                email = f"{local}@{domain}"
+            contact = len(contacts)
+            contacts.append((account, email))
+        account, email = contacts[contact]
+        if repeats[i] and rng.random() < 0.2:
+            email = email.upper() if rng.random() < 0.5 else email.replace("@", "+audit@", 1)
+
+        company = accounts[account][0]
+        if rng.random() < 0.08:
+            company = _typo(rng, company)
+        company += LEGAL_SUFFIXES[rng.integers(len(LEGAL_SUFFIXES))]
+        style = rng.random()
+        company = company.upper() if style < 0.1 else company.lower() if style < 0.2 else company
+        if rng.random() < 0.3:
+            company += TITLES[rng.integers(len(TITLES))]
+
+        budget, hours, loss = rng.uniform(1, 200), rng.uniform(50, 4000), rng.uniform(0.1, 20)
+        maintenance, downtime = budget * 0.4 * 0.65, hours * loss / 100 * 0.7
+        leads.append(
+            Lead(
+                name=local if not repeats[i] else "repeat", email=email, company=company,
+                industry=INDUSTRIES[account % len(INDUSTRIES)], budget_crores=budget, downtime_hours=hours,
+                loss_per_hour_lakhs=loss, maintenance_savings_crores=maintenance, downtime_savings_crores=downtime,
+                total_savings_crores=maintenance + downtime, submitted_at=1.7e9 + i,
+            )
+        )
+        truth[i] = account
+    return leads, truth, repeats
+
+
+def pairwise_scores(predicted, truth):
+    """Pairwise precision and recall of a clustering: pairs of items put together that belong together."""
+    import pandas as pd
+
+    def pairs(counts):
+        counts = np.asarray(counts, dtype=np.float64)
+        return float((counts * (counts - 1) / 2).sum())
+
+    frame = pd.DataFrame({"predicted": predicted, "truth": truth})
+    together = pairs(frame.groupby(["predicted", "truth"]).size())
+    predicted_pairs, true_pairs = pairs(frame.groupby("predicted").size()), pairs(frame.groupby("truth").size())
+    return together / predicted_pairs if predicted_pairs else 1.0, together / true_pairs if true_pairs else 1.0
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--p99-budget-ms", type=float, default=1.0, help="Fail if the overall p99 insert latency reaches this.")
+    parser.add_argument("--skip-rebuild", action="store_true", help="Skip the SQLite round trip.")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    leads, truth, repeats = make_leads(args.leads)
+    print(f"{args.leads:,} leads, {len(np.unique(truth)):,} accounts generated in {time.perf_counter() - start:.1f} s\n")
+
+    index = LeadIndex()
+    latencies = np.empty(args.leads)
+    predicted = np.empty(args.leads, dtype=np.int64)
+    duplicate = np.empty(args.leads, dtype=bool)
+    rss_before = _rss_mb()
+    # Collector pauses would be charged to whichever insert triggered them; they are not the index's cost.
+    gc.disable()
+    clock = time.perf_counter
+    for i, lead in enumerate(leads):
+        started = clock()
+        match = index.add(lead)
+        latencies[i] = clock() - started
+        predicted[i] = match.account_id
+        duplicate[i] = match.duplicate
+    gc.enable()
+    rss_growth = _rss_mb() - rss_before
+
+    print(f"{'stored leads':<24}{'p50 µs':>9}{'p99 µs':>9}{'max µs':>9}")
+    for part in np.array_split(np.arange(args.leads), 10):
+        p50, p99, worst = np.percentile(latencies[part], [50, 99, 100]) * 1e6
+        label = f"{part[0]:,}–{part[-1] + 1:,}"
+        print(f"{label:<24}{p50:>9.1f}{p99:>9.1f}{worst:>9.1f}")
+    p50, p99, worst = np.percentile(latencies, [50, 99, 100]) * 1e3
+    print(f"{'all':<24}{p50 * 1e3:>9.1f}{p99 * 1e3:>9.1f}{worst * 1e3:>9.1f}")
+
+    true_repeats = repeats.sum()
+    caught = (duplicate & repeats).sum()
+    precision, recall = pairwise_scores(predicted, truth)
+    print(f"\nRepeat submissions:  precision {caught / max(duplicate.sum(), 1):.4f}, recall {caught / max(true_repeats, 1):.4f}")
+    print(f"Account assignment:  pairwise precision {precision:.4f}, recall {recall:.4f}")
+    print(f"Accounts found:      {len(index.accounts):,} (true {len(np.unique(truth)):,})")
+    print(f"Peak RSS growth:     {rss_growth:,.0f} MB while indexing")
+
+    if not args.skip_rebuild:
+        with tempfile.TemporaryDirectory() as workdir:
+            path = Path(workdir) / "leads.sqlite3"
+            writer = LeadWriter(path, queue_size=args.leads + 1)
+            for lead in leads:
+                writer.submit(lead)
+            writer.close(timeout=None)
+            start = time.perf_counter()
+            rebuilt = LeadIndex.from_sqlite(path)
+            seconds = time.perf_counter() - start
+        same = len(rebuilt.accounts) == len(index.accounts)
+        print(f"from_sqlite rebuild: {seconds:.1f} s ({seconds / args.leads * 1e6:.1f} µs/lead), "
+              f"{'same' if same else 'DIFFERENT'} {len(rebuilt.accounts):,} accounts")
+
+    ok = p99 < args.p99_budget_ms
+    print(f"\np99 insert latency {p99 * 1e3:.1f} µs {'within' if ok else 'OVER'} the {args.p99_budget_ms:g} ms budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
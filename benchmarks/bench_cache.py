@@ -0,0 +1,130 @@
+"""Behaviour of the calculation ResultCache under a simulated week of traffic.
+
+Part 1 replays a week of audit submissions on a simulated clock: most come
+from a pool of popular scenarios, the rest are one-off scenarios. A repeat
+arrives either as typed or after a unit round trip (Lakhs to Crores and
+back), which leaves the last-bit float noise real callers produce;
+quantization folds both spellings into one key. Once per simulated day it
+prints hit rate, evictions, expirations and the Python heap traced by
+tracemalloc, which must level off instead of growing with the number of
+distinct scenarios seen.
+
+Part 2 checks the shared disk tier: a separate process warms a SQLite file,
+then a cold cache in this process answers the same scenarios from disk.
+
+Usage:
+    python -m benchmarks.bench_cache [--requests 350000] [--maxsize 4096]
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from sensyva_audit.cache import ResultCache
+from sensyva_audit.engine import calculate_impact
+
+
+def scenarios(rng, count: int) -> np.ndarray:
+    """`count` plausible (budget, hours, loss) rows rounded the way people type them."""
+    return np.column_stack(
+        [
+            rng.integers(1, 500, count) * 0.5,
+            rng.integers(10, 400, count) * 5.0,
+            rng.integers(1, 40, count) * 0.25,
+        ]
+    )
+
+
+def replay_week(args):
+    rng = np.random.default_rng(7)
+    popular = scenarios(rng, args.popular)
+    now = [0.0]
+    cache = ResultCache(maxsize=args.maxsize, ttl_seconds=args.ttl, clock=lambda: now[0])
+
+    tracemalloc.start()
+    per_day = args.requests // 7
+    print(f"{args.requests:,} requests over 7 simulated days, maxsize {args.maxsize:,}, TTL {args.ttl / 3600:.0f} h")
+    print(f"{'day':>4}{'hit rate':>10}{'entries':>9}{'evictions':>11}{'expired':>9}{'heap MB':>9}")
+    start = time.perf_counter()
+    for day in range(7):
+        before = dict(cache.stats)
+        repeat = rng.random(per_day) < args.repeat_share
+        picks = popular[rng.integers(0, len(popular), per_day)]
+        one_off = scenarios(rng, per_day)
+        # Lakhs to Crores and back: about one value in seven comes out a bit or two off.
+        converted = rng.random((per_day, 3)) < 0.5
+        picks = np.where(converted, picks / 100 * 100, picks)
+        rows = np.where(repeat[:, None], picks, one_off)
+        for offset, (budget, hours, loss) in enumerate(rows.tolist()):
+            now[0] = day * 86400 + offset * 86400 / per_day
+            cache.get_or_compute(calculate_impact, budget, hours, loss)
+        hits = cache.stats["hits"] - before["hits"]
+        misses = cache.stats["misses"] - before["misses"]
+        current, _ = tracemalloc.get_traced_memory()
+        print(
+            f"{day + 1:>4}{hits / (hits + misses):>10.1%}{len(cache):>9,}"
+            f"{cache.stats['evictions']:>11,}{cache.stats['expirations']:>9,}{current / 2**20:>9.2f}"
+        )
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+    print(f"replayed in {elapsed:.1f} s ({args.requests / elapsed:,.0f} lookups/s under tracemalloc)")
+
+
+def _warm(path: str, rows: list):
+    cache = ResultCache(maxsize=len(rows), disk_path=path, namespace="bench")
+    for row in rows:
+        cache.get_or_compute(calculate_impact, *row)
+
+
+def shared_disk(args):
+    rows = scenarios(np.random.default_rng(11), args.disk_scenarios).tolist()
+    with tempfile.TemporaryDirectory() as workdir:
+        path = str(Path(workdir) / "results.sqlite3")
+        worker = multiprocessing.get_context("spawn").Process(target=_warm, args=(path, rows))
+        worker.start()
+        worker.join()
+
+        cold = ResultCache(maxsize=len(rows), disk_path=path, namespace="bench")
+        start = time.perf_counter()
+        for row in rows:
+            cold.get_or_compute(calculate_impact, *row)
+        disk_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for row in rows:
+            cold.get_or_compute(calculate_impact, *row)
+        memory_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for row in rows:
+            calculate_impact(*row)
+        compute_seconds = time.perf_counter() - start
+        stats = cold.snapshot()
+        cold.disk.close()
+
+    count = len(rows)
+    print(f"\nshared disk tier, {count:,} scenarios warmed by another process")
+    print(f"cold process disk hits  {stats['disk_hits']:,}/{count:,}  ({disk_seconds / count * 1e6:.1f} us/lookup)")
+    print(f"then from memory        {memory_seconds / count * 1e6:.1f} us/lookup")
+    print(f"uncached calculation    {compute_seconds / count * 1e6:.1f} us/call")
+    return stats["disk_misses"] == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=350_000)
+    parser.add_argument("--maxsize", type=int, default=4096)
+    parser.add_argument("--ttl", type=float, default=24 * 60 * 60)
+    parser.add_argument("--popular", type=int, default=2_000, help="Size of the pool of repeated scenarios.")
+    parser.add_argument("--repeat-share", type=float, default=0.7, help="Fraction of requests drawn from the pool.")
+    parser.add_argument("--disk-scenarios", type=int, default=5_000)
+    args = parser.parse_args(argv)
+
+    replay_week(args)
+    return 0 if shared_disk(args) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+"""Throughput and peak memory of the sensor-dump data-gap profiler as dumps grow.
+
+Writes synthetic three-channel site dumps (vibration, thermal, power) of
+increasing size, either as raw float32 files sampled at 1 kHz or as a
+Parquet file with a timestamp column, with dropouts and a one-hour outage
+in each. Each dump is profiled in a fresh spawned process with a shift-end
+review schedule, so peak RSS (``ru_maxrss``) belongs to that run alone.
+Throughput should stay flat and peak RSS should not grow with the dump;
+the exit status is 1 if the largest dump needs more than RSS_GROWTH times
+the peak RSS of the smallest.
+
+Usage:
+    python -m benchmarks.bench_datagap [--sizes-gb 0.25 1 4] [--format raw|parquet] [--keep-dir DIR]
+"""
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+CHANNELS = ("vibration", "thermal", "power")
+RATE_HZ = 1_000
+START = np.datetime64("2024-01-01T00:00:00", "ns")
+BLOCK_SECONDS = 600
+RSS_GROWTH = 1.25
+
+
+def _block(rng, first: int, count: int):
+    """Values of every channel for samples [first, first + count): NaN dropouts, a 1-hour outage at hour 5."""
+    t = (first + np.arange(count)) / RATE_HZ
+    values = {
+        "vibration": np.sin(2 * np.pi * 50 * t) + rng.normal(0, 0.1, count),
+        "thermal": 60 + 0.01 * t / 3600 + rng.normal(0, 0.2, count),
+        "power": 400 + rng.normal(0, 5, count),
+    }
+    outage = (t >= 5 * 3600) & (t < 6 * 3600)
+    for array in values.values():
+        array[rng.random(count) < 0.001] = np.nan
+        array[outage] = np.nan
+    return t, outage, {name: array.astype(np.float32) for name, array in values.items()}
+
+
+def write_dump(directory: Path, samples: int, file_format: str):
+    """Writes `samples` samples per channel; returns the files to profile."""
+    rng = np.random.default_rng(0)
+    step = BLOCK_SECONDS * RATE_HZ
+    if file_format == "raw":
+        paths = [directory / f"{name}.f32" for name in CHANNELS]
+        for path in paths:
+            path.unlink(missing_ok=True)
+        for first in range(0, samples, step):
+            _, _, values = _block(rng, first, min(step, samples - first))
+            for path in paths:
+                with open(path, "ab") as handle:
+                    values[path.stem].tofile(handle)
+        return paths
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = directory / "site.parquet"
+    writer = None
+    try:
+        for first in range(0, samples, step):
+            t, outage, values = _block(rng, first, min(step, samples - first))
+            # Parquet dumps leave an outage out entirely, so it shows up as a sampling gap.
+            timestamps = START + (t[~outage] * 1e9).astype("timedelta64[ns]")
+            table = pa.table({"timestamp": timestamps, **{name: array[~outage] for name, array in values.items()}})
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return [path]
+
+
+def _profile(paths, queue):
+    from sensyva_audit.datagap import AnalysisWindows, profile_sensor_dump
+
+    windows = AnalysisWindows(every_seconds=8 * 3600, duration_seconds=10 * 60)
+    start = time.perf_counter()
+    profile = profile_sensor_dump(paths, windows=windows, sample_rate_hz=RATE_HZ, start=str(START))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    queue.put((elapsed, peak, profile.bytes_read, sum(c.samples for c in profile.channels), profile.data_gap_percentage))
+
+
+def measure(paths):
+    """(seconds, peak RSS bytes, bytes read, samples, data gap %) for one profile in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    worker = context.Process(target=_profile, args=([str(path) for path in paths], queue))
+    worker.start()
+    result = queue.get()
+    worker.join()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-gb", type=float, nargs="+", default=[0.25, 1.0, 4.0], help="Raw float32 size of each dump.")
+    parser.add_argument("--format", choices=("raw", "parquet"), default="raw")
+    parser.add_argument("--keep-dir", type=Path, help="Write dumps here and keep them (default: a temp dir).")
+    args = parser.parse_args(argv)
+
+    workdir = args.keep_dir or Path(tempfile.mkdtemp(prefix="sensyva-datagap-bench-"))
+    print(f"{'dump GB':>8}{'file GB':>9}{'samples':>15}{'seconds':>9}{'GB/s':>7}{'Msamples/s':>12}{'peak RSS MB':>13}{'gap %':>7}")
+    peaks = []
+    for size in sorted(args.sizes_gb):
+        directory = workdir / f"{args.format}-{size:g}gb"
+        directory.mkdir(parents=True, exist_ok=True)
+        samples = int(size * 2**30 / 4 / len(CHANNELS))
+        paths = sorted(directory.iterdir()) or write_dump(directory, samples, args.format)
+        seconds, peak, read, profiled, gap = measure(paths)
+        peaks.append(peak)
+        print(
+            f"{size:>8g}{read / 2**30:>9.2f}{profiled:>15,}{seconds:>9.1f}{read / 2**30 / seconds:>7.2f}"
+            f"{profiled / seconds / 1e6:>12.1f}{peak / 2**20:>13,.0f}{gap:>7.1f}",
+            flush=True,
+        )
+        if args.keep_dir is None:
+            for path in paths:
+                path.unlink()
+
+    ok = peaks[-1] <= RSS_GROWTH * peaks[0]
+    print(("OK" if ok else "FAIL") + f": peak RSS of the largest dump is {peaks[-1] / peaks[0]:.2f}x the smallest")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
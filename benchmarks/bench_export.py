@@ -0,0 +1,118 @@
+"""Throughput and peak memory of streaming result exports as the row count grows.
+
+Writes synthetic scored portfolios (the per-site columns a portfolio audit
+produces) through each ``ResultWriter`` chunk by chunk, each run in a fresh
+spawned process so peak RSS (``ru_maxrss``) belongs to that run alone.
+Rows per second should stay roughly flat and peak RSS should not grow with
+the row count. XLSX is written cell by cell and capped at ``--xlsx-rows``.
+The exit status is 1 if any format's largest export needs more than
+RSS_GROWTH times the peak RSS of its smallest.
+
+Usage:
+    python -m benchmarks.bench_export [--sizes 1000000 10000000] [--formats csv parquet arrow xlsx] [--xlsx-rows 200000]
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_SIZES = (1_000_000, 10_000_000)
+DEFAULT_FORMATS = ("csv", "parquet", "arrow", "xlsx")
+DEFAULT_XLSX_ROWS = 200_000
+DEFAULT_CHUNK_ROWS = 50_000
+SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow", "xlsx": ".xlsx"}
+
+# Peak memory may vary a little run to run; it must not scale with the rows.
+RSS_GROWTH = 1.5
+
+
+def scored_chunks(rows: int, chunk_rows: int, seed: int = 0):
+    """Yields scored DataFrame chunks shaped like run_portfolio_audit's results."""
+    import numpy as np
+    import pandas as pd
+
+    from benchmarks.bench_engine import make_portfolio
+    from sensyva_audit.engine import calculate_impact_batch
+    from sensyva_audit.industry import INDUSTRY_CONTEXT
+
+    industries = np.array(list(INDUSTRY_CONTEXT), dtype=object)
+    for first in range(0, rows, chunk_rows):
+        count = min(chunk_rows, rows - first)
+        scored = pd.DataFrame(calculate_impact_batch(*make_portfolio(count, seed=seed + first)))
+        scored.insert(0, "site", pd.array([f"SITE-{index:09d}" for index in range(first, first + count)], dtype="string"))
+        scored.insert(1, "industry", pd.array(industries[np.arange(first, first + count) % len(industries)], dtype="string"))
+        yield scored
+
+
+def _export(fmt: str, path: str, rows: int, chunk_rows: int, queue):
+    from sensyva_audit.export import open_result_writer
+
+    chunks = scored_chunks(rows, chunk_rows)
+    # The first chunk is built before timing starts, so the baseline includes pandas and one chunk.
+    first = next(chunks)
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open_result_writer(path, fmt) as writer:
+        writer.write(first)
+        for chunk in chunks:
+            writer.write(chunk)
+    elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, baseline_kib * 1024, peak_kib * 1024, writer.rows, Path(path).stat().st_size))
+
+
+def measure(fmt: str, path: Path, rows: int, chunk_rows: int):
+    """(seconds, baseline RSS bytes, peak RSS bytes, rows, file bytes) for one export in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    worker = context.Process(target=_export, args=(fmt, str(path), rows, chunk_rows, queue))
+    worker.start()
+    result = queue.get()
+    worker.join()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--formats", nargs="+", choices=DEFAULT_FORMATS, default=list(DEFAULT_FORMATS))
+    parser.add_argument("--xlsx-rows", type=int, default=DEFAULT_XLSX_ROWS, help="Largest XLSX export to attempt.")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--keep-dir", type=Path, help="Write exports here and keep them (default: a temp dir).")
+    args = parser.parse_args(argv)
+
+    workdir = args.keep_dir or Path(tempfile.mkdtemp(prefix="sensyva-export-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    print(f"{'format':<9}{'rows':>12}{'seconds':>9}{'rows/s':>12}{'file MB':>9}{'base MB':>9}{'peak RSS MB':>13}")
+    ok = True
+    for fmt in args.formats:
+        sizes = sorted({min(size, args.xlsx_rows) if fmt == "xlsx" else size for size in args.sizes})
+        peaks = []
+        for size in sizes:
+            path = workdir / f"export-{size}{SUFFIXES[fmt]}"
+            try:
+                seconds, baseline, peak, rows, file_bytes = measure(fmt, path, size, args.chunk_rows)
+            except ImportError as exc:
+                print(f"{fmt:<9}{'unavailable':>12}  {exc}")
+                break
+            peaks.append(peak)
+            print(
+                f"{fmt:<9}{rows:>12,}{seconds:>9.1f}{rows / seconds:>12,.0f}{file_bytes / 2**20:>9,.0f}"
+                f"{baseline / 2**20:>9,.0f}{peak / 2**20:>13,.0f}",
+                flush=True,
+            )
+            if args.keep_dir is None:
+                path.unlink()
+        if len(peaks) > 1 and peaks[-1] > RSS_GROWTH * peaks[0]:
+            ok = False
+            print(f"FAIL: {fmt} peak RSS of the largest export is {peaks[-1] / peaks[0]:.2f}x the smallest")
+    if ok:
+        print(f"OK: no format's peak RSS grew more than {RSS_GROWTH}x with the row count")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Goal-seek throughput and accuracy over a million targets: closed forms versus vectorized bisection.
+
+Targets are drawn around the savings of a synthetic portfolio, and a share
+of them (``--infeasible``) is set below what the known inputs already
+deliver, so every run also exercises the unreachable-target path. For each
+input solved for it reports the closed form's time per target, the worst
+relative error when the solved input is fed back through
+``calculate_impact_batch``, and the status counts. The same solve by
+``bisect`` (its error being the largest absolute gap to the closed form)
+shows what the root-finder costs where no closed form exists,
+followed by the NPV target (closed form) and the IRR (bisection).
+
+Usage:
+    python -m benchmarks.bench_goalseek [--targets 1000000] [--infeasible 0.1] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_engine import make_portfolio
+from sensyva_audit.engine import INPUT_COLUMNS, calculate_impact_batch
+from sensyva_audit.goalseek import SOLVED, STATUS_LABELS, bisect, internal_rate_of_return, required_savings_for_npv, solve_required_input
+
+DEFAULT_TARGETS = 1_000_000
+DEFAULT_INFEASIBLE = 0.1
+# Search range used for the bisection comparison, per input solved for.
+BISECT_RANGES = {
+    "annual_maintenance_budget_crores": 1e5,
+    "unplanned_downtime_hours": 1e7,
+    "revenue_loss_per_hour_lakhs": 1e5,
+}
+
+
+def timed(repeat: int, fn, *args, **kwargs):
+    """(best wall-clock seconds over `repeat` calls, result of the last call)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def make_targets(count: int, infeasible: float, seed: int = 0):
+    """Inputs of a synthetic portfolio and target totals, `infeasible` of them below the fixed savings."""
+    rng = np.random.default_rng(seed)
+    inputs = dict(zip(INPUT_COLUMNS, make_portfolio(count, seed=seed)))
+    totals = calculate_impact_batch(*inputs.values())["total_potential_annual_savings_crores"]
+    targets = totals * rng.uniform(0.8, 3.0, count)
+    # Zero is below every fixed component, whichever input is solved for.
+    targets[rng.random(count) < infeasible] = 0.0
+    return inputs, targets
+
+
+def status_summary(status) -> str:
+    counts = np.bincount(status, minlength=len(STATUS_LABELS))
+    return ", ".join(f"{count:,} {STATUS_LABELS[code]}" for code, count in enumerate(counts) if count)
+
+
+def round_trip_error(solve_for, solved, inputs, targets) -> float:
+    """Worst relative gap between the target and the savings the solved input actually produces."""
+    ok = solved["status"] == SOLVED
+    values = {column: inputs[column][ok] for column in INPUT_COLUMNS}
+    values[solve_for] = solved[solve_for][ok]
+    totals = calculate_impact_batch(*values.values())["total_potential_annual_savings_crores"]
+    return float(np.max(np.abs(totals / targets[ok] - 1))) if ok.any() else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=DEFAULT_TARGETS)
+    parser.add_argument("--infeasible", type=float, default=DEFAULT_INFEASIBLE, help="Share of unreachable targets.")
+    parser.add_argument("--years", type=int, default=10, help="Projection horizon for the NPV and IRR solves.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    inputs, targets = make_targets(args.targets, args.infeasible)
+    print(f"{args.targets:,} targets, {args.infeasible:.0%} set unreachable\n")
+    print(f"{'solve for':<34}{'method':<13}{'total ms':>10}{'ns/target':>11}{'max error':>13}")
+    for solve_for in INPUT_COLUMNS:
+        known = {column: values for column, values in inputs.items() if column != solve_for}
+        seconds, solved = timed(args.repeat, solve_required_input, targets, solve_for, **known)
+        error = round_trip_error(solve_for, solved, inputs, targets)
+        print(f"{solve_for:<34}{'closed form':<13}{seconds * 1e3:>10.1f}{seconds / args.targets * 1e9:>11.1f}{error:>13.1e}")
+
+        # Bisection to a 1e-9 absolute bracket, on the closed form's own feasible targets.
+        ok = solved["status"] == SOLVED
+        bisect_known = {column: values[ok] for column, values in known.items()}
+
+        def bisect_savings(values, known=bisect_known, solve_for=solve_for):
+            return calculate_impact_batch(**{**known, solve_for: values})["total_potential_annual_savings_crores"]
+
+        high = BISECT_RANGES[solve_for]
+        seconds, (roots, _) = timed(1, bisect, bisect_savings, targets[ok], 0.0, high, tolerance=1e-9)
+        error = float(np.max(np.abs(roots - solved[solve_for][ok])))
+        print(f"{'':<34}{'bisection':<13}{seconds * 1e3:>10.1f}{seconds / ok.sum() * 1e9:>11.1f}{error:>13.1e}")
+        print(f"{'':<34}{status_summary(solved['status'])}")
+
+    savings = calculate_impact_batch(*inputs.values())["total_potential_annual_savings_crores"]
+    npv_targets = savings * np.random.default_rng(1).uniform(-1.0, 5.0, args.targets)
+    seconds, solved = timed(args.repeat, required_savings_for_npv, npv_targets, 1.0, 0.5, years=args.years)
+    print(f"\n{'savings for a target NPV':<34}{'closed form':<13}{seconds * 1e3:>10.1f}{seconds / args.targets * 1e9:>11.1f}")
+    print(f"{'':<34}{status_summary(solved['status'])}")
+
+    # Savings scaled down so the rates land inside the search range instead of above it.
+    seconds, irr = timed(1, internal_rate_of_return, savings / 20.0, 10.0, 0.5, years=args.years)
+    print(f"{'internal rate of return':<34}{'bisection':<13}{seconds * 1e3:>10.1f}{seconds / args.targets * 1e9:>11.1f}")
+    print(f"{'':<34}{status_summary(irr['status'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
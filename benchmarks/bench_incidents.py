@@ -0,0 +1,83 @@
+"""Throughput and peak memory of incident-log ingestion as the log grows.
+
+Generates synthetic Parquet logs (see ``gen_incidents``) of increasing
+size and ingests each in a fresh spawned process, so peak RSS
+(``ru_maxrss``) belongs to that run alone. Events per second should stay
+roughly flat (linear scaling) and peak RSS should not grow with the log.
+The exit status is 1 if the largest log needs more than RSS_GROWTH times
+the peak RSS of the smallest.
+
+Usage:
+    python -m benchmarks.bench_incidents [--sizes 1000000 5000000 20000000] [--keep-dir DIR]
+    python -m benchmarks.bench_incidents --sizes 50000000   # the full 50M-event run (about 1 GB on disk)
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.gen_incidents import write_log
+
+DEFAULT_SIZES = (1_000_000, 5_000_000, 20_000_000)
+
+# Peak memory may grow a little with the number of distinct assets, not with the events.
+RSS_GROWTH = 1.5
+
+
+def _ingest(path: str, chunk_rows: int, partitions: int, queue):
+    from sensyva_audit.incidents import ingest_incident_log
+
+    start = time.perf_counter()
+    summary = ingest_incident_log(path, chunk_rows=chunk_rows, partitions=partitions, spill_dir=Path(path).parent)
+    elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, peak_kib * 1024, summary.events_read, summary.spill_bytes, len(summary.assets)))
+
+
+def measure(path: Path, chunk_rows: int, partitions: int):
+    """(seconds, peak RSS bytes, events, spill bytes, assets) for one ingest in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    worker = context.Process(target=_ingest, args=(str(path), chunk_rows, partitions, queue))
+    worker.start()
+    result = queue.get()
+    worker.join()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--keep-dir", type=Path, help="Generate logs here and keep them (default: a temp dir).")
+    args = parser.parse_args(argv)
+
+    workdir = args.keep_dir or Path(tempfile.mkdtemp(prefix="sensyva-incidents-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    print(f"{'events':>12}{'log MB':>9}{'seconds':>9}{'events/s':>12}{'peak RSS MB':>13}{'spill MB':>10}{'assets':>8}")
+    peaks = []
+    for size in sorted(args.sizes):
+        path = workdir / f"incidents-{size}.parquet"
+        if not path.exists():
+            write_log(path, size)
+        seconds, peak, events, spill, assets = measure(path, args.chunk_rows, args.partitions)
+        peaks.append(peak)
+        print(
+            f"{events:>12,}{path.stat().st_size / 2**20:>9,.0f}{seconds:>9.1f}{events / seconds:>12,.0f}"
+            f"{peak / 2**20:>13,.0f}{spill / 2**20:>10,.0f}{assets:>8,}",
+            flush=True,
+        )
+        if args.keep_dir is None:
+            path.unlink()
+
+    ok = peaks[-1] <= RSS_GROWTH * peaks[0]
+    print(("OK" if ok else "FAIL") + f": peak RSS of the largest log is {peaks[-1] / peaks[0]:.2f}x the smallest")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Throughput of the write-behind lead writer under concurrent submissions.
+
+Many threads submit leads at once (as concurrent Streamlit sessions would);
+the benchmark reports submit() latency seen by the "user", the time for the
+background writer to drain everything into SQLite, and checks that every
+accepted lead landed in the table exactly once.
+
+Usage:
+    python -m benchmarks.bench_leads [--threads 64] [--leads 20000]
+"""
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from sensyva_audit.engine import calculate_impact
+from sensyva_audit.leads import Lead, LeadWriter
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--leads", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    results = calculate_impact(50.0, 800.0, 2.0)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "leads.sqlite3"
+        writer = LeadWriter(path, batch_size=args.batch_size)
+        latencies = np.zeros(args.leads)
+        accepted = np.zeros(args.leads, dtype=bool)
+        barrier = threading.Barrier(args.threads)
+
+        def worker(offset):
+            barrier.wait()
+            for i in range(offset, args.leads, args.threads):
+                lead = Lead.from_results(f"Lead {i}", f"lead{i}@plant.example", "Plant Co", None, "IST", "Energy", results)
+                start = time.perf_counter()
+                accepted[i] = writer.submit(lead)
+                latencies[i] = time.perf_counter() - start
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(args.threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        submitted = time.perf_counter() - start
+        writer.close()
+        drained = time.perf_counter() - start
+
+        with sqlite3.connect(path) as connection:
+            rows, distinct = connection.execute("SELECT COUNT(*), COUNT(DISTINCT email) FROM data_gap_leads").fetchone()
+
+    p50, p99, worst = np.percentile(latencies, [50, 99, 100]) * 1e6
+    print(f"{args.leads:,} leads from {args.threads} threads")
+    print(f"submit() latency   p50 {p50:.1f} us   p99 {p99:.1f} us   max {worst:.1f} us")
+    print(f"all submitted in   {submitted * 1e3:.1f} ms ({args.leads / submitted:,.0f} leads/s)")
+    print(f"drained to SQLite  {drained * 1e3:.1f} ms ({rows / drained:,.0f} rows/s, {writer.stats['batches']} batches)")
+    print(f"stats              {writer.stats}")
+    ok = rows == distinct == int(accepted.sum())
+    print("integrity          " + ("OK: every accepted lead written exactly once" if ok else f"MISMATCH rows={rows} distinct={distinct}"))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
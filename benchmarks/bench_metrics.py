@@ -0,0 +1,86 @@
+"""Overhead of the per-rerun metrics hooks, disabled and enabled.
+
+Replays the hook calls ``gab.py`` makes during a full report rerun (a
+rerun timer with six section laps, two counters and finish) many times,
+subtracts an empty loop, and compares the per-rerun cost against a real
+scripted rerun measured with Streamlit's AppTest harness. The exit status
+is 1 if disabled hooks cost more than DISABLED_BUDGET of a rerun.
+
+Usage:
+    python -m benchmarks.bench_metrics [--iterations 200000] [--app-runs 5]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sensyva_audit.metrics import RERUN_SECTIONS, Metrics
+
+APP = Path(__file__).resolve().parent.parent / "gab.py"
+
+# Disabled instrumentation must stay below 0.1% of a rerun.
+DISABLED_BUDGET = 0.001
+
+
+def hooks_per_rerun(metrics: Metrics, iterations: int) -> float:
+    """Seconds per simulated rerun spent in the metrics hooks."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        timer = metrics.rerun()
+        for section in RERUN_SECTIONS:
+            timer.lap(section)
+        metrics.inc("submissions_total", form="audit_form")
+        metrics.inc("validation_failures_total", form="lead_form")
+        timer.finish()
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for section in RERUN_SECTIONS:
+            pass
+    empty = time.perf_counter() - start
+    return max(elapsed - empty, 0.0) / iterations
+
+
+def app_rerun_seconds(runs: int) -> float:
+    """Median wall time of the rerun triggered by submitting audit_form."""
+    from streamlit.testing.v1 import AppTest
+
+    samples = []
+    for _ in range(runs):
+        at = AppTest.from_file(str(APP), default_timeout=120).run()
+        start = time.perf_counter()
+        at.button[0].click().run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--app-runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sensyva-metrics-")
+    os.environ.setdefault("SENSYVA_LEADS_DB", str(Path(workdir) / "leads.sqlite3"))
+    os.environ.setdefault("SENSYVA_REPORT_CACHE", str(Path(workdir) / "reports"))
+
+    disabled = hooks_per_rerun(Metrics(enabled=False), args.iterations)
+    # The file write is throttled in production; a long interval keeps this a measurement of the hooks.
+    enabled = hooks_per_rerun(
+        Metrics(enabled=True, path=Path(workdir) / "sensyva.prom", write_interval=3600), args.iterations
+    )
+    rerun = app_rerun_seconds(args.app_runs)
+
+    print(f"scripted rerun (audit_form submit)   {rerun * 1e3:9.2f} ms")
+    print(f"hooks per rerun, disabled            {disabled * 1e6:9.3f} us  ({disabled / rerun:.5%} of a rerun)")
+    print(f"hooks per rerun, enabled             {enabled * 1e6:9.3f} us  ({enabled / rerun:.5%} of a rerun)")
+    ok = disabled / rerun < DISABLED_BUDGET
+    print(("OK" if ok else "FAIL") + f": disabled overhead budget is {DISABLED_BUDGET:.1%} of a rerun")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Bytes sent to the browser per Streamlit rerun of the audit app.
+
+Drives ``gab.py`` through Streamlit's AppTest harness and records every
+ForwardMsg the script enqueues. A simulated browser keeps the hashes of
+cacheable messages it has already received, exactly as the real frontend
+reports them back, so a repeated element is counted at the size of its
+``ref_hash`` reference. Sizes are serialized protobuf bytes, i.e. the
+websocket payload before framing and compression.
+
+Compare a previous revision of the app by pointing ``--app`` at a checkout
+of it (pass ``--min-cached-bytes 10000`` to use Streamlit's default cache
+threshold instead of ``.streamlit/config.toml``).
+
+Usage:
+    python -m benchmarks.bench_payload [--app gab.py] [--min-cached-bytes N]
+"""
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from streamlit import config
+from streamlit.runtime.forward_msg_cache import create_reference_msg, populate_hash_if_needed
+from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+from streamlit.testing.v1 import AppTest
+
+APP = Path(__file__).resolve().parent.parent / "gab.py"
+
+
+class PayloadMeter:
+    """Wraps ScriptRunContext.enqueue to total the bytes of every rerun, with and without a browser cache."""
+
+    def __init__(self):
+        self.browser_cache = set()
+        self.runs = []
+        self._original = ScriptRunContext.enqueue
+
+    def install(self):
+        meter = self
+
+        def enqueue(ctx, msg):
+            populate_hash_if_needed(msg)
+            sent = msg
+            if msg.metadata.cacheable:
+                if msg.hash in meter.browser_cache:
+                    sent = create_reference_msg(msg)
+                else:
+                    meter.browser_cache.add(msg.hash)
+            run = meter.runs[-1]
+            run["messages"] += 1
+            run["uncached"] += msg.ByteSize()
+            run["sent"] += sent.ByteSize()
+            run["refs"] += sent is not msg
+            meter._original(ctx, msg)
+
+        ScriptRunContext.enqueue = enqueue
+
+    def uninstall(self):
+        ScriptRunContext.enqueue = self._original
+
+    def start(self, label: str):
+        self.runs.append({"label": label, "messages": 0, "uncached": 0, "sent": 0, "refs": 0})
+
+
+def drive(app: Path, meter: PayloadMeter):
+    """First load, a submit, a repeat submit, a changed input and a lead_form submission."""
+    meter.start("first load")
+    at = AppTest.from_file(str(app), default_timeout=120).run()
+    meter.start("submit audit")
+    at.button[0].click().run()
+    meter.start("resubmit, same inputs")
+    at.button[0].click().run()
+    meter.start("submit, new budget")
+    at.number_input(key="budget").set_value(60.0)
+    at.button[0].click().run()
+    meter.start("lead form submit")
+    at.text_input(key="lead_name").input("Asha")
+    at.text_input(key="lead_email").input("asha@plant.example")
+    at.text_input(key="lead_company").input("Plant Co")
+    at.button(key="lead_submit").click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", type=Path, default=APP)
+    parser.add_argument("--min-cached-bytes", type=float, help="Override global.minCachedMessageSize.")
+    args = parser.parse_args(argv)
+
+    # Keep the app's side effects (lead store, PDF cache) out of the working tree.
+    workdir = tempfile.mkdtemp(prefix="sensyva-payload-")
+    os.environ.setdefault("SENSYVA_LEADS_DB", str(Path(workdir) / "leads.sqlite3"))
+    os.environ.setdefault("SENSYVA_REPORT_CACHE", str(Path(workdir) / "reports"))
+    if args.min_cached_bytes is not None:
+        config.set_option("global.minCachedMessageSize", args.min_cached_bytes)
+
+    meter = PayloadMeter()
+    meter.install()
+    try:
+        drive(args.app.resolve(), meter)
+    finally:
+        meter.uninstall()
+
+    print(f"{args.app}  (minCachedMessageSize={config.get_option('global.minCachedMessageSize'):.0f} B)")
+    print(f"{'rerun':<24}{'msgs':>6}{'refs':>6}{'uncached KB':>13}{'sent KB':>10}")
+    for run in meter.runs:
+        print(
+            f"{run['label']:<24}{run['messages']:>6}{run['refs']:>6}"
+            f"{run['uncached'] / 1024:>13.1f}{run['sent'] / 1024:>10.1f}"
+        )
+    reruns = meter.runs[1:]
+    print(f"mean sent per rerun after first load: {sum(run['sent'] for run in reruns) / len(reruns) / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+"""Wall-clock cost of the Monte Carlo uncertainty engine on one core.
+
+Usage:
+    python -m benchmarks.bench_simulation [--draws 100000 1000000] [--repeat 5]
+"""
+import argparse
+
+from benchmarks.bench_engine import best_of
+from sensyva_audit.simulation import (
+    DOWNTIME_REDUCTION_RANGE,
+    MAINTENANCE_REDUCTION_RANGE,
+    input_distribution,
+    reduction_distribution,
+    simulate_impact,
+)
+
+# The page must stay interactive, so a default-sized run has to land well under this.
+BUDGET_SECONDS = 1.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--draws", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'draws':>12} {'input dist':>12} {'reduction':>12} {'best':>10}")
+    for draws in args.draws:
+        for input_kind, reduction_kind in (("triangular", "beta"), ("lognormal", "triangular")):
+            scenario = (
+                input_distribution(input_kind, 50.0, 0.2),
+                input_distribution(input_kind, 800.0, 0.2),
+                input_distribution(input_kind, 2.0, 0.2),
+                reduction_distribution(reduction_kind, MAINTENANCE_REDUCTION_RANGE),
+                reduction_distribution(reduction_kind, DOWNTIME_REDUCTION_RANGE),
+            )
+            seconds = best_of(args.repeat, lambda: simulate_impact(*scenario, draws=draws))
+            flag = "" if seconds < BUDGET_SECONDS else "  OVER BUDGET"
+            print(f"{draws:>12,} {input_kind:>12} {reduction_kind:>12} {seconds * 1e3:>7.1f} ms{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Cold-start cost of the importable core and the CLI, measured in fresh interpreters.
+
+Each target is timed as a separate ``python -c`` subprocess; the cost of an
+empty interpreter is measured the same way and subtracted, leaving the time
+spent on our imports.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 15]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+TARGETS = (
+    ("core (engine, industry, formatting)", "import sensyva_audit.engine, sensyva_audit.industry, sensyva_audit.formatting"),
+    ("package root", "import sensyva_audit"),
+    ("cli --help", "import sys; sys.argv = ['sensyva_audit', '--help']\ntry:\n    import runpy; runpy.run_module('sensyva_audit', run_name='__main__')\nexcept SystemExit:\n    pass"),
+    ("first batch call (numpy loaded)", "from sensyva_audit.engine import calculate_impact; calculate_impact(50.0, 800.0, 2.0)"),
+    ("streamlit (for comparison)", "import streamlit"),
+)
+
+# Core imports should stay in the low tens of milliseconds.
+CORE_BUDGET_MS = 30.0
+
+
+def median_runtime(code: str, runs: int) -> float:
+    """Median wall-clock seconds to run `code` in a fresh interpreter."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    baseline = median_runtime("pass", args.runs)
+    print(f"{'empty interpreter':<38} {baseline * 1e3:>8.1f} ms (subtracted below)")
+    for label, code in TARGETS:
+        try:
+            cost_ms = (median_runtime(code, args.runs) - baseline) * 1e3
+        except subprocess.CalledProcessError:
+            print(f"{label:<38} {'unavailable':>11}")
+            continue
+        flag = "  OVER BUDGET" if label.startswith("core") and cost_ms > CORE_BUDGET_MS else ""
+        print(f"{label:<38} {cost_ms:>8.1f} ms{flag}")
+
+
+if __name__ == "__main__":
+    main()
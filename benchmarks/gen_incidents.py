@@ -0,0 +1,104 @@
+"""Synthetic CMMS downtime event log for benchmarking incident ingestion.
+
+Events hit a site > line > asset hierarchy, start uniformly over one year
+and last a lognormal time (median about 45 minutes, long right tail), so
+events on busy lines overlap the way real breakdowns cascade. Each event's
+cost is its duration times its line's hourly loss plus noise. Rows are
+generated and written in chunks, so the 50M-event default never sits in
+memory at once.
+
+Usage:
+    python -m benchmarks.gen_incidents events.parquet [--events 50000000] [--sites 40]
+    python -m benchmarks.gen_incidents events.csv --events 1000000
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_EVENTS = 50_000_000
+CHUNK_EVENTS = 1_000_000
+YEAR_SECONDS = 365 * 24 * 3600
+EPOCH = np.datetime64("2024-01-01T00:00:00", "s")
+
+
+def event_chunks(events: int, sites: int, lines_per_site: int, assets_per_line: int, seed: int = 0):
+    """Yields DataFrames of at most CHUNK_EVENTS synthetic events."""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    line_count = sites * lines_per_site
+    # Hourly loss per line (Lakhs INR) and a skewed share of events per line.
+    line_rate = rng.lognormal(np.log(2.0), 0.6, line_count)
+    line_weight = rng.pareto(1.5, line_count) + 1.0
+    line_weight /= line_weight.sum()
+
+    site_names = np.array([f"SITE-{number:03d}" for number in range(sites)], dtype=object)
+    line_names = np.array([f"L{number:02d}" for number in range(lines_per_site)], dtype=object)
+    asset_names = np.array([f"A{number:03d}" for number in range(assets_per_line)], dtype=object)
+
+    for first in range(0, events, CHUNK_EVENTS):
+        count = min(CHUNK_EVENTS, events - first)
+        line = rng.choice(line_count, size=count, p=line_weight)
+        asset = rng.integers(0, assets_per_line, count)
+        start = rng.integers(0, YEAR_SECONDS, count)
+        duration = np.maximum(rng.lognormal(np.log(45 * 60), 1.0, count).astype(np.int64), 60)
+        cost = duration / 3600.0 * line_rate[line] * rng.uniform(0.8, 1.2, count)
+        yield pd.DataFrame(
+            {
+                "site": site_names[line // lines_per_site],
+                "line": line_names[line % lines_per_site],
+                "asset": asset_names[asset],
+                "start": EPOCH + start,
+                "end": EPOCH + start + duration,
+                "cost_lakhs": cost.round(4),
+            }
+        )
+
+
+def write_log(path: Path, events: int, sites: int = 40, lines_per_site: int = 8, assets_per_line: int = 30, seed=0):
+    """Writes a synthetic log to a .csv or .parquet `path`."""
+    chunks = event_chunks(events, sites, lines_per_site, assets_per_line, seed)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    elif suffix == ".csv":
+        for number, chunk in enumerate(chunks):
+            chunk.to_csv(path, mode="w" if number == 0 else "a", header=number == 0, index=False)
+    else:
+        raise ValueError(f"Unsupported file format '{path.suffix}'; use a .csv or .parquet file.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="Output .csv or .parquet file.")
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS)
+    parser.add_argument("--sites", type=int, default=40)
+    parser.add_argument("--lines-per-site", type=int, default=8)
+    parser.add_argument("--assets-per-line", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    try:
+        write_log(args.path, args.events, args.sites, args.lines_per_site, args.assets_per_line, args.seed)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(f"wrote {args.events:,} events to {args.path} ({args.path.stat().st_size / 2**20:,.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
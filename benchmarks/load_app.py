@@ -0,0 +1,394 @@
+"""Concurrent-session load test for gab.py: rerun latency, throughput, memory and CPU as sessions ramp up.
+
+Each simulated auditor is a websocket client of a real ``streamlit run``
+server, speaking the same protobuf protocol as the browser: every session
+is a session of that server, its script runs in one of the server's script
+threads, and the runtime, caches, element serialization and lead store are
+the production ones. A session loads the page and then, for ``--rounds``
+rounds, fills ``audit_form`` with seeded values, submits it and submits
+``lead_form``. Every rerun (page load, audit submit, lead submit) is timed
+from the client's rerun request to the server's ``script_finished``.
+Exceptions the script shows on the page and runs that fail to compile count
+as session errors.
+
+Concurrency ramps through ``--sessions`` (all sessions of a level start
+together), once for each entry of ``--workers``: the sessions are split
+across that many freshly started server processes on this host, as behind
+a load balancer. The clients share one event loop in this process. For
+every level it reports:
+
+* rerun latency p50/p95/p99 and audit-submit p95, in ms;
+* throughput, in reruns per second across all workers;
+* memory: RSS per server process once warm, and the RSS each extra session adds;
+* CPU saturation: CPU seconds used by the servers and their PDF render
+  processes over the time the level kept them busy, times the host's cores.
+
+A level whose p95 exceeds ``--slo-ms`` is flagged as queueing; the last
+level within the SLO is summarised per worker count, so a deployment can
+be sized as workers x sessions with a known memory footprint.
+
+Usage:
+    python -m benchmarks.load_app [--sessions 1 2 4 8 16] [--workers 1 2] [--rounds 3] [--output load.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+APP = Path(__file__).resolve().parent.parent / "gab.py"
+DEFAULT_SESSIONS = (1, 2, 4, 8, 16)
+DEFAULT_WORKERS = (1, 2)
+DEFAULT_ROUNDS = 3
+DEFAULT_SLO_MS = 1000.0
+SERVER_START_TIMEOUT = 60.0
+RERUN_TIMEOUT = 600.0
+# The servers count as idle (PDF renders drained) once they use less CPU than this per poll.
+IDLE_CPU_SECONDS = 0.02
+IDLE_POLL_SECONDS = 0.25
+IDLE_TIMEOUT = 120.0
+
+
+# --- Server processes ---
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Starts `streamlit run gab.py` on `port` and waits until its health check answers."""
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(APP),
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--server.headless", "true",
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+            "--logger.level", "error",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit server on port {port} exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"streamlit server on port {port} did not start within {SERVER_START_TIMEOUT:.0f} s")
+
+
+def _children(pid: int) -> list:
+    try:
+        children = []
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children", encoding="ascii") as listing:
+                children.extend(int(child) for child in listing.read().split())
+        return children
+    except OSError:
+        return []
+
+
+def process_tree(pid: int) -> list:
+    """`pid` and all its live descendants (just `pid` where /proc is unavailable)."""
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(_children(current))
+    return tree
+
+
+def rss_bytes(pid: int) -> int:
+    """Resident set size of process `pid` now."""
+    try:
+        with open(f"/proc/{pid}/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        output = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True).stdout
+        return int(output.strip() or 0) * 1024
+
+
+def cpu_seconds(pid: int) -> float:
+    """User + system CPU of process `pid`, its live descendants (the PDF render pool) and its reaped children; 0 without /proc."""
+    ticks = os.sysconf("SC_CLK_TCK")
+    total = 0.0
+    for member in process_tree(pid):
+        try:
+            with open(f"/proc/{member}/stat", encoding="ascii") as stat:
+                # Fields after the parenthesised command name; utime, stime, cutime and cstime are 14-17.
+                fields = stat.read().rsplit(")", 1)[1].split()
+            total += sum(int(value) for value in fields[11:15]) / ticks
+        except (OSError, ValueError, IndexError):
+            continue
+    return total
+
+
+def wait_until_idle(pids: list) -> float:
+    """Blocks until the servers stop using CPU (queued PDF renders finished); returns when that was."""
+    deadline = time.perf_counter() + IDLE_TIMEOUT
+    previous = sum(cpu_seconds(pid) for pid in pids)
+    while time.perf_counter() < deadline:
+        time.sleep(IDLE_POLL_SECONDS)
+        current = sum(cpu_seconds(pid) for pid in pids)
+        if current - previous < IDLE_CPU_SECONDS:
+            break
+        previous = current
+    return time.perf_counter()
+
+
+# --- Websocket sessions ---
+
+class SessionClient:
+    """One browser session: keeps the widget ids and values the page rendered and requests reruns."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.websocket = None
+        self.widget_ids = {}
+        self.values = {}
+
+    async def connect(self):
+        from websockets.asyncio.client import connect
+
+        self.websocket = await connect(
+            f"ws://127.0.0.1:{self.port}/_stcore/stream", subprotocols=["streamlit"], max_size=None
+        )
+
+    async def close(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+
+    def widget_id(self, key: str) -> str:
+        """Id of the widget with `key`, or of the submit button of the form named `key`."""
+        try:
+            return self.widget_ids[key]
+        except KeyError:
+            raise RuntimeError(f"widget {key!r} is not on the page") from None
+
+    def set(self, key: str, **value):
+        """Sets a widget's value for the next rerun, e.g. set("budget", double_value=50.0)."""
+        self.values[self.widget_id(key)] = value
+
+    async def rerun(self, trigger: str = None) -> list:
+        """Requests a rerun (clicking the `trigger` widget, if given) and returns the exceptions the page showed."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        for widget_id, value in self.values.items():
+            message.rerun_script.widget_states.widgets.add(id=widget_id, **value)
+        if trigger is not None:
+            message.rerun_script.widget_states.widgets.add(id=self.widget_id(trigger), trigger_value=True)
+        await self.websocket.send(message.SerializeToString())
+
+        errors = []
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.websocket.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                field = element.WhichOneof("type")
+                if field == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+                self._remember(getattr(element, field, None))
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    errors.append("script failed to compile")
+                return errors
+
+    def _remember(self, element):
+        widget_id = getattr(element, "id", "")
+        if not widget_id.startswith("$$ID-"):
+            return
+        # Widget ids end in "-<key>"; a form's submit button is also found by the form's name.
+        self.widget_ids[widget_id.split("-", 2)[2]] = widget_id
+        if getattr(element, "is_form_submitter", False):
+            self.widget_ids.setdefault(element.form_id, widget_id)
+
+
+async def run_session(client: SessionClient, seed: int, rounds: int, timings: list, errors: list):
+    """One simulated auditor: page load, then `rounds` audit and lead submissions."""
+    rng = np.random.default_rng(seed)
+
+    async def timed(kind, trigger=None):
+        start = time.perf_counter()
+        shown = await asyncio.wait_for(client.rerun(trigger), RERUN_TIMEOUT)
+        timings.append((kind, time.perf_counter() - start))
+        errors.extend(f"{kind}: {error}" for error in shown)
+
+    await client.connect()
+    await timed("load")
+    for round_index in range(rounds):
+        client.set("budget", double_value=round(float(rng.uniform(5, 500)), 1))
+        client.set("downtime_hours", double_value=float(rng.integers(50, 4000)))
+        client.set("loss_per_hour", double_value=round(float(rng.uniform(0.5, 25)), 2))
+        await timed("audit_submit", trigger="audit_form")
+        client.set("lead_name", string_value=f"Auditor {seed}")
+        client.set("lead_email", string_value=f"auditor{seed}.{round_index}@plant.example")
+        client.set("lead_company", string_value=f"Plant {seed}")
+        await timed("lead_submit", trigger="lead_submit")
+
+
+async def run_sessions(ports: list, shares: list, rounds: int, seed: int, timings: list, errors: list) -> list:
+    """Runs every server's share of sessions at once; returns their clients, still connected."""
+    clients = [
+        (SessionClient(port), seed + 1000 * worker + index)
+        for worker, (port, share) in enumerate(zip(ports, shares))
+        for index in range(share)
+    ]
+
+    async def session(client, session_seed):
+        try:
+            await run_session(client, session_seed, rounds, timings, errors)
+        except Exception as exc:
+            errors.append(repr(exc))
+
+    await asyncio.gather(*(session(client, session_seed) for client, session_seed in clients))
+    return [client for client, _ in clients]
+
+
+async def close_sessions(clients: list):
+    await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+
+
+# --- Levels ---
+
+def run_level(sessions: int, workers: int, rounds: int, seed: int) -> dict:
+    """Runs `sessions` sessions split over `workers` freshly started servers and aggregates their measurements."""
+    shares = [sessions // workers + (index < sessions % workers) for index in range(workers)]
+    ports = [free_port() for _ in range(workers)]
+    servers = []
+    loop = asyncio.new_event_loop()
+    try:
+        servers = [start_server(port) for port in ports]
+        pids = [server.pid for server in servers]
+        # An untimed first session per server loads the modules and process-wide caches every later session shares.
+        warmup_errors = []
+        warmup = loop.run_until_complete(run_sessions(ports, [1] * workers, 0, seed, [], warmup_errors))
+        loop.run_until_complete(close_sessions(warmup))
+        if warmup_errors:
+            raise RuntimeError(f"warm-up session failed: {warmup_errors[0]}")
+        wait_until_idle(pids)
+        rss_warm = [rss_bytes(pid) for pid in pids]
+
+        timings, errors = [], []
+        cpu_start, wall_start = sum(cpu_seconds(pid) for pid in pids), time.perf_counter()
+        clients = loop.run_until_complete(run_sessions(ports, shares, rounds, seed, timings, errors))
+        wall = time.perf_counter() - wall_start
+        # Sessions are still connected here, so their state is part of this reading.
+        rss_loaded = [rss_bytes(pid) for pid in pids]
+        loop.run_until_complete(close_sessions(clients))
+        # The PDF renders the sessions queued keep the servers busy after the last rerun.
+        busy = wait_until_idle(pids) - wall_start
+        cpu = sum(cpu_seconds(pid) for pid in pids) - cpu_start
+    finally:
+        loop.close()
+        for server in servers:
+            server.terminate()
+        for server in servers:
+            server.wait()
+
+    latencies = np.array([seconds for _, seconds in timings]) * 1e3
+    audit = np.array([seconds for kind, seconds in timings if kind == "audit_submit"]) * 1e3
+    added = sum(loaded - warm for loaded, warm in zip(rss_loaded, rss_warm))
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    return {
+        "workers": workers,
+        "sessions": sessions,
+        "reruns": int(len(latencies)),
+        "errors": errors,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "audit_submit_p95_ms": float(np.percentile(audit, 95)) if len(audit) else float("nan"),
+        "reruns_per_second": len(latencies) / wall,
+        "worker_rss_mb": float(np.mean(rss_warm)) / 2**20,
+        "session_rss_mb": added / sessions / 2**20,
+        "cpu_saturation": cpu / (busy * (os.cpu_count() or 1)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(DEFAULT_SESSIONS), help="Concurrency levels to ramp through.")
+    parser.add_argument("--workers", type=int, nargs="+", default=list(DEFAULT_WORKERS), help="Server process counts to compare.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Audit + lead submissions per session.")
+    parser.add_argument("--slo-ms", type=float, default=DEFAULT_SLO_MS, help="p95 rerun latency above which a level counts as queueing.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write every level's result as JSON here.")
+    args = parser.parse_args(argv)
+
+    # Keep the app's side effects (lead store, PDF cache) out of the working tree; workers inherit these.
+    workdir = tempfile.mkdtemp(prefix="sensyva-load-")
+    os.environ.setdefault("SENSYVA_LEADS_DB", str(Path(workdir) / "leads.sqlite3"))
+    os.environ.setdefault("SENSYVA_REPORT_CACHE", str(Path(workdir) / "reports"))
+
+    print(f"{os.cpu_count()} CPU(s); {args.rounds} round(s) per session; SLO p95 <= {args.slo_ms:.0f} ms")
+    print(
+        f"{'workers':>7} {'sessions':>8} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'submit p95':>10} {'worker MB':>9} {'MB/session':>10} {'CPU':>5}"
+    )
+    levels = []
+    for workers in args.workers:
+        for sessions in args.sessions:
+            if sessions < workers:
+                continue
+            level = run_level(sessions, workers, args.rounds, args.seed)
+            levels.append(level)
+            flag = "  QUEUEING" if level["p95_ms"] > args.slo_ms else ""
+            flag += f"  {len(level['errors'])} session error(s)" if level["errors"] else ""
+            print(
+                f"{workers:>7} {sessions:>8} {level['reruns_per_second']:>9.1f} {level['p50_ms']:>8.0f} "
+                f"{level['p95_ms']:>8.0f} {level['p99_ms']:>8.0f} {level['audit_submit_p95_ms']:>10.0f} "
+                f"{level['worker_rss_mb']:>9.0f} {level['session_rss_mb']:>10.1f} {level['cpu_saturation']:>5.0%}{flag}",
+                flush=True,
+            )
+
+    print()
+    for workers in args.workers:
+        within = [level for level in levels if level["workers"] == workers and level["p95_ms"] <= args.slo_ms and not level["errors"]]
+        if not within:
+            print(f"{workers} worker(s): no level met the SLO")
+            continue
+        best = max(within, key=lambda level: level["sessions"])
+        memory = best["worker_rss_mb"] * workers + best["session_rss_mb"] * best["sessions"]
+        print(
+            f"{workers} worker(s): up to {best['sessions']} concurrent sessions within the SLO "
+            f"({best['reruns_per_second']:.1f} reruns/s, about {memory:,.0f} MB resident)"
+        )
+
+    if args.output:
+        report = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "cpu_count": os.cpu_count(),
+            "rounds": args.rounds,
+            "slo_ms": args.slo_ms,
+            "levels": levels,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"results written to {args.output}")
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""Local load test for the headless audit API.
+
+Starts the service in-process on a free port (or targets --url), drives it
+from concurrent keep-alive clients and reports requests/sec and latency
+percentiles for the single and batch endpoints.
+
+Usage:
+    python -m benchmarks.load_service [--clients 8] [--requests 2000] [--batch-size 10000] [--url http://host:port]
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from sensyva_audit.service import make_server
+
+
+def make_single_bodies(count: int, distinct: int, seed: int = 0):
+    """Request bodies cycling through `distinct` scenarios, so the response cache sees realistic repeats."""
+    rng = np.random.default_rng(seed)
+    pool = [
+        json.dumps(
+            {
+                "annual_maintenance_budget_crores": round(float(rng.uniform(1, 500)), 2),
+                "unplanned_downtime_hours": round(float(rng.uniform(10, 4000))),
+                "revenue_loss_per_hour_lakhs": round(float(rng.uniform(0.1, 25)), 2),
+            }
+        ).encode("utf-8")
+        for _ in range(distinct)
+    ]
+    return [pool[i % distinct] for i in range(count)]
+
+
+def make_batch_body(size: int, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    return json.dumps(
+        {
+            "annual_maintenance_budget_crores": rng.uniform(1, 500, size).round(2).tolist(),
+            "unplanned_downtime_hours": rng.uniform(10, 4000, size).round().tolist(),
+            "revenue_loss_per_hour_lakhs": rng.uniform(0.1, 25, size).round(2).tolist(),
+        }
+    ).encode("utf-8")
+
+
+def drive(host: str, port: int, path: str, bodies, clients: int):
+    """Sends every body with `clients` concurrent connections; returns (wall seconds, per-request latencies)."""
+    latencies = []
+    lock = threading.Lock()
+    shards = [bodies[i::clients] for i in range(clients)]
+
+    def worker(shard):
+        connection = http.client.HTTPConnection(host, port)
+        local = []
+        for body in shard:
+            start = time.perf_counter()
+            connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"{path} returned HTTP {response.status}")
+            local.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(worker, shards))
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def report(label: str, wall: float, latencies):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(f"{label:<34} {len(latencies) / wall:>10.1f} req/s   p50 {p50:>8.2f} ms   p99 {p99:>8.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Target an already running service instead of starting one in-process.")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=200, help="Distinct single scenarios (controls cache hit rate).")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--batch-requests", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        server = make_server("127.0.0.1", 0)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        singles = make_single_bodies(args.requests, args.distinct)
+        report(f"single ({args.distinct} distinct)", *drive(host, port, "/v1/impact", singles, args.clients))
+
+        cold = [make_batch_body(args.batch_size, seed) for seed in range(args.batch_requests)]
+        report(f"batch x{args.batch_size:,} (cold)", *drive(host, port, "/v1/impact/batch", cold, args.clients))
+        report(f"batch x{args.batch_size:,} (cached)", *drive(host, port, "/v1/impact/batch", cold, args.clients))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Reproducible benchmark suite with JSON results and baseline regression checks.
+
+Cases cover the calculation engine (scalar and batch), per-industry
+coefficient lookups over a mixed-industry portfolio, the multi-year
+projection over a portfolio, the string formatters over large arrays, the
+downtime chart frame and full scripted
+``gab.py`` reruns under Streamlit's AppTest harness (a valid audit submit
+and a lead_form submit). Inputs are seeded, every case is timed over
+several runs after one untimed warm-up, and the best run per call (as in
+``bench_engine.best_of``) is what gets compared; medians are recorded too.
+
+    python -m benchmarks.suite                                  # run, write benchmark-results.json
+    python -m benchmarks.suite --compare                        # ...and check against benchmarks/baseline.json
+    python -m benchmarks.suite --output benchmarks/baseline.json  # refresh the stored baseline
+    python -m benchmarks.suite --only engine formatting         # subset by name prefix
+
+With ``--compare`` the exit status is 1 when any case's best time is more than
+``--threshold`` slower than the baseline. Baselines are only meaningful on
+the machine that recorded them; the environment block is printed when it
+differs.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_engine import make_portfolio
+from sensyva_audit.coefficients import load_coefficients
+from sensyva_audit.engine import calculate_impact, calculate_impact_batch
+from sensyva_audit.formatting import downtime_chart_frame, format_crores, format_lakhs
+from sensyva_audit.projection import project_cash_flows
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "gab.py"
+DEFAULT_OUTPUT = Path("benchmark-results.json")
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+SCHEMA_VERSION = 1
+
+
+class Case:
+    """One timed operation: `setup()` builds the arguments, `run(*args)` is what gets timed."""
+
+    def __init__(self, name: str, run, setup=tuple, number: int = 1, repeat: int = 15, items: int = 1):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+        self.items = items
+
+    def measure(self, repeat: int = None) -> dict:
+        """Seconds per call for each run, summarized."""
+        self.run(*self.setup())
+        samples = []
+        for _ in range(repeat or self.repeat):
+            args = self.setup()
+            start = time.perf_counter()
+            for _ in range(self.number):
+                self.run(*args)
+            samples.append((time.perf_counter() - start) / self.number)
+        median = statistics.median(samples)
+        return {
+            "median_s": median,
+            "best_s": min(samples),
+            "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "runs": len(samples),
+            "number": self.number,
+            "items": self.items,
+            "per_item_s": median / self.items,
+        }
+
+
+# --- Engine and presentation cases ---
+
+BATCH_ROWS = 1_000_000
+FORMAT_ROWS = 100_000
+PROJECTION_SITES = 100_000
+PROJECTION_YEARS = 10
+
+
+def engine_cases():
+    portfolio = make_portfolio(BATCH_ROWS, seed=0)
+    values = make_portfolio(FORMAT_ROWS, seed=1)[0].tolist()
+    results = calculate_impact(50.0, 800.0, 2.0)
+    savings = calculate_impact_batch(*make_portfolio(PROJECTION_SITES, seed=2))["total_potential_annual_savings_crores"]
+    coefficients = load_coefficients()
+    industries = np.random.default_rng(3).choice(np.array(coefficients.industries + ("Unlisted",), dtype=object), BATCH_ROWS)
+    return [
+        Case("engine.calculate_impact", calculate_impact, lambda: (50.0, 800.0, 2.0), number=2_000),
+        Case(
+            f"engine.calculate_impact_batch[{BATCH_ROWS:,}]",
+            calculate_impact_batch,
+            lambda: portfolio,
+            number=3,
+            items=BATCH_ROWS,
+        ),
+        Case(
+            f"coefficients.lookup[{BATCH_ROWS:,}]",
+            coefficients.lookup,
+            lambda: (industries,),
+            number=3,
+            items=BATCH_ROWS,
+        ),
+        Case(
+            f"projection.project_cash_flows[{PROJECTION_SITES:,}x{PROJECTION_YEARS}]",
+            lambda array: project_cash_flows(array, 1.0, 0.5, years=PROJECTION_YEARS),
+            lambda: (savings,),
+            items=PROJECTION_SITES,
+        ),
+        Case(
+            f"formatting.format_crores[{FORMAT_ROWS:,}]",
+            lambda array: [format_crores(value) for value in array],
+            lambda: (values,),
+            items=FORMAT_ROWS,
+        ),
+        Case(
+            f"formatting.format_lakhs[{FORMAT_ROWS:,}]",
+            lambda array: [format_lakhs(value) for value in array],
+            lambda: (values,),
+            items=FORMAT_ROWS,
+        ),
+        Case("formatting.downtime_chart_frame", downtime_chart_frame, lambda: (results,), number=500),
+    ]
+
+
+# --- Full-page reruns ---
+
+def _loaded_app():
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(str(APP), default_timeout=120).run()
+
+
+def _submitted_app():
+    at = _loaded_app()
+    at.button[0].click().run()
+    at.text_input(key="lead_name").input("Asha")
+    at.text_input(key="lead_email").input("asha@plant.example")
+    at.text_input(key="lead_company").input("Plant Co")
+    return at
+
+
+def _submit_audit(at):
+    at.button[0].click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def _submit_lead(at):
+    at.button(key="lead_submit").click().run()
+    if at.exception or not at.success:
+        raise RuntimeError("lead_form submission did not succeed")
+
+
+def app_cases():
+    # Setup (the first page load) is untimed; only the rerun triggered by the click is measured.
+    return [
+        Case("app.rerun.audit_submit", _submit_audit, lambda: (_loaded_app(),), repeat=5),
+        Case("app.rerun.lead_submit", _submit_lead, lambda: (_submitted_app(),), repeat=5),
+    ]
+
+
+# --- Results and comparison ---
+
+def environment() -> dict:
+    import pandas
+    import streamlit
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pandas.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Names of cases whose best time is more than `threshold` slower than in `baseline`; prints a table."""
+    if baseline.get("environment") != current["environment"]:
+        print(f"note: baseline recorded on a different environment: {baseline.get('environment')}")
+    regressions = []
+    print(f"\n{'case':<44}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            print(f"{name:<44}{'-':>12}{_fmt(result['best_s']):>12}{'new':>9}")
+            continue
+        change = result["best_s"] / reference["best_s"] - 1.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<44}{_fmt(reference['best_s']):>12}{_fmt(result['best_s']):>12}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    parser.add_argument(
+        "--compare", type=Path, nargs="?", const=DEFAULT_BASELINE, help="Baseline JSON to check against."
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.25 = 25%%).")
+    parser.add_argument("--only", nargs="+", help="Run only cases whose names start with these prefixes.")
+    parser.add_argument("--repeat", type=int, help="Override every case's number of runs.")
+    args = parser.parse_args(argv)
+
+    # Keep the app's side effects (lead store, PDF cache) out of the working tree.
+    workdir = tempfile.mkdtemp(prefix="sensyva-bench-")
+    os.environ.setdefault("SENSYVA_LEADS_DB", str(Path(workdir) / "leads.sqlite3"))
+    os.environ.setdefault("SENSYVA_REPORT_CACHE", str(Path(workdir) / "reports"))
+
+    cases = engine_cases() + app_cases()
+    if args.only:
+        cases = [case for case in cases if case.name.startswith(tuple(args.only))]
+
+    results = {}
+    for case in cases:
+        results[case.name] = case.measure(args.repeat)
+        result = results[case.name]
+        per_item = f"  ({_fmt(result['per_item_s'])}/item)" if case.items > 1 else ""
+        print(f"{case.name:<44}{_fmt(result['median_s']):>12}  ±{_fmt(result['stdev_s'])}{per_item}", flush=True)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"results written to {args.output}")
+
+    if args.compare is None:
+        return 0
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    print(f"\nno regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,113 @@
 import streamlit as st
-import time
+import altair as alt
+import logging
+import numpy as np
+import os
 import pandas as pd
+import weakref
 from pathlib import Path
 
+from functools import partial
+
+from sensyva_audit.accounts import LeadIndexLoader
+from sensyva_audit.cache import DEFAULT_MAXSIZE, DEFAULT_PRECISION, DEFAULT_TTL_SECONDS, ResultCache
+from sensyva_audit.coefficients import COEFFICIENTS_FILE, CoefficientStore
+from sensyva_audit.datagap import AnalysisWindows, DataGapProfile, profile_sensor_dump
+from sensyva_audit.engine import (
+    DOWNTIME_REDUCTION_PERCENTAGE,
+    INPUT_COLUMNS,
+    MAINTENANCE_REDUCTION_PERCENTAGE,
+    calculate_impact,
+)
+from sensyva_audit.export import export_table
+from sensyva_audit.formatting import downtime_chart_frame, format_crores, format_lakhs, format_payback, projection_chart_frame
+from sensyva_audit.goalseek import (
+    IRR_BRACKET,
+    NOT_BRACKETED,
+    SOLVED,
+    STATUS_LABELS,
+    internal_rate_of_return,
+    solve_required_input,
+)
+from sensyva_audit.industry import INDUSTRY_CONTEXT
+from sensyva_audit.leads import Lead, LeadWriter
+from sensyva_audit.metrics import Metrics
+from sensyva_audit.pipeline import REPORT_STAGES, StageTimer
+from sensyva_audit.portfolio import ASSET_CLASS_COLUMN, INDUSTRY_COLUMN, SITE_COLUMN, run_portfolio_audit
+from sensyva_audit.rendering import APP_STYLE, LEAD_FORM_STYLE, render_intro, render_narrative
+from sensyva_audit.projection import (
+    DEFAULT_DISCOUNT_RATE,
+    DEFAULT_RAMP_MONTHS,
+    DEFAULT_YEARS,
+    project_cash_flows,
+    project_site,
+)
+from sensyva_audit.reports import PDFReportCache, ReportRenderer
+from sensyva_audit.sensitivity import (
+    DEFAULT_RESOLUTION,
+    DEFAULT_SWING,
+    grid_extent,
+    interpolate_grid,
+    savings_grid,
+    tornado,
+)
+from sensyva_audit.simulation import (
+    DEFAULT_DRAWS,
+    DEFAULT_SEED,
+    DOWNTIME_REDUCTION_RANGE,
+    MAINTENANCE_REDUCTION_RANGE,
+    input_distribution,
+    reduction_uncertainty,
+    simulate_impact,
+)
+from sensyva_audit.warmup import DEFAULT_WARMUP_SCENARIOS, THREAD_NAME as WARMUP_THREAD_NAME, CacheWarmup
+from sensyva_audit.workspace import ScenarioWorkspace
+
 # --- Configuration ---
+# Cells per axis drawn in the sensitivity heatmap (lookups still use the full-resolution grid)
+HEATMAP_CELLS = 50
+# Local lead store; override with the SENSYVA_LEADS_DB environment variable
+LEADS_DB_DEFAULT = "sensyva_leads.sqlite3"
+# Rendered PDF reports; override with the SENSYVA_REPORT_CACHE environment variable
+REPORT_CACHE_DEFAULT = ".sensyva_cache/reports"
+PDF_POLL_SECONDS = 1.0
+# Prometheus metrics are off unless SENSYVA_METRICS_FILE (a file rewritten at most every few seconds)
+# and/or SENSYVA_METRICS_PORT (serves /metrics on localhost) is set
+METRICS_FILE = os.environ.get("SENSYVA_METRICS_FILE")
+METRICS_PORT = os.environ.get("SENSYVA_METRICS_PORT")
+# Calculation cache: SENSYVA_CACHE_SIZE entries, SENSYVA_CACHE_TTL seconds, SENSYVA_CACHE_QUANTIZATION
+# ("exact", "decimals" or "significant") at SENSYVA_CACHE_PRECISION (default: the form's 2 decimals; set 6
+# to key finer inputs apart); set SENSYVA_CACHE_DB to share a disk tier between the app processes on this host
+IMPACT_CACHE_SIZE = int(os.environ.get("SENSYVA_CACHE_SIZE", DEFAULT_MAXSIZE))
+IMPACT_CACHE_TTL = float(os.environ.get("SENSYVA_CACHE_TTL", DEFAULT_TTL_SECONDS))
+IMPACT_CACHE_QUANTIZATION = os.environ.get("SENSYVA_CACHE_QUANTIZATION", "decimals")
+IMPACT_CACHE_PRECISION = int(os.environ.get("SENSYVA_CACHE_PRECISION", DEFAULT_PRECISION))
+# Reduction coefficients per industry and asset class; SENSYVA_COEFFICIENTS points at another file.
+# Edits to the file are picked up by running servers within a few seconds.
+COEFFICIENTS_PATH = os.environ.get("SENSYVA_COEFFICIENTS", str(COEFFICIENTS_FILE))
+# Portfolio result downloads: label -> (export format, file suffix, MIME type)
+PORTFOLIO_EXPORTS = {
+    "CSV": ("csv", ".csv", "text/csv"),
+    "Parquet": ("parquet", ".parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", ".arrow", "application/vnd.apache.arrow.file"),
+    "Excel (XLSX)": ("xlsx", ".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+# Cache warm-up: when a server process starts, the SENSYVA_WARMUP_SCENARIOS most common scenarios (0 disables it)
+# in SENSYVA_WARMUP_HISTORY, a CSV/Parquet history file or by default the lead store, are replayed into the
+# calculation and sensitivity caches on a background thread
+WARMUP_SCENARIOS = int(os.environ.get("SENSYVA_WARMUP_SCENARIOS", DEFAULT_WARMUP_SCENARIOS))
+# Entries kept by the sensitivity caches, and so the most scenarios worth warming for each
+SENSITIVITY_GRID_ENTRIES = 64
+SENSITIVITY_TORNADO_ENTRIES = 256
+# Scenarios shown side by side in the scenario workspace
+MAX_SCENARIOS = 4
+# Goal seek: label -> (input solved for, formatter for the required value)
+GOAL_SEEK_INPUTS = {
+    "Unplanned downtime (hours/year)": ("unplanned_downtime_hours", lambda hours: f"{hours:,.0f} hours"),
+    "Loss per downtime hour": ("revenue_loss_per_hour_lakhs", format_lakhs),
+    "Maintenance budget": ("annual_maintenance_budget_crores", format_crores),
+}
+
 # Set the page title and favicon
 st.set_page_config(
     page_title="Sensyva AI | 95% Data Gap Audit",
@@ -14,287 +118,555 @@ st.set_page_config(
 
 # --- Core Calculation Logic ---
 
-# Use st.cache_data to memoize the function, making the app faster
-@st.cache_data
+# One coefficient store per server process; it re-reads the file when it changes
+@st.cache_resource
+def get_coefficient_store():
+    """Process-wide hot-reloading store of the per-industry reduction coefficients."""
+    return CoefficientStore(COEFFICIENTS_PATH)
+
+def industry_coefficients(industry: str) -> dict:
+    """Current maintenance and downtime reductions for `industry`."""
+    return get_coefficient_store().table.coefficients(industry)
+
+# One bounded calculation cache per server process and coefficient pair (optionally backed by a
+# shared disk tier), so reloading the coefficients only bypasses the entries whose values changed
+@st.cache_resource(max_entries=16)
+def get_impact_cache(maintenance_reduction: float, downtime_reduction: float):
+    """Process-wide ResultCache for calculate_sensyva_impact_generalized, configured from the environment."""
+    cache = ResultCache(
+        maxsize=IMPACT_CACHE_SIZE,
+        ttl_seconds=IMPACT_CACHE_TTL,
+        quantization=IMPACT_CACHE_QUANTIZATION,
+        precision=IMPACT_CACHE_PRECISION,
+        disk_path=os.environ.get("SENSYVA_CACHE_DB"),
+        # Disk entries are only valid for the reduction percentages that produced them
+        namespace=f"impact-{maintenance_reduction}-{downtime_reduction}",
+    )
+    get_impact_cache_registry()[(maintenance_reduction, downtime_reduction)] = cache
+    return cache
+
+# The calculation caches alive in this process, for the metrics collectors; held weakly, so a cache
+# evicted from get_impact_cache disappears here too, and collecting never creates one
+@st.cache_resource
+def get_impact_cache_registry():
+    """Process-wide weak map of (maintenance, downtime) reduction pair -> calculation ResultCache."""
+    return weakref.WeakValueDictionary()
+
+def impact_cache_labels(pair) -> dict:
+    """Metric labels naming a calculation cache's coefficient pair."""
+    return {"maintenance_reduction": f"{pair[0]:g}", "downtime_reduction": f"{pair[1]:g}"}
+
 def calculate_sensyva_impact_generalized(
     annual_maintenance_budget_crores: float,
     unplanned_downtime_hours: float,
     revenue_loss_per_hour_lakhs: float,
+    maintenance_reduction: float = MAINTENANCE_REDUCTION_PERCENTAGE,
+    downtime_reduction: float = DOWNTIME_REDUCTION_PERCENTAGE,
 ):
     """
     Calculates the potential savings and impact of Sensyva AI for general industrial operations.
 
+    Thin wrapper over the vectorized portfolio engine so the form and batch runs give identical numbers.
+    Results come from the bounded process-wide cache, keyed on the quantized inputs.
+
     Args:
         annual_maintenance_budget_crores (float): Estimated annual budget for maintenance/repairs in Crores INR.
         unplanned_downtime_hours (float): Approximately how many unplanned downtime hours experienced per year.
         revenue_loss_per_hour_lakhs (float): Estimated revenue/production loss per hour of downtime in Lakhs INR.
+        maintenance_reduction (float): Fraction of the maintenance budget saved (the industry's coefficient).
+        downtime_reduction (float): Fraction of the downtime cost avoided (the industry's coefficient).
 
     Returns:
         dict: A dictionary containing potential savings and insights.
     """
+    results = get_impact_cache(maintenance_reduction, downtime_reduction).get_or_compute(
+        partial(calculate_impact, maintenance_reduction=maintenance_reduction, downtime_reduction=downtime_reduction),
+        annual_maintenance_budget_crores,
+        unplanned_downtime_hours,
+        revenue_loss_per_hour_lakhs,
+    )
+    # Callers get their own copy; the cached dict is shared by every session
+    return dict(results)
 
-    # --- Sensyva's Proven Impact Percentages (Generalized and Defensible) ---
-    # These values (65% and 70%) should be updated based on your average POC performance.
-    MAINTENANCE_REDUCTION_PERCENTAGE = 0.65
-    DOWNTIME_REDUCTION_PERCENTAGE = 0.70
-
-    # --- Calculations ---
-
-    # 1. Potential Maintenance Cost Savings (Direct)
-    potential_maintenance_savings = annual_maintenance_budget_crores * MAINTENANCE_REDUCTION_PERCENTAGE
-
-    # 2. Estimated Total Downtime Cost & Potential Savings
-    # Convert Lakhs/hour to Crores/hour for consistent unit output
-    revenue_loss_per_hour_crores = revenue_loss_per_hour_lakhs / 100.0
-
-    # Total Downtime Cost (Crores) = Hours * Revenue Loss (Crores/Hour)
-    estimated_total_downtime_cost_crores = unplanned_downtime_hours * revenue_loss_per_hour_crores
-    potential_downtime_savings_crores = estimated_total_downtime_cost_crores * DOWNTIME_REDUCTION_PERCENTAGE
-
-    # 3. Total Potential Annual Savings (Crores)
-    total_potential_annual_savings = potential_maintenance_savings + potential_downtime_savings_crores
-
-    # --- Output ---
-    results = {
-        "annual_maintenance_budget_crores": annual_maintenance_budget_crores,
-        "unplanned_downtime_hours": unplanned_downtime_hours,
-        "revenue_loss_per_hour_lakhs": revenue_loss_per_hour_lakhs,
-        "potential_maintenance_savings_crores": potential_maintenance_savings,
-        "potential_downtime_savings_crores": potential_downtime_savings_crores,
-        "total_potential_annual_savings_crores": total_potential_annual_savings,
-        "maintenance_reduction_percentage": int(MAINTENANCE_REDUCTION_PERCENTAGE * 100),
-        "downtime_reduction_percentage": int(DOWNTIME_REDUCTION_PERCENTAGE * 100),
-        "estimated_total_downtime_cost_crores": estimated_total_downtime_cost_crores,
-    }
-    return results
-
-INDUSTRY_CONTEXT = {
-    "Manufacturing": {
-        "savings_hook": "Machining and assembly lines that analyze vibration, temperature, and acoustic signatures early see dramatic scrap and warranty reductions.",
-        "hero_stat": "Top Tier 1 auto supplier cut downtime response from 45 minutes to 6 minutes with edge anomaly detection.",
-    },
-    "Energy": {
-        "savings_hook": "Utilities avoid cascading failures by fusing transformer, weather, and SCADA feeds at the edge.",
-        "hero_stat": "Combined-cycle plant prevented two turbine trips, protecting ₹34 Cr in output within the first quarter.",
-    },
-    "Logistics": {
-        "savings_hook": "Fleet-wide telemetry fused in real-time avoids cold-chain spoilage and loading bay gridlock.",
-        "hero_stat": "National logistics operator improved asset utilization by 18% after deploying Sensyva nodes to yards.",
-    },
-    "Defense": {
-        "savings_hook": "Multi-sensor fusion enables mission-critical systems to go from reactive maintenance to pre-emptive readiness.",
-        "hero_stat": "A radar OEM reduced mission aborts by 72% by pairing Sensyva’s edge stack with existing BMS sensors.",
-    },
-    "Other": {
-        "savings_hook": "Sensor-rich environments—from pharmaceuticals to mining—gain clarity when silent data streams become decisions.",
-        "hero_stat": "Sensyva deployments routinely surface ROI within 90 days by turning dormant data into actionable foresight.",
-    },
-}
-
-
-def get_industry_context(industry: str) -> dict:
-    """Return narrative context for the selected industry."""
-    return INDUSTRY_CONTEXT.get(industry, INDUSTRY_CONTEXT["Other"])
-
-
-# --- Presentation Utility Functions ---
-def format_crores(value):
-    """Formats a number into a readable Crores INR string."""
-    return f"₹{value:.2f} Cr"
-
-def format_lakhs(value):
-    """Formats a number into a readable Lakhs INR string."""
-    return f"₹{value:.2f} Lakhs"
-
-# --- Main Streamlit App Layout ---
-
-# Custom CSS aligned with Sensyva brand palette
-st.markdown("""
-<style>
-:root {
-    --bg-start: #10243b;
-    --bg-mid: #163652;
-    --bg-end: #214c70;
-    --panel-bg: rgba(37, 63, 89, 0.88);
-    --panel-border: rgba(126, 193, 237, 0.35);
-    --primary: #137ab7;
-    --primary-bright: #3cc6ff;
-    --accent: #7fe0ff;
-    --text-strong: #f1f7ff;
-    --text-body: #e2ecf8;
-    --text-muted: #b0c5dc;
-}
-
-/* Base styles */
-.stApp {
-    background: linear-gradient(145deg, var(--bg-start) 0%, var(--bg-mid) 42%, var(--bg-end) 100%) !important;
-    color: var(--text-body) !important;
-    font-family: 'Inter', system-ui, -apple-system, sans-serif !important;
-}
-
-.main .block-container {
-    background: transparent !important;
-}
-
-/* Headings and emphasis */
-h1, h2, h3, .st-b5 {
-    color: var(--primary-bright) !important;
-    font-weight: 600 !important;
-    letter-spacing: 0.5px !important;
-}
-
-.stMarkdown strong {
-    color: var(--text-strong) !important;
-}
-
-/* Body copy */
-.stMarkdown p,
-.stMarkdown li,
-.result-box p,
-.result-box li,
-.css-1d391kg, .css-1p05t8e, .css-1n76uvr {
-    color: var(--text-body) !important;
-    line-height: 1.65 !important;
-}
-
-.css-81oif8, .css-1aehpvj, .stCaption, .stMarkdown em {
-    color: var(--text-muted) !important;
-}
-
-/* Panels and forms */
-.stForm, div[data-testid="stForm"], form {
-    border: 1px solid var(--panel-border) !important;
-    padding: 30px !important;
-    border-radius: 18px !important;
-    background: var(--panel-bg) !important;
-    box-shadow: 0 20px 48px rgba(5, 18, 33, 0.36) !important;
-}
-
-.stNumberInput, .stSelectbox, .stTextInput {
-    background-color: rgba(255, 255, 255, 0.95) !important;
-    color: #0b2742 !important;
-    border: 1px solid rgba(21, 92, 140, 0.35) !important;
-    border-radius: 12px !important;
-    padding: 12px 14px !important;
-    margin: 10px 0 !important;
-}
+# Cached on every input and the seed, so resubmitting the same scenario skips the simulation
+@st.cache_data(max_entries=256)
+def simulate_sensyva_impact(
+    annual_maintenance_budget_crores: float,
+    unplanned_downtime_hours: float,
+    revenue_loss_per_hour_lakhs: float,
+    input_spread: float,
+    input_kind: str,
+    reduction_kind: str,
+    draws: int,
+    maintenance_reduction: float = MAINTENANCE_REDUCTION_PERCENTAGE,
+    downtime_reduction: float = DOWNTIME_REDUCTION_PERCENTAGE,
+    seed: int = DEFAULT_SEED,
+):
+    """
+    Runs the cached Monte Carlo uncertainty analysis for the submitted form values.
 
-.stNumberInput:hover, .stSelectbox:hover, .stTextInput:hover {
-    border-color: var(--primary) !important;
-    background-color: rgba(255, 255, 255, 1) !important;
-}
+    Args:
+        input_spread (float): Relative uncertainty applied to each user input (0.2 = ±20%).
+        input_kind (str): "triangular" or "lognormal" for the user inputs.
+        reduction_kind (str): "beta" or "triangular" for the reduction benchmarks.
+        draws (int): Number of Monte Carlo draws.
+        maintenance_reduction (float): Industry coefficient the maintenance reduction is centred on.
+        downtime_reduction (float): Industry coefficient the downtime reduction is centred on.
+        seed (int): Random seed; identical inputs and seed return the cached result.
 
-.stTextInput > label {
-    color: var(--text-muted) !important;
-    letter-spacing: 0.4px !important;
-}
+    Returns:
+        dict: P10/P50/P90 summaries and a histogram of total savings.
+    """
+    return simulate_impact(
+        input_distribution(input_kind, annual_maintenance_budget_crores, input_spread),
+        input_distribution(input_kind, unplanned_downtime_hours, input_spread),
+        input_distribution(input_kind, revenue_loss_per_hour_lakhs, input_spread),
+        reduction_uncertainty(reduction_kind, maintenance_reduction, MAINTENANCE_REDUCTION_RANGE),
+        reduction_uncertainty(reduction_kind, downtime_reduction, DOWNTIME_REDUCTION_RANGE),
+        draws=draws,
+        seed=seed,
+    )
 
-.stTextInput > div > div > input,
-.stNumberInput input {
-    color: #0b2742 !important;
-    caret-color: var(--primary) !important;
-}
+def projection_settings():
+    """Horizon, discounting and ramp-up arguments for the projection, from the audit form's finance inputs."""
+    return {
+        "years": int(st.session_state["roi_years"]),
+        "discount_rate": st.session_state["roi_discount"] / 100.0,
+        "ramp_months": st.session_state["roi_ramp_months"],
+        "ramp_curve": st.session_state["roi_ramp_curve"].lower(),
+    }
 
-.stTextInput > div > div > input::placeholder,
-.stNumberInput input::placeholder {
-    color: rgba(11, 39, 66, 0.6) !important;
-}
+# Cached on the results file and finance inputs, so portfolio reruns reuse the per-site projection
+@st.cache_data(max_entries=16)
+def project_portfolio(results_path: str, hardware_cost_crores: float, subscription_crores: float, **settings):
+    """
+    Projects every scored site of a portfolio in one vectorized pass.
 
-.stTextInput > div > div > input:focus,
-.stNumberInput input:focus {
-    border: 1px solid var(--accent) !important;
-    box-shadow: 0 0 0 2px rgba(127, 224, 255, 0.35) !important;
-}
+    Args:
+        results_path (str): Per-site results CSV written by run_portfolio_audit.
+        hardware_cost_crores (float): Up-front cost per site.
+        subscription_crores (float): Subscription cost per site per year.
+        **settings: Horizon, discounting and ramp-up arguments (see projection_settings).
 
-.stSelectbox > div > div {
-    background-color: rgba(255, 255, 255, 0.95) !important;
-    color: #0b2742 !important;
-    border: 1px solid rgba(21, 92, 140, 0.35) !important;
-}
+    Returns:
+        dict: Portfolio NPV, cash-flow totals by year and per-site payback counts.
+    """
+    savings = pd.read_csv(results_path, usecols=["total_potential_annual_savings_crores"]).iloc[:, 0].to_numpy()
+    projection = project_cash_flows(savings, hardware_cost_crores, subscription_crores, **settings)
+    paid_back = np.isfinite(projection["payback_month"])
+    return {
+        "years": projection["years"].tolist(),
+        "upfront_crores": float(projection["upfront_crores"].sum()),
+        "net_cash_flow_crores": projection["net_cash_flow_crores"].sum(axis=0).tolist(),
+        "cumulative_cash_flow_crores": projection["cumulative_cash_flow_crores"].sum(axis=0).tolist(),
+        "npv_crores": float(projection["npv_crores"].sum()),
+        "sites": len(savings),
+        "sites_paid_back": int(paid_back.sum()),
+        "median_payback_month": float(np.median(projection["payback_month"][paid_back])) if paid_back.any() else None,
+    }
 
-.stSelectbox div[role="listbox"] {
-    background-color: rgba(240, 247, 255, 0.98) !important;
-    border: 1px solid rgba(21, 92, 140, 0.35) !important;
-}
+# Cached per results file and format, so switching formats back and forth re-exports nothing
+@st.cache_data(max_entries=16)
+def export_portfolio_results(results_path: str, export_label: str) -> str:
+    """Streams the portfolio results CSV into the chosen format beside it and returns the exported file's path."""
+    fmt, suffix, _ = PORTFOLIO_EXPORTS[export_label]
+    if fmt == "csv":
+        return results_path
+    output = str(Path(results_path).with_suffix(suffix))
+    export_table(results_path, output, fmt=fmt)
+    return output
+
+# One background writer per server process, shared by every session
+@st.cache_resource
+def get_lead_writer():
+    """Process-wide write-behind lead writer backed by the local SQLite store."""
+    return LeadWriter(os.environ.get("SENSYVA_LEADS_DB", LEADS_DB_DEFAULT))
+
+# Dedup/account index rebuilt once per server process on its own thread (a large store takes seconds), then kept
+# current by every submit; submits made while it rebuilds are queued rather than waiting for it
+@st.cache_resource
+def get_lead_index():
+    """Process-wide loader of the index of captured leads by contact and account."""
+    return LeadIndexLoader(os.environ.get("SENSYVA_LEADS_DB", LEADS_DB_DEFAULT)).start()
+
+# PDFs render in a process pool behind a content-addressed disk cache shared by every session
+@st.cache_resource
+def get_report_renderer():
+    """Process-wide background PDF renderer."""
+    cache_dir = os.environ.get("SENSYVA_REPORT_CACHE", REPORT_CACHE_DEFAULT)
+    return ReportRenderer(PDFReportCache(cache_dir))
+
+# One metrics registry per server process; every session's reruns report into it
+@st.cache_resource
+def get_metrics():
+    """Process-wide Metrics, exporting calculation cache statistics alongside the rerun hooks."""
+    metrics = Metrics(enabled=bool(METRICS_FILE or METRICS_PORT), path=METRICS_FILE)
+    if not metrics.enabled:
+        return metrics
+    # Per coefficient pair: each cache's counters only grow, where a sum over the current pairs could drop
+    impact_caches = get_impact_cache_registry()
+    metrics.add_collector(
+        "calculation_cache_events_total",
+        "counter",
+        "Calculation cache lookups and evictions, by coefficient pair and event.",
+        lambda: [
+            ({**impact_cache_labels(pair), "event": event}, count)
+            for pair, cache in sorted(impact_caches.items())
+            for event, count in list(cache.stats.items())
+        ],
+    )
+    metrics.add_collector(
+        "calculation_cache_entries",
+        "gauge",
+        "Calculation results held in memory, by coefficient pair.",
+        lambda: [(impact_cache_labels(pair), len(cache)) for pair, cache in sorted(impact_caches.items())],
+    )
+    metrics.add_collector(
+        "cache_warmup_entries",
+        "gauge",
+        "Cache entries primed by the startup warm-up, by step.",
+        cache_warmup_entries,
+    )
+    metrics.add_collector(
+        "cache_warmup_seconds",
+        "gauge",
+        "Wall time of the finished startup warm-up.",
+        cache_warmup_seconds,
+    )
+    if METRICS_PORT:
+        metrics.serve(port=int(METRICS_PORT))
+    return metrics
+
+def pdf_report_download(pdf_future):
+    """Offers the PDF report, or polls for it in pdf_report_pending while its background render runs."""
+    if not pdf_future.done():
+        pdf_report_pending(pdf_future)
+    elif pdf_future.exception() is not None:
+        st.caption("The PDF report is unavailable right now; the one-page summary above has the same figures.")
+    else:
+        st.download_button(
+            label="📑 Download the Full PDF Report",
+            data=pdf_future.result(),
+            file_name="sensyva-data-gap-audit-report.pdf",
+            mime="application/pdf",
+        )
 
-.stSelectbox div[role="option"] {
-    color: #0b2742 !important;
-}
+# Polls without rerunning the page; a full rerun once the render finishes shows the result and, as the
+# fragment is not drawn again, cancels its timer
+@st.fragment(run_every=PDF_POLL_SECONDS)
+def pdf_report_pending(pdf_future):
+    """Waits for the PDF render, then reruns the page once with the finished future."""
+    if pdf_future.done():
+        st.session_state["pdf_report_ready"] = pdf_future
+        st.rerun()
+    st.caption("⏳ Preparing your full PDF report…")
+
+# Runs as a fragment, so editing a scenario reruns only this panel instead of the whole page
+@st.fragment
+def scenario_workspace_panel(seed_inputs):
+    """Named what-if scenarios side by side; only the values a change affects are recomputed."""
+    workspace = st.session_state.setdefault("scenario_workspace", ScenarioWorkspace())
+    # Every scenario uses the current coefficients of the industry picked in the audit form
+    industry = st.session_state.get("industry", "Other")
+    coefficients = industry_coefficients(industry)
+    if not len(workspace):
+        workspace.add("Your Inputs", *seed_inputs, **coefficients)
+    workspace.set_coefficients(**coefficients)
+
+    add_col1, add_col2 = st.columns([3, 1])
+    with add_col1:
+        new_name = st.text_input("New scenario name", key="ws_new_name", placeholder=f"Scenario {len(workspace) + 1}")
+    with add_col2:
+        st.markdown("<div style='height: 1.75em;'></div>", unsafe_allow_html=True)
+        if st.button("➕ Add Scenario", disabled=len(workspace) >= MAX_SCENARIOS, use_container_width=True):
+            try:
+                workspace.add(new_name or f"Scenario {len(workspace) + 1}", *seed_inputs, **coefficients)
+            except ValueError as e:
+                st.warning(str(e))
+
+    for column, name in zip(st.columns(len(workspace)), workspace.names):
+        inputs = workspace.inputs(name)
+        with column:
+            st.markdown(f"**{name}**")
+            workspace.update(
+                name,
+                annual_maintenance_budget_crores=st.number_input(
+                    "Maintenance budget (Crores)", min_value=0.0, value=inputs["annual_maintenance_budget_crores"], step=1.0, key=f"ws_{name}_budget"
+                ),
+                unplanned_downtime_hours=st.number_input(
+                    "Downtime (hours/year)", min_value=0.0, value=inputs["unplanned_downtime_hours"], step=50.0, key=f"ws_{name}_hours"
+                ),
+                revenue_loss_per_hour_lakhs=st.number_input(
+                    "Loss per hour (Lakhs)", min_value=0.0, value=inputs["revenue_loss_per_hour_lakhs"], step=0.5, key=f"ws_{name}_loss"
+                ),
+            )
+            if len(workspace) > 1:
+                # Removed in the click's callback, before the next run draws the columns
+                st.button("Remove", key=f"ws_{name}_remove", on_click=workspace.remove, args=(name,))
+
+    evaluated = workspace.evaluate()
+    first_total = next(iter(evaluated.values()))["results"]["total_potential_annual_savings_crores"]
+    for position, (column, (name, outputs)) in enumerate(zip(st.columns(len(evaluated)), evaluated.items())):
+        total = outputs["results"]["total_potential_annual_savings_crores"]
+        with column:
+            st.metric(
+                f"{name}: Total Annual Savings",
+                format_crores(total),
+                delta=f"{total - first_total:+.2f} Cr vs. {workspace.names[0]}" if position else None,
+            )
+            st.bar_chart(outputs["downtime_chart"], height=220)
+    st.dataframe(workspace.comparison_frame(evaluated), use_container_width=True)
+
+    stats = workspace.last_stats
+    st.caption(
+        f"Scored with the {industry} reductions: {coefficients['maintenance_reduction']:.0%} of maintenance spend, "
+        f"{coefficients['downtime_reduction']:.0%} of downtime cost. "
+        f"♻️ Last change recomputed {stats['computed']} of {stats['computed'] + stats['skipped']} derived values "
+        f"and reused {stats['skipped']}."
+    )
 
-.stSelectbox div[role="option"]:hover {
-    background: rgba(19, 122, 183, 0.16) !important;
-}
+# Runs as a fragment, so switching the download format keeps the rest of the page (and the report) as it is
+@st.fragment
+def portfolio_results_panel(portfolio_audit):
+    """Portfolio totals, projection, per-site preview and the results download in the chosen format."""
+    st.success(
+        f"✅ Portfolio Audit Complete: {portfolio_audit.sites_scored:,} sites scored"
+        + (f", {portfolio_audit.sites_skipped:,} skipped for missing or non-positive inputs" if portfolio_audit.sites_skipped else "")
+        + "."
+    )
+    if portfolio_audit.unknown_industry_sites:
+        st.caption(f"{portfolio_audit.unknown_industry_sites:,} sites had an unrecognised industry and were grouped under Other.")
+    st.caption(f"Scored with per-industry reduction coefficients {portfolio_audit.coefficients_version}.")
+
+    col_p1, col_p2, col_p3 = st.columns(3)
+    col_p1.metric("Portfolio Total Annual Savings", format_crores(portfolio_audit.totals["total_potential_annual_savings_crores"]))
+    col_p2.metric("Portfolio Maintenance Savings", format_crores(portfolio_audit.totals["potential_maintenance_savings_crores"]))
+    col_p3.metric("Portfolio Downtime Savings", format_crores(portfolio_audit.totals["potential_downtime_savings_crores"]))
+
+    if st.session_state.get("project_roi") and portfolio_audit.sites_scored:
+        portfolio_projection = project_portfolio(
+            str(portfolio_audit.results_path),
+            st.session_state["roi_hardware"],
+            st.session_state["roi_subscription"],
+            **projection_settings(),
+        )
+        col_r1, col_r2 = st.columns([1, 2])
+        col_r1.metric(
+            f"Portfolio {len(portfolio_projection['years'])}-Year NPV",
+            format_crores(portfolio_projection["npv_crores"]),
+            delta=f"{portfolio_projection['sites_paid_back']:,} of {portfolio_projection['sites']:,} sites pay back",
+            delta_color="off",
+        )
+        if portfolio_projection["median_payback_month"] is not None:
+            col_r1.caption(f"Median payback: month {portfolio_projection['median_payback_month']:.0f}")
+        with col_r2:
+            st.line_chart(projection_chart_frame(portfolio_projection), height=260)
+
+    if portfolio_audit.industry_totals:
+        st.markdown("**Savings by Industry (Crores)**")
+        st.dataframe(portfolio_audit.industry_table(), use_container_width=True)
+    st.markdown(f"**Per-Site Results** (first {len(portfolio_audit.preview):,} of {portfolio_audit.sites_scored:,})")
+    st.dataframe(portfolio_audit.preview, use_container_width=True, height=320)
+
+    export_col1, export_col2 = st.columns([1, 2])
+    with export_col1:
+        export_label = st.selectbox("Download format", options=list(PORTFOLIO_EXPORTS), key="portfolio_export_format")
+    _, export_suffix, export_mime = PORTFOLIO_EXPORTS[export_label]
+    try:
+        export_path = export_portfolio_results(str(portfolio_audit.results_path), export_label)
+    except ImportError as e:
+        metrics.inc("exceptions_total", section="portfolio_export")
+        st.error(f"That format isn't available on this server. Error: {e}")
+    else:
+        with export_col2:
+            st.markdown("<div style='height: 1.75em;'></div>", unsafe_allow_html=True)
+            # Deferred: the export is only read from disk when someone clicks, not held in memory on every rerun
+            st.download_button(
+                label=f"📥 Download Per-Site Results as {export_label}",
+                data=Path(export_path).read_bytes,
+                file_name=f"sensyva-portfolio-audit{export_suffix}",
+                mime=export_mime,
+            )
 
-/* Buttons */
-.stButton > button, button[kind="primary"], div[data-testid="stFormSubmitButton"] > button {
-    background: linear-gradient(130deg, var(--primary) 0%, var(--primary-bright) 60%, var(--accent) 100%) !important;
-    color: var(--text-strong) !important;
-    font-weight: 600 !important;
-    border-radius: 14px !important;
-    border: 1px solid rgba(180, 233, 255, 0.55) !important;
-    padding: 18px 34px !important;
-    transition: all 0.3s ease !important;
-    letter-spacing: 1px !important;
-    box-shadow: 0 16px 42px rgba(18, 122, 180, 0.35) !important;
-}
+# Runs as a fragment, so dragging a what-if slider keeps the report above on screen instead of rerunning the page
+@st.fragment
+def what_if_panel(base_inputs, base_reductions):
+    """What-if sliders over downtime hours and hourly loss, read from the precomputed sensitivity grid."""
+    base_budget, base_hours, base_loss = base_inputs
+    max_hours, max_loss = grid_extent(base_hours), grid_extent(base_loss)
+    grid = sensitivity_grid(base_budget, max_hours, max_loss, *base_reductions)
+
+    what_if_col1, what_if_col2, what_if_col3 = st.columns(3)
+    with what_if_col1:
+        what_if_hours = st.slider("What-if downtime (hours/year)", 0.0, max_hours, float(base_hours))
+    with what_if_col2:
+        what_if_loss = st.slider("What-if loss per hour (Lakhs)", 0.0, max_loss, float(base_loss))
+    what_if_total = float(interpolate_grid(grid, what_if_hours, what_if_loss))
+    base_total = float(interpolate_grid(grid, base_hours, base_loss))
+    what_if_col3.metric(
+        "What-if Total Annual Savings",
+        format_crores(what_if_total),
+        delta=f"{what_if_total - base_total:+.2f} Cr vs. your inputs",
+    )
 
-.stButton > button:hover, button[kind="primary"]:hover {
-    background: linear-gradient(130deg, var(--primary-bright) 0%, var(--accent) 70%, #b8f0ff 100%) !important;
-    transform: translateY(-2px) scale(1.02) !important;
-    box-shadow: 0 22px 48px rgba(33, 173, 229, 0.45) !important;
-}
+# Runs as a fragment, so changing the target re-solves without rerunning the whole page
+@st.fragment
+def goal_seek_panel(form_inputs):
+    """Solves the audit formula backwards: the input needed, given the other two, for a target total."""
+    current = dict(zip(INPUT_COLUMNS, form_inputs))
+    coefficients = industry_coefficients(st.session_state.get("industry", "Other"))
+    current_total = calculate_impact(*form_inputs, **coefficients)["total_potential_annual_savings_crores"]
+    seek_col1, seek_col2, seek_col3 = st.columns(3)
+    with seek_col1:
+        target = st.number_input(
+            "Target total annual savings (Crores INR)",
+            min_value=0.0,
+            value=float(round(max(current_total, 1.0) * 2, 2)),
+            step=1.0,
+            format="%.2f",
+            key="goal_target",
+        )
+    with seek_col2:
+        solve_label = st.selectbox("Solve for", options=list(GOAL_SEEK_INPUTS), key="goal_solve_for")
+    solve_for, format_value = GOAL_SEEK_INPUTS[solve_label]
+    known = {column: value for column, value in current.items() if column != solve_for}
+    solved = solve_required_input(target, solve_for, **known, **coefficients)
+    status = int(solved["status"])
+    if status == SOLVED:
+        required = float(solved[solve_for])
+        seek_col3.metric(
+            f"Required {solve_label.lower()}",
+            format_value(required),
+            delta=f"{required / current[solve_for] - 1:+.0%} vs. your inputs" if current[solve_for] else None,
+            delta_color="off",
+        )
+    else:
+        seek_col3.warning(f"No {solve_label.lower()} reaches {format_crores(target)}: {STATUS_LABELS[status]}.")
+
+    if st.session_state.get("project_roi"):
+        irr = internal_rate_of_return(
+            current_total,
+            st.session_state["roi_hardware"],
+            st.session_state["roi_subscription"],
+            **{name: value for name, value in projection_settings().items() if name != "discount_rate"},
+        )
+        irr_status = int(irr["status"][0])
+        if irr_status == SOLVED:
+            st.caption(f"Internal rate of return of the projection at your inputs: {float(irr['irr'][0]):.1%} a year.")
+        elif irr_status == NOT_BRACKETED:
+            st.caption(f"Internal rate of return at your inputs: outside {IRR_BRACKET[0]:.0%} to {IRR_BRACKET[1]:,.0%} a year.")
+        else:
+            st.caption(f"Internal rate of return at your inputs: {STATUS_LABELS[irr_status]}.")
+
+# Grid extents are snapped to nice bounds, so nearby inputs and slider drags reuse one cached grid
+@st.cache_data(max_entries=SENSITIVITY_GRID_ENTRIES)
+def sensitivity_grid(
+    annual_maintenance_budget_crores: float,
+    max_downtime_hours: float,
+    max_loss_per_hour_lakhs: float,
+    maintenance_reduction: float,
+    downtime_reduction: float,
+):
+    """Dense total-savings grid over downtime hours x loss per hour at a fixed budget."""
+    return savings_grid(
+        annual_maintenance_budget_crores,
+        max_downtime_hours,
+        max_loss_per_hour_lakhs,
+        maintenance_reduction=maintenance_reduction,
+        downtime_reduction=downtime_reduction,
+    )
 
-/* Metrics */
-.stMetric {
-    color: var(--text-strong) !important;
-    background: linear-gradient(140deg, rgba(255, 255, 255, 0.15), rgba(184, 236, 255, 0.25)) !important;
-    border-radius: 16px !important;
-    padding: 20px !important;
-    box-shadow: inset 0 0 0 1px rgba(191, 239, 255, 0.55), 0 18px 40px rgba(8, 30, 49, 0.32) !important;
-}
+@st.cache_data(max_entries=SENSITIVITY_GRID_ENTRIES)
+def sensitivity_heatmap_frame(
+    annual_maintenance_budget_crores: float,
+    max_downtime_hours: float,
+    max_loss_per_hour_lakhs: float,
+    maintenance_reduction: float,
+    downtime_reduction: float,
+):
+    """Long-form heatmap data, downsampled from the cached grid to keep the chart payload small."""
+    grid = sensitivity_grid(
+        annual_maintenance_budget_crores, max_downtime_hours, max_loss_per_hour_lakhs, maintenance_reduction, downtime_reduction
+    )
+    stride = max(DEFAULT_RESOLUTION // HEATMAP_CELLS, 1)
+    hours, loss = np.meshgrid(grid["hours"][::stride], grid["loss"][::stride], indexing="ij")
+    return pd.DataFrame(
+        {
+            "Downtime Hours": hours.ravel().round(0),
+            "Loss per Hour (Lakhs)": loss.ravel().round(2),
+            "Total Savings (Crores)": grid["total"][::stride, ::stride].ravel().round(2),
+        }
+    )
 
-/* Info & alert boxes */
-.stAlert, .stWarning, .stInfo {
-    background-color: rgba(255, 255, 255, 0.08) !important;
-    color: var(--text-body) !important;
-    border: 1px solid rgba(180, 233, 255, 0.35) !important;
-    border-radius: 14px !important;
-}
+@st.cache_data(max_entries=SENSITIVITY_TORNADO_ENTRIES)
+def sensitivity_tornado(
+    annual_maintenance_budget_crores: float,
+    unplanned_downtime_hours: float,
+    revenue_loss_per_hour_lakhs: float,
+    maintenance_reduction: float,
+    downtime_reduction: float,
+):
+    """Tornado bars ranking each input's effect on total savings."""
+    return tornado(
+        annual_maintenance_budget_crores,
+        unplanned_downtime_hours,
+        revenue_loss_per_hour_lakhs,
+        maintenance_reduction=maintenance_reduction,
+        downtime_reduction=downtime_reduction,
+    )
 
-.stAlert p, .stWarning p, .stInfo p {
-    color: var(--text-body) !important;
-}
+def warm_calculation(industry, budget, hours, loss):
+    """Primes the calculation cache for one scenario with its industry's coefficients."""
+    calculate_sensyva_impact_generalized(budget, hours, loss, **industry_coefficients(industry))
+
+def warm_sensitivity_grid(industry, budget, hours, loss):
+    """Primes the sensitivity grid and heatmap caches exactly as the explorer will request them."""
+    sensitivity_heatmap_frame(budget, grid_extent(hours), grid_extent(loss), *industry_coefficients(industry).values())
+
+def warm_sensitivity_tornado(industry, budget, hours, loss):
+    """Primes the tornado cache for one scenario."""
+    sensitivity_tornado(budget, hours, loss, *industry_coefficients(industry).values())
+
+# Started once per server process; replays history on its own thread so no session waits for it
+@st.cache_resource
+def start_cache_warmup():
+    """Process-wide background cache warm-up, or None when it is disabled."""
+    if WARMUP_SCENARIOS <= 0:
+        return None
+    # The cached functions look for a session on the calling thread; the warm-up deliberately has none
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: record.threadName != WARMUP_THREAD_NAME
+    )
+    history = os.environ.get("SENSYVA_WARMUP_HISTORY") or os.environ.get("SENSYVA_LEADS_DB", LEADS_DB_DEFAULT)
+    steps = {
+        "calculations": (warm_calculation, IMPACT_CACHE_SIZE),
+        "sensitivity grids": (warm_sensitivity_grid, SENSITIVITY_GRID_ENTRIES),
+        "tornados": (warm_sensitivity_tornado, SENSITIVITY_TORNADO_ENTRIES),
+    }
+    return CacheWarmup(
+        history, steps, limit=WARMUP_SCENARIOS, quantization=IMPACT_CACHE_QUANTIZATION, precision=IMPACT_CACHE_PRECISION
+    ).start()
 
-/* Results box */
-.result-box {
-    padding: 30px !important;
-    margin-top: 26px !important;
-    border-radius: 20px !important;
-    background: linear-gradient(140deg, rgba(73, 121, 163, 0.55) 0%, rgba(128, 187, 224, 0.55) 100%) !important;
-    border-left: 6px solid var(--accent) !important;
-    box-shadow: 0 24px 60px rgba(12, 34, 54, 0.38) !important;
-}
+def cache_warmup_entries():
+    """Metrics samples for the entries the warm-up has primed, by step."""
+    warmup = start_cache_warmup()
+    return [] if warmup is None else [({"step": step}, count) for step, count in warmup.warmed.items()]
 
-.result-box h4 {
-    color: var(--text-strong) !important;
-}
+def cache_warmup_seconds():
+    """Metrics samples for the warm-up's duration, once it has finished."""
+    warmup = start_cache_warmup()
+    return [({}, warmup.seconds)] if warmup is not None and warmup.done.is_set() else []
 
-.result-box ul li strong {
-    color: var(--accent) !important;
-}
+# --- Main Streamlit App Layout ---
 
-/* Divider */
-hr {
-    border-color: rgba(180, 233, 255, 0.35) !important;
-    margin: 1.8rem 0 !important;
-}
+metrics = get_metrics()
+rerun_timer = metrics.rerun()
+start_cache_warmup()
+get_lead_index()
 
-/* Misc elements */
-.streamlit-expanderHeader, .css-j7qwjs {
-    color: var(--text-strong) !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS aligned with Sensyva brand palette (precompiled once in sensyva_audit/styles/app.css)
+st.markdown(APP_STYLE, unsafe_allow_html=True)
+rerun_timer.lap("css")
 
 
 logo_path = Path("assets/sensyva_logo.png")
@@ -372,18 +744,36 @@ with st.form(key='audit_form', clear_on_submit=False):
                  options=["Manufacturing", "Energy", "Logistics", "Defense", "Other"],
                  index=0, 
                  key="industry")
+
+    # Optional Monte Carlo uncertainty analysis
+    with st.expander("🎲 Uncertainty Analysis (optional)"):
+        st.checkbox("Model uncertainty with a Monte Carlo simulation", value=False, key="simulate")
+        st.caption("Treat your inputs and Sensyva's reduction benchmarks as ranges instead of point estimates and see P10/P50/P90 savings.")
+        sim_col1, sim_col2 = st.columns(2)
+        with sim_col1:
+            st.slider("Input uncertainty (± %)", min_value=0, max_value=50, value=20, step=5, key="sim_input_spread")
+            st.selectbox("Input distribution", options=["Triangular", "Lognormal"], key="sim_input_kind")
+        with sim_col2:
+            st.selectbox("Reduction benchmark distribution", options=["Beta", "Triangular"], key="sim_reduction_kind")
+            st.number_input("Simulation draws", min_value=10_000, max_value=1_000_000, value=DEFAULT_DRAWS, step=10_000, key="sim_draws")
+
+    # Optional multi-year finance view
+    with st.expander("📈 Multi-Year ROI Projection (optional)"):
+        st.checkbox("Project cash flows, NPV and payback over several years", value=False, key="project_roi")
+        st.caption("Savings ramp up as Sensyva is deployed; hardware is paid up front and the subscription yearly. Also applies to the portfolio audit below.")
+        roi_col1, roi_col2, roi_col3 = st.columns(3)
+        with roi_col1:
+            st.slider("Projection horizon (years)", min_value=5, max_value=10, value=DEFAULT_YEARS, key="roi_years")
+            st.number_input("Discount rate (%)", min_value=0.0, max_value=50.0, value=DEFAULT_DISCOUNT_RATE * 100, step=1.0, format="%.1f", key="roi_discount")
+        with roi_col2:
+            st.number_input("Edge hardware & deployment per site (Crores INR)", min_value=0.0, value=1.0, step=0.25, format="%.2f", key="roi_hardware")
+            st.number_input("Annual subscription per site (Crores INR)", min_value=0.0, value=0.5, step=0.1, format="%.2f", key="roi_subscription")
+        with roi_col3:
+            st.slider("Months to full savings", min_value=0, max_value=36, value=DEFAULT_RAMP_MONTHS, key="roi_ramp_months")
+            st.selectbox("Ramp-up curve", options=["S-curve", "Linear", "Immediate"], key="roi_ramp_curve")
     
     st.markdown("---")
     
-    st.markdown("""
-        <style>
-        div[data-testid="stFormSubmitButton"] > button {
-            background: linear-gradient(45deg, #1565c0, #1e88e5) !important;
-            color: white !important;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-    
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         submitted = st.form_submit_button(
@@ -392,52 +782,139 @@ with st.form(key='audit_form', clear_on_submit=False):
             type="primary"
         )
 
+# --- Measured Data Gap ---
+# Optional panels run only while their expander is open, so a closed one costs the audit and lead reruns nothing
+with st.expander("📡 Measure Your Data Gap from Recorded Sensor Data (optional)", key="data_gap_open", on_change="rerun") as data_gap_section:
+    if data_gap_section.open:
+        st.caption(
+            "Upload a Parquet sensor dump (a `timestamp` column and one numeric column per vibration, thermal or power channel), "
+            "or, for dumps too large to upload, the JSON written by `python -m sensyva_audit profile`. "
+            "The report then quotes your measured gap instead of the 95% industry figure."
+        )
+        with st.form(key="data_gap_form"):
+            dump_file = st.file_uploader("Sensor dump or profile", type=["parquet", "json"], key="data_gap_file")
+            gap_col1, gap_col2 = st.columns(2)
+            with gap_col1:
+                st.number_input("Minutes of data your team reviews each time", min_value=0.0, value=10.0, step=5.0, key="review_minutes")
+            with gap_col2:
+                st.number_input("Hours between reviews", min_value=0.25, value=8.0, step=1.0, key="review_every_hours")
+            data_gap_submitted = st.form_submit_button("📡 Profile Sensor Data", use_container_width=True)
+
+        if data_gap_submitted:
+            if dump_file is None:
+                st.warning("Please upload a Parquet sensor dump or a profile JSON to measure your data gap.")
+            else:
+                data_gap_status = st.empty()
+                data_gap_progress = st.progress(0)
+
+                def report_data_gap_progress(fraction, samples_read):
+                    data_gap_progress.progress(min(int(fraction * 100), 100))
+                    data_gap_status.write(f"🔄 Profiled {samples_read:,} samples…")
+
+                try:
+                    if dump_file.name.lower().endswith(".json"):
+                        st.session_state["data_gap_profile"] = DataGapProfile.from_json(dump_file.getvalue())
+                    else:
+                        review_windows = AnalysisWindows(
+                            every_seconds=st.session_state["review_every_hours"] * 3600,
+                            duration_seconds=st.session_state["review_minutes"] * 60,
+                        )
+                        st.session_state["data_gap_profile"] = profile_sensor_dump(
+                            dump_file, windows=review_windows, on_progress=report_data_gap_progress
+                        )
+                except (ValueError, TypeError, ImportError) as e:
+                    metrics.inc("exceptions_total", section="data_gap")
+                    st.error(f"We couldn't profile that sensor data. Error: {e}")
+                data_gap_progress.empty()
+                data_gap_status.empty()
+
+        data_gap_profile = st.session_state.get("data_gap_profile")
+        if data_gap_profile is not None:
+            st.success(
+                f"✅ Measured data gap: {data_gap_profile.data_gap_percentage:.1f}% of expected samples across "
+                f"{len(data_gap_profile.channels):,} channels were never analyzed (analysis windows: {data_gap_profile.windows})."
+            )
+            st.dataframe(data_gap_profile.table(), use_container_width=True)
+
+rerun_timer.lap("form")
+
 # --- Results Presentation ---
 
-if submitted:
+# A lead_form submit reruns the script without re-submitting audit_form, so keep the report on screen for it
+# A finished PDF render also reruns the page once, and must find the report still there
+ready_pdf = st.session_state.pop("pdf_report_ready", None)
+if submitted or st.session_state.get("lead_submit") or ready_pdf is not None:
+    if submitted:
+        metrics.inc("submissions_total", form="audit_form")
+    status_placeholder = st.empty()
+    progress_bar = st.progress(0)
+
+    def report_stage_progress(stage, fraction, duration):
+        progress_bar.progress(int(fraction * 100))
+        status_placeholder.write(f"🔄 {stage.capitalize()} done in {duration * 1e3:.1f} ms…")
+
+    report_timer = StageTimer(REPORT_STAGES, on_lap=report_stage_progress)
     invalid_inputs = any([
         annual_maintenance_budget_crores <= 0,
         unplanned_downtime_hours <= 0,
         revenue_loss_per_hour_lakhs <= 0,
     ])
+    report_timer.lap("validate")
 
     if invalid_inputs:
-        st.warning("Please enter values greater than zero for budget, downtime hours, and hourly loss so we can build a credible forecast.")
-    else:
-        progress_steps = [
-            ("Reconciling your maintenance and downtime baselines…", 0.35),
-            ("Applying Sensyva’s proven reduction benchmarks…", 0.45),
-            ("Quantifying upside and packaging insights…", 0.4),
-        ]
-        status_placeholder = st.empty()
-        progress_bar = st.progress(0)
-        for idx, (message, pause) in enumerate(progress_steps, start=1):
-            status_placeholder.write(f"🔄 {message}")
-            progress_bar.progress(int(idx / len(progress_steps) * 100))
-            time.sleep(pause)
+        metrics.inc("validation_failures_total", form="audit_form")
         progress_bar.empty()
         status_placeholder.empty()
-
+        st.warning("Please enter values greater than zero for budget, downtime hours, and hourly loss so we can build a credible forecast.")
+    else:
         try:
+            industry_choice = st.session_state.get("industry", "Other")
+            coefficients = industry_coefficients(industry_choice)
             results = calculate_sensyva_impact_generalized(
                 annual_maintenance_budget_crores,
                 unplanned_downtime_hours,
-                revenue_loss_per_hour_lakhs
+                revenue_loss_per_hour_lakhs,
+                **coefficients,
             )
-            industry_choice = st.session_state.get("industry", "Other")
-            industry_context = get_industry_context(industry_choice)
+            if st.session_state.get("data_gap_profile") is not None:
+                results = {**results, "data_gap_percentage": st.session_state["data_gap_profile"].data_gap_percentage}
+            # Remembered so the sensitivity explorer survives slider reruns
+            st.session_state["audit_inputs"] = (
+                annual_maintenance_budget_crores,
+                unplanned_downtime_hours,
+                revenue_loss_per_hour_lakhs,
+            )
+            st.session_state["audit_coefficients"] = coefficients
+            simulation = None
+            if st.session_state.get("simulate"):
+                simulation = simulate_sensyva_impact(
+                    annual_maintenance_budget_crores,
+                    unplanned_downtime_hours,
+                    revenue_loss_per_hour_lakhs,
+                    st.session_state["sim_input_spread"] / 100.0,
+                    st.session_state["sim_input_kind"].lower(),
+                    st.session_state["sim_reduction_kind"].lower(),
+                    int(st.session_state["sim_draws"]),
+                    **coefficients,
+                )
+            projection = None
+            if st.session_state.get("project_roi"):
+                projection = project_site(
+                    results["total_potential_annual_savings_crores"],
+                    st.session_state["roi_hardware"],
+                    st.session_state["roi_subscription"],
+                    **projection_settings(),
+                )
+            report_timer.lap("compute")
+            rerun_timer.lap("compute")
 
             st.success("✅ Analysis Complete: Your Sensyva AI Potential Report is Ready.")
             
             st.subheader(f"2. Quantified Impact Forecast for {industry_choice} Leaders")
-            st.markdown(f"""
-            <p style='color: #e3f2fd;'>
-            Based on Sensyva’s edge deployments in {industry_choice.lower()} environments, here’s the risk you can pull back into revenue.
-            </p>
-            """, unsafe_allow_html=True)
+            st.markdown(render_intro(industry_choice), unsafe_allow_html=True)
             
             # Display Key Metrics
-            col_m1, col_m2, col_m3 = st.columns(3)
+            col_m1, col_m2, col_m3, *col_m4 = st.columns(4 if projection is not None else 3)
             
             # Metric 1: Total Annual Savings
             col_m1.metric(
@@ -460,45 +937,52 @@ if submitted:
                 help="Savings from preventing production stoppages by detecting anomalies in 10ms at the Edge."
             )
 
-            st.markdown("**Downtime Loss Compression**")
-            downtime_chart_df = pd.DataFrame(
-                {
-                    "Scenario": ["Current Downtime Loss", "Projected Loss with Sensyva"],
-                    "Cost (Crores)": [
-                        results["estimated_total_downtime_cost_crores"],
-                        results["estimated_total_downtime_cost_crores"] - results["potential_downtime_savings_crores"],
-                    ],
-                }
-            ).set_index("Scenario")
-            st.bar_chart(downtime_chart_df, height=320)
+            # Metric 4: Multi-year NPV and payback
+            if projection is not None:
+                col_m4[0].metric(
+                    label=f"{projection['horizon_years']}-Year NPV at {st.session_state['roi_discount']:g}%",
+                    value=format_crores(projection["npv_crores"]),
+                    delta=format_payback(projection["payback_month"], projection["horizon_years"]),
+                    delta_color="off",
+                    help="Discounted net cash flow after hardware and subscription costs, with savings ramping up during deployment."
+                )
+
+            if projection is None:
+                st.markdown("**Downtime Loss Compression**")
+                st.bar_chart(downtime_chart_frame(results), height=320)
+            else:
+                chart_col1, chart_col2 = st.columns(2)
+                with chart_col1:
+                    st.markdown("**Downtime Loss Compression**")
+                    st.bar_chart(downtime_chart_frame(results), height=320)
+                with chart_col2:
+                    st.markdown("**Cumulative Cash Flow (Crores)**")
+                    st.line_chart(projection_chart_frame(projection), height=320)
+
+            if simulation is not None:
+                total_range = simulation["total_potential_annual_savings_crores"]
+                st.markdown(f"**Savings Uncertainty Range** ({simulation['draws']:,} seeded draws)")
+                col_u1, col_u2, col_u3 = st.columns(3)
+                col_u1.metric("P10 (Conservative)", format_crores(total_range["p10"]))
+                col_u2.metric("P50 (Expected)", format_crores(total_range["p50"]))
+                col_u3.metric("P90 (Upside)", format_crores(total_range["p90"]))
+                edges = simulation["histogram"]["edges"]
+                simulation_chart_df = pd.DataFrame(
+                    {
+                        "Total Savings (Crores)": ((edges[:-1] + edges[1:]) / 2.0).round(2),
+                        "Share of Draws": simulation["histogram"]["counts"] / simulation["draws"],
+                    }
+                ).set_index("Total Savings (Crores)")
+                st.bar_chart(simulation_chart_df, height=260)
+            rerun_timer.lap("chart")
 
             st.markdown("---")
 
             # --- Report Narrative ---
             st.subheader("3. Why This Gap Exists: The Sensyva Difference")
-            st.markdown(f"""
-            <div class="result-box">
-                <h4 style="color: #48bb78; margin-bottom: 10px;">The 95% Data Gap: A Hidden Cost in {industry_choice}</h4>
-                <p style="font-size: 1em;">
-                Your current losses of <strong>{format_crores(results['total_potential_annual_savings_crores'])}</strong> are tied to the 
-                <strong>95% of industrial sensor data</strong> that never gets analyzed in time. This blind spot drives:</p>
-                <ul>
-                    <li><strong style='color: #ccc;'>Late Detection:</strong> Waiting for data to reach the cloud means failures are detected too late, resulting in {results['unplanned_downtime_hours']:.0f} hours/year of hard downtime.</li>
-                    <li><strong style='color: #ccc;'>Incomplete Picture:</strong> Traditional monitoring and {format_crores(results['annual_maintenance_budget_crores'])} in spend still miss cross-sensor context.</li>
-                    <li><strong style='color: #ccc;'>Industry Reality:</strong> {industry_context['savings_hook']}</li>
-                </ul>
-                <br>
-                <h4 style="color: #48bb78; margin-bottom: 10px;">Sensyva AI: The Path to Real-Time Intelligence</h4>
-                <p style="font-size: 1em;">Sensyva’s hardware-agnostic Edge AI framework fuses and scores sensor streams <em>in 10ms</em>, so your teams act before faults cascade.</p>
-                <ul>
-                    <li><strong style='color: #ccc;'>10 Millisecond Decisions:</strong> We analyze vibration, thermal, acoustic, and power data together to surface actionable alerts.</li>
-                    <li><strong style='color: #ccc;'>Proven Reliability:</strong> Clients routinely see maintenance savings of up to {results['maintenance_reduction_percentage']}% and near-zero unplanned downtime.</li>
-                </ul>
-                <p style="font-size: 0.95em; margin-top: 16px; color: #bbdefb;">
-                    📊 {industry_context['hero_stat']}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(render_narrative(industry_choice, results), unsafe_allow_html=True)
+            report_timer.lap("render narrative")
+            rerun_timer.lap("narrative")
             
             st.markdown("---")
 
@@ -513,6 +997,10 @@ if submitted:
                 f"Maintenance Savings Potential: {format_crores(results['potential_maintenance_savings_crores'])}",
                 f"Downtime Savings Potential: {format_crores(results['potential_downtime_savings_crores'])}",
                 f"Total Potential Annual Savings: {format_crores(results['total_potential_annual_savings_crores'])}",
+                *([f"Measured Data Gap: {results['data_gap_percentage']:.1f}% of sensor data never analyzed"] if "data_gap_percentage" in results else []),
+                *([
+                    f"{projection['horizon_years']}-Year NPV: {format_crores(projection['npv_crores'])} ({format_payback(projection['payback_month'], projection['horizon_years'])})"
+                ] if projection is not None else []),
                 "",
                 "Next Step: Share your operations context so we can model the first 90 days with Sensyva Edge AI.",
             ])
@@ -522,39 +1010,18 @@ if submitted:
                 file_name="sensyva-data-gap-audit-summary.txt",
                 mime="text/plain",
             )
+            pdf_report_download(
+                ready_pdf if ready_pdf is not None and not submitted else get_report_renderer().request(results, industry_choice)
+            )
+            report_timer.lap("build download")
+            rerun_timer.lap("download")
+            progress_bar.empty()
+            status_placeholder.empty()
+            # Build timings are for operators, so they go to the sensyva_audit.pipeline log rather than the page
+            report_timer.finish()
 
             # --- Lead Capture CTA ---
-            st.markdown("""
-                <style>
-                /* Lead capture form styles */
-                [data-testid="stForm"] {
-                    background-color: rgba(25, 32, 72, 0.95) !important;
-                    border: 2px solid #1e88e5 !important;
-                    padding: 2rem !important;
-                    border-radius: 12px !important;
-                }
-                
-                /* Text input styling */
-                .stTextInput input {
-                    background-color: rgba(255, 255, 255, 0.1) !important;
-                    color: white !important;
-                    border: 1px solid #1e88e5 !important;
-                    padding: 8px 12px !important;
-                }
-                
-                .stTextInput input:focus {
-                    border: 2px solid #64b5f6 !important;
-                    box-shadow: 0 0 0 1px #64b5f6 !important;
-                }
-                
-                /* Warning message styling */
-                .stWarning {
-                    background-color: rgba(25, 32, 72, 0.95) !important;
-                    color: #ffd700 !important;
-                    border: 1px solid #ffd700 !important;
-                }
-                </style>
-            """, unsafe_allow_html=True)
+            st.markdown(LEAD_FORM_STYLE, unsafe_allow_html=True)
             
             st.subheader("4. Take the Next Step")
             st.warning("Share your details to receive the full PDF report, industry benchmarks, and a 15-minute roadmap session.")
@@ -575,23 +1042,159 @@ if submitted:
                 lead_button_label = f"🚀 Unlock {format_crores(results['total_potential_annual_savings_crores'])} & Schedule a 15-Min Call"
                 lead_submitted = st.form_submit_button(
                     lead_button_label,
+                    key="lead_submit",
                     use_container_width=True,
                     type="primary"
                 )
                 
                 if lead_submitted:
+                    metrics.inc("submissions_total", form="lead_form")
                     if name and email and company:
-                        st.success(
-                            f"Thank you, {name}! We’ll follow up at {email} to close the remaining {format_crores(results['total_potential_annual_savings_crores'])} gap. "
-                            "A calendar link will arrive shortly so you can choose your 15-minute window."
-                        )
-                        # In a production deployment, trigger lead-capture and email automation here.
+                        lead = Lead.from_results(name, email, company, phone, region, industry_choice, results)
+                        # Started before the lead is queued, so its rebuild from the store cannot already contain it
+                        lead_index = get_lead_index()
+                        # Write-behind: queued in memory, persisted by the background writer; False means it will never be written
+                        if not get_lead_writer().submit(lead):
+                            metrics.inc("leads_refused_total")
+                            st.error(
+                                "We couldn’t save your details just now. Please try again in a moment, "
+                                "so we can send the calendar link for your 15-minute call."
+                            )
+                        else:
+                            # None while the index is still rebuilding: the lead is filed later, and greeted as new now
+                            lead_match = lead_index.add(lead)
+                            metrics.inc(
+                                "lead_matches_total",
+                                matched_by="pending" if lead_match is None else lead_match.matched_by or "new",
+                            )
+                            if lead_match is not None and lead_match.duplicate:
+                                st.success(
+                                    f"Welcome back, {name}! We’ve updated your request with this {format_crores(results['total_potential_annual_savings_crores'])} scenario, "
+                                    "so the follow-up will cover your latest numbers. No need to book a second call."
+                                )
+                            else:
+                                st.success(
+                                    f"Thank you, {name}! We’ll follow up at {email} to close the remaining {format_crores(results['total_potential_annual_savings_crores'])} gap. "
+                                    "A calendar link will arrive shortly so you can choose your 15-minute window."
+                                )
                     else:
+                        metrics.inc("validation_failures_total", form="lead_form")
                         st.error("Please fill out your name, work email, and company so we can prepare the custom briefing.")
 
         except Exception as e:
+            metrics.inc("exceptions_total", section="report")
+            progress_bar.empty()
+            status_placeholder.empty()
             st.error(f"An error occurred during calculation. Please check your inputs. Error: {e}")
 
+# --- Sensitivity Explorer ---
+if "audit_inputs" in st.session_state:
+    base_budget, base_hours, base_loss = st.session_state["audit_inputs"]
+    base_reductions = tuple(st.session_state["audit_coefficients"].values())
+    max_hours, max_loss = grid_extent(base_hours), grid_extent(base_loss)
+    with st.expander("🔥 Sensitivity Explorer: what moves your savings most?", key="sensitivity_open", on_change="rerun") as sensitivity_section:
+        if sensitivity_section.open:
+            st.caption(
+                f"Total savings over {DEFAULT_RESOLUTION}×{DEFAULT_RESOLUTION} downtime-hour × hourly-loss scenarios at your "
+                f"{format_crores(base_budget)} maintenance budget. Sliders read from the precomputed grid, so dragging them is instant."
+            )
+            what_if_panel((base_budget, base_hours, base_loss), base_reductions)
+
+            st.markdown("**Total Savings Heatmap (Crores)**")
+            st.altair_chart(
+                alt.Chart(sensitivity_heatmap_frame(base_budget, max_hours, max_loss, *base_reductions))
+                .mark_rect()
+                .encode(
+                    x=alt.X("Loss per Hour (Lakhs):O", axis=alt.Axis(labelOverlap=True)),
+                    y=alt.Y("Downtime Hours:O", sort="descending", axis=alt.Axis(labelOverlap=True)),
+                    color=alt.Color("Total Savings (Crores):Q", scale=alt.Scale(scheme="blues")),
+                    tooltip=["Downtime Hours", "Loss per Hour (Lakhs)", "Total Savings (Crores)"],
+                )
+                .properties(height=360),
+                use_container_width=True,
+            )
+
+            st.markdown(f"**Tornado: Impact of a ±{int(DEFAULT_SWING * 100)}% Change in Each Input**")
+            tornado_df = pd.DataFrame(sensitivity_tornado(base_budget, base_hours, base_loss, *base_reductions))
+            st.altair_chart(
+                alt.Chart(tornado_df)
+                .mark_bar()
+                .encode(
+                    x=alt.X("low:Q", title="Total Savings (Crores)", scale=alt.Scale(zero=False)),
+                    x2="high:Q",
+                    y=alt.Y("input:N", sort=list(tornado_df["input"]), title=None),
+                    tooltip=["input", "low", "high", "range"],
+                )
+                .properties(height=220),
+                use_container_width=True,
+            )
+
+# --- Goal Seek ---
+with st.expander("🎯 Goal Seek: what would it take to save a target amount?", key="goal_seek_open", on_change="rerun") as goal_seek_section:
+    if goal_seek_section.open:
+        st.caption("Pick a savings target and the input to solve for; the other two inputs come from the form above.")
+        goal_seek_panel((annual_maintenance_budget_crores, unplanned_downtime_hours, revenue_loss_per_hour_lakhs))
+
+# --- Scenario Workspace ---
+with st.expander("🧮 Scenario Workspace: compare what-if scenarios side by side", key="workspace_open", on_change="rerun") as workspace_section:
+    if workspace_section.open:
+        st.caption(
+            f"Keep up to {MAX_SCENARIOS} named scenarios in this session. Each change recomputes only the figures "
+            "that depend on the input you edited."
+        )
+        # New scenarios start from the audit form's current values
+        scenario_workspace_panel((annual_maintenance_budget_crores, unplanned_downtime_hours, revenue_loss_per_hour_lakhs))
+
+# --- Portfolio Upload Mode ---
+st.markdown("---")
+with st.expander("📂 Portfolio Audit: upload a site register (CSV or Parquet)", key="portfolio_open", on_change="rerun") as portfolio_section:
+    if portfolio_section.open:
+        st.caption(
+            "One row per site with columns "
+            + ", ".join(f"`{column}`" for column in INPUT_COLUMNS)
+            + f", an `{INDUSTRY_COLUMN}` column ({', '.join(INDUSTRY_CONTEXT)}), an optional `{SITE_COLUMN}` identifier "
+            f"and an optional `{ASSET_CLASS_COLUMN}` for asset-class coefficients. "
+            "Large registers are processed in chunks, so only a preview of the per-site results is shown; download the full table below."
+        )
+        with st.form(key="portfolio_form"):
+            register_file = st.file_uploader("Site register", type=["csv", "parquet"], key="portfolio_file")
+            portfolio_submitted = st.form_submit_button("📊 Run Portfolio Audit", use_container_width=True)
+
+        if portfolio_submitted:
+            if register_file is None:
+                st.warning("Please upload a CSV or Parquet site register to run the portfolio audit.")
+            else:
+                portfolio_status = st.empty()
+                portfolio_progress = st.progress(0)
+
+                def report_portfolio_progress(fraction, sites_scored):
+                    portfolio_progress.progress(min(int(fraction * 100), 100))
+                    portfolio_status.write(f"🔄 Scored {sites_scored:,} sites…")
+
+                try:
+                    new_portfolio_audit = run_portfolio_audit(
+                        register_file, on_progress=report_portfolio_progress, coefficients=get_coefficient_store().table
+                    )
+                    # The previous run's results file and exports are no longer reachable from this session
+                    previous_audit = st.session_state.get("portfolio_audit")
+                    if previous_audit is not None:
+                        previous_audit.discard()
+                    st.session_state["portfolio_audit"] = new_portfolio_audit
+                except (ValueError, ImportError) as e:
+                    metrics.inc("exceptions_total", section="portfolio")
+                    st.error(f"We couldn't process that register. Error: {e}")
+                portfolio_progress.empty()
+                portfolio_status.empty()
+
+        portfolio_audit = st.session_state.get("portfolio_audit")
+        if portfolio_audit is not None and not portfolio_audit.results_path.exists():
+            # Older results are pruned from the shared results directory as new audits run
+            st.info("These portfolio results have expired. Please run the portfolio audit again.")
+            del st.session_state["portfolio_audit"]
+            portfolio_audit = None
+        if portfolio_audit is not None:
+            portfolio_results_panel(portfolio_audit)
+
 # --- Footer ---
 st.markdown("""
 <div style="text-align: center; margin-top: 50px; padding: 20px; border-top: 1px solid #3c4078;">
@@ -600,3 +1203,5 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+rerun_timer.finish()
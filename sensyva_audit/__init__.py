@@ -0,0 +1,85 @@
+"""Importable core of the Sensyva AI Data Gap Audit (the Streamlit UI lives in ``gab.py``).
+
+Public names are resolved lazily from their submodules on first access, so
+``import sensyva_audit`` (and ``python -m sensyva_audit``) stays cheap and
+never pulls in NumPy, pandas or Streamlit until a feature actually needs them.
+"""
+import importlib
+
+_EXPORTS = {
+    "LeadIndex": "sensyva_audit.accounts",
+    "LeadIndexLoader": "sensyva_audit.accounts",
+    "normalize_company": "sensyva_audit.accounts",
+    "normalize_email": "sensyva_audit.accounts",
+    "ResultCache": "sensyva_audit.cache",
+    "quantize": "sensyva_audit.cache",
+    "CoefficientStore": "sensyva_audit.coefficients",
+    "CoefficientTable": "sensyva_audit.coefficients",
+    "load_coefficients": "sensyva_audit.coefficients",
+    "AnalysisWindows": "sensyva_audit.datagap",
+    "DataGapProfile": "sensyva_audit.datagap",
+    "profile_sensor_dump": "sensyva_audit.datagap",
+    "DATA_GAP_PERCENTAGE": "sensyva_audit.engine",
+    "DOWNTIME_REDUCTION_PERCENTAGE": "sensyva_audit.engine",
+    "INPUT_COLUMNS": "sensyva_audit.engine",
+    "MAINTENANCE_REDUCTION_PERCENTAGE": "sensyva_audit.engine",
+    "OUTPUT_COLUMNS": "sensyva_audit.engine",
+    "calculate_impact": "sensyva_audit.engine",
+    "calculate_impact_batch": "sensyva_audit.engine",
+    "calculate_impact_frame": "sensyva_audit.engine",
+    "ResultWriter": "sensyva_audit.export",
+    "export_table": "sensyva_audit.export",
+    "open_result_writer": "sensyva_audit.export",
+    "downtime_chart_frame": "sensyva_audit.formatting",
+    "format_crores": "sensyva_audit.formatting",
+    "format_lakhs": "sensyva_audit.formatting",
+    "format_payback": "sensyva_audit.formatting",
+    "projection_chart_frame": "sensyva_audit.formatting",
+    "internal_rate_of_return": "sensyva_audit.goalseek",
+    "required_savings_for_npv": "sensyva_audit.goalseek",
+    "solve_register": "sensyva_audit.goalseek",
+    "solve_required_input": "sensyva_audit.goalseek",
+    "INDUSTRY_CONTEXT": "sensyva_audit.industry",
+    "get_industry_context": "sensyva_audit.industry",
+    "IncidentSummary": "sensyva_audit.incidents",
+    "ingest_incident_log": "sensyva_audit.incidents",
+    "Lead": "sensyva_audit.leads",
+    "LeadWriter": "sensyva_audit.leads",
+    "REPORT_STAGES": "sensyva_audit.pipeline",
+    "StageTimer": "sensyva_audit.pipeline",
+    "Metrics": "sensyva_audit.metrics",
+    "PortfolioAudit": "sensyva_audit.portfolio",
+    "run_portfolio_audit": "sensyva_audit.portfolio",
+    "project_cash_flows": "sensyva_audit.projection",
+    "project_site": "sensyva_audit.projection",
+    "render_intro": "sensyva_audit.rendering",
+    "render_narrative": "sensyva_audit.rendering",
+    "PDFReportCache": "sensyva_audit.reports",
+    "ReportRenderer": "sensyva_audit.reports",
+    "render_report_pdf": "sensyva_audit.reports",
+    "EdgeScorer": "sensyva_audit.scoring",
+    "interpolate_grid": "sensyva_audit.sensitivity",
+    "savings_grid": "sensyva_audit.sensitivity",
+    "tornado": "sensyva_audit.sensitivity",
+    "Distribution": "sensyva_audit.simulation",
+    "simulate_impact": "sensyva_audit.simulation",
+    "CacheWarmup": "sensyva_audit.warmup",
+    "common_scenarios": "sensyva_audit.warmup",
+    "DependencyGraph": "sensyva_audit.workspace",
+    "ScenarioWorkspace": "sensyva_audit.workspace",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,5 @@
+import sys
+
+from sensyva_audit.cli import main
+
+sys.exit(main())
@@ -0,0 +1,496 @@
+"""Lead deduplication and account roll-up over the ``lead_form`` submissions.
+
+The same plant manager typically submits the lead form several times while
+trying scenarios, and colleagues from one company arrive under different
+spellings of its name ("Kavera Steel Pvt Ltd, Plant Head" / "KAVERA STEEL").
+``LeadIndex`` assigns every lead to a contact and an account as it arrives:
+
+1. **Contact** – the normalized email (``normalize_email``: lower-cased,
+   ``+tag`` dropped, Gmail dots removed). A known email is a repeat
+   submission and stays with the account it was first matched to.
+2. **Account by domain** – a corporate email domain (``account_domain``;
+   free-mail providers never identify an account) already seen on an account.
+3. **Account by name** – the company name with titles, punctuation and legal
+   suffixes stripped (``normalize_company``) matched exactly, and failing
+   that approximately: a MinHash signature over character trigrams is split
+   into LSH bands, and accounts sharing a band are confirmed by the exact
+   trigram Jaccard similarity (at least ``FUZZY_THRESHOLD``).
+4. Otherwise a new account.
+
+Every step is a handful of dict lookups plus one small NumPy signature, so
+an insert costs tens of microseconds whether the index holds a hundred
+leads or a million (see ``benchmarks/bench_accounts.py``). Candidates from
+the LSH buckets are ranked by their MinHash estimate in one vectorized
+comparison against the stored signatures, and only the best
+``MAX_VERIFIED`` are compared exactly. Buckets keep at most
+``MAX_BUCKET_NAMES`` spellings and each account indexes at most
+``MAX_NAME_VARIANTS``, which bounds the work a generic name can cause.
+
+Accounts keep their aggregates up to date on every insert: contacts,
+submissions, first/last seen, the latest scenario, and the total modeled
+savings, which sums each contact's *latest* scenario so five tries by one
+person count once. Matching is greedy in arrival order and accounts are
+never merged afterwards.
+
+The index lives in memory, one per process. ``LeadIndex.from_sqlite``
+rebuilds it by replaying the ``data_gap_leads`` table in insertion order;
+the table itself is unchanged and remains the log of every submission.
+The replay costs about 70 µs per lead (seconds for a large store), so a
+server builds it with ``LeadIndexLoader`` on a daemon thread: leads added
+before the rebuild finishes are queued and filed once it does, and only the
+rows already stored when the loader started are replayed, so no lead is
+counted twice.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from sensyva_audit.leads import LEAD_COLUMNS, Lead
+
+LOGGER = logging.getLogger(__name__)
+
+# Mail providers whose domain says nothing about the sender's company.
+FREE_EMAIL_DOMAINS = frozenset(
+    {
+        "gmail.com", "googlemail.com", "yahoo.com", "yahoo.co.in", "ymail.com", "outlook.com", "hotmail.com",
+        "live.com", "msn.com", "rediffmail.com", "icloud.com", "me.com", "aol.com", "protonmail.com", "proton.me",
+        "zoho.com", "gmx.com", "mail.com",
+    }
+)
+# Second-level labels under a country code that are not themselves registrable (tata.co.in -> tata.co.in).
+PUBLIC_SECOND_LEVELS = frozenset({"co", "com", "net", "org", "gov", "ac", "edu", "ltd", "plc", "nic", "res"})
+# Company-name tokens that do not distinguish one company from another.
+LEGAL_SUFFIXES = frozenset(
+    {"the", "ltd", "limited", "pvt", "private", "inc", "incorporated", "llp", "llc", "corp", "corporation", "co", "company", "plc", "gmbh"}
+)
+
+SHINGLE_SIZE = 3
+LSH_BANDS = 9
+LSH_ROWS = 4
+FUZZY_THRESHOLD = 0.6
+MAX_BUCKET_NAMES = 16
+MAX_VERIFIED = 4
+# How far below the threshold a MinHash estimate may fall and still be checked exactly.
+ESTIMATE_SLACK = 0.15
+MAX_NAME_VARIANTS = 8
+ACCOUNT_COLUMNS = (
+    "account_id", "company", "domain", "contacts", "submissions", "total_savings_crores", "latest_email",
+    "latest_industry", "latest_budget_crores", "latest_downtime_hours", "latest_loss_per_hour_lakhs",
+    "latest_total_savings_crores", "first_seen", "last_seen",
+)
+PROGRESS_EVERY = 10_000
+THREAD_NAME = "sensyva-lead-index"
+_MERSENNE_PRIME = (1 << 31) - 1
+_SEED = 20261018
+
+# Everything from the first separator on is a job title ("Kavera Steel, Plant Head").
+_TITLE = re.compile(r"\s*(?:[,|/(]|\s[-–—]\s).*$")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def _open_store(path):
+    """Read-only connection to a lead store with a data_gap_leads table, or None when there is none yet."""
+    if not Path(path).is_file():
+        return None
+    connection = sqlite3.connect(f"file:{Path(path).resolve()}?mode=ro", uri=True)
+    exists = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'data_gap_leads'").fetchone()
+    if not exists:
+        connection.close()
+        return None
+    return connection
+
+
+def last_lead_id(path) -> int:
+    """Highest data_gap_leads id in a lead store (0 when it is missing or empty)."""
+    connection = _open_store(path)
+    if connection is None:
+        return 0
+    try:
+        return connection.execute("SELECT COALESCE(MAX(id), 0) FROM data_gap_leads").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def normalize_email(email: str) -> str:
+    """Lower-cased address with any ``+tag`` dropped (and, for Gmail, the dots in the local part)."""
+    local, _, domain = (email or "").strip().lower().rpartition("@")
+    if not local:
+        return domain
+    local = local.split("+", 1)[0]
+    if domain in ("gmail.com", "googlemail.com"):
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}"
+
+
+def account_domain(email: str):
+    """Registrable domain of a corporate address (``ops.tata.co.in`` -> ``tata.co.in``), or None for free mail."""
+    domain = normalize_email(email).rpartition("@")[2].strip(".")
+    labels = domain.split(".")
+    if len(labels) < 2 or not all(labels):
+        return None
+    keep = 3 if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in PUBLIC_SECOND_LEVELS else 2
+    domain = ".".join(labels[-keep:])
+    return None if domain in FREE_EMAIL_DOMAINS else domain
+
+
+def normalize_company(company: str) -> str:
+    """Company name without title, punctuation, case or legal suffixes ("Kavera Steel Pvt. Ltd., CTO" -> "kavera steel")."""
+    name = _TITLE.sub("", (company or "").strip()).lower().replace("&", " and ")
+    tokens = [token for token in _NON_ALNUM.split(name) if token and token not in LEGAL_SUFFIXES]
+    return " ".join(tokens)
+
+
+def shingles(name: str) -> frozenset:
+    """Character trigrams of a normalized name, padded so short names and word edges still count."""
+    padded = f" {name} "
+    return frozenset(padded[i:i + SHINGLE_SIZE] for i in range(max(len(padded) - SHINGLE_SIZE + 1, 1)))
+
+
+def jaccard(left: frozenset, right: frozenset) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not left or not right:
+        return 0.0
+    common = len(left & right)
+    return common / (len(left) + len(right) - common)
+
+
+class MinHasher:
+    """MinHash signatures split into LSH band keys, computed with one vectorized universal hash per name."""
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS, seed: int = _SEED):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        permutations = bands * rows
+        self.bands, self.rows = bands, rows
+        # h(x) = (a·x + b) mod p with a, b < p < 2**31 and x < 2**32, so a·x + b fits in uint64.
+        self._a = rng.integers(1, _MERSENNE_PRIME, permutations, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, _MERSENNE_PRIME, permutations, dtype=np.uint64)[:, None]
+        # Random odd multipliers fold each band's rows into one 64-bit key (wrapping is intended).
+        self._fold = (rng.integers(0, 1 << 63, (bands, rows), dtype=np.uint64) | np.uint64(1))
+        self._np = np
+
+    def signature(self, grams):
+        """MinHash signature of a shingle set: bands × rows uint32 minima."""
+        np = self._np
+        hashed = np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+        return ((self._a * hashed + self._b) % np.uint64(_MERSENNE_PRIME)).min(axis=1).astype(np.uint32)
+
+    def band_keys(self, signature) -> list:
+        """One integer key per band; names sharing any key are LSH candidates."""
+        return (signature.reshape(self.bands, self.rows) * self._fold).sum(axis=1).tolist()
+
+
+@dataclass(frozen=True)
+class LeadMatch:
+    """Where LeadIndex.add filed a lead."""
+
+    account_id: int
+    # True when the normalized email had been seen before (a repeat submission).
+    duplicate: bool
+    # "email", "domain", "name" or "fuzzy"; None for a new account.
+    matched_by: str = None
+    # Trigram Jaccard similarity of a fuzzy match (1.0 for the other kinds of match).
+    similarity: float = 1.0
+
+
+class Account:
+    """Running aggregates of one account, updated on every lead filed to it."""
+
+    __slots__ = (
+        "account_id", "company", "domain", "names", "contacts", "submissions",
+        "total_savings_crores", "latest", "first_seen", "last_seen",
+    )
+
+    def __init__(self, account_id: int, lead: Lead, name: str, domain):
+        self.account_id = account_id
+        self.company = lead.company
+        self.domain = domain
+        self.names = [name] if name else []
+        self.contacts = 0
+        self.submissions = 0
+        self.total_savings_crores = 0.0
+        self.latest = lead
+        self.first_seen = self.last_seen = lead.submitted_at
+
+
+class _Contact:
+    __slots__ = ("account", "submitted_at", "total_savings_crores")
+
+    def __init__(self, account: Account):
+        self.account = account
+        self.submitted_at = None
+        self.total_savings_crores = 0.0
+
+
+class LeadIndex:
+    """Thread-safe in-memory index of leads by contact, domain and company name, with account aggregates."""
+
+    def __init__(self, threshold: float = FUZZY_THRESHOLD, bands: int = LSH_BANDS, rows: int = LSH_ROWS):
+        """
+        Args:
+            threshold (float): Minimum trigram Jaccard similarity for a fuzzy company-name match.
+            bands (int): LSH bands; more bands find more near-duplicates at the cost of memory.
+            rows (int): MinHash values per band; more rows make each band stricter.
+        """
+        import numpy as np
+
+        self.threshold = threshold
+        self.accounts = []
+        self.leads = 0
+        self._hasher = MinHasher(bands, rows)
+        self._contacts = {}
+        self._domains = {}
+        self._names = {}
+        self._buckets = {}
+        # Indexed spellings by slot: the name, its account and (row of _signatures) its MinHash signature.
+        self._slot_names = []
+        self._slot_accounts = []
+        self._signatures = np.zeros((1024, bands * rows), dtype=np.uint32)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_sqlite(cls, path, on_progress=None, through_id: int = None, **kwargs) -> "LeadIndex":
+        """
+        Rebuilds an index by replaying a lead store's data_gap_leads table in insertion order.
+
+        Args:
+            path (str | Path): SQLite lead store written by LeadWriter; a missing file gives an empty index.
+            on_progress (callable): Optional callback taking (fraction of the table replayed, leads replayed).
+            through_id (int): Replay only rows up to this id (see last_lead_id); None replays every row.
+            **kwargs: Passed to LeadIndex.
+        """
+        index = cls(**kwargs)
+        connection = _open_store(path)
+        if connection is None:
+            return index
+        bound = "" if through_id is None else f" WHERE id <= {int(through_id)}"
+        try:
+            total = connection.execute(f"SELECT COUNT(*) FROM data_gap_leads{bound}").fetchone()[0]
+            for row in connection.execute(f"SELECT {', '.join(LEAD_COLUMNS)} FROM data_gap_leads{bound} ORDER BY id"):
+                index.add(Lead(*row))
+                if on_progress is not None and index.leads % PROGRESS_EVERY == 0:
+                    on_progress(index.leads / total, index.leads)
+        finally:
+            connection.close()
+        if on_progress is not None:
+            on_progress(1.0, index.leads)
+        return index
+
+    def __len__(self) -> int:
+        return self.leads
+
+    def add(self, lead: Lead) -> LeadMatch:
+        """Files one lead under its contact and account and updates the account's aggregates."""
+        email = normalize_email(lead.email)
+        with self._lock:
+            contact = self._contacts.get(email)
+            if contact is not None:
+                match = LeadMatch(contact.account.account_id, True, "email")
+            else:
+                match, account = self._match_account(lead, email)
+                contact = self._contacts[email] = _Contact(account)
+                account.contacts += 1
+            self._record(contact, lead)
+            self.leads += 1
+            return match
+
+    def _match_account(self, lead: Lead, email: str):
+        domain = account_domain(email)
+        name = normalize_company(lead.company)
+        account, matched_by, similarity, signature = None, None, 1.0, None
+        if domain is not None and domain in self._domains:
+            account, matched_by = self._domains[domain], "domain"
+        elif name in self._names:
+            account, matched_by = self._names[name], "name"
+        elif name:
+            grams = shingles(name)
+            signature = self._hasher.signature(grams)
+            account, similarity = self._fuzzy_match(grams, signature)
+            matched_by = "fuzzy" if account is not None else None
+
+        if account is None:
+            account = Account(len(self.accounts), lead, name, domain)
+            self.accounts.append(account)
+            similarity = 1.0
+            if name:
+                self._index_name(account, name, signature)
+        elif name and name not in self._names and len(account.names) < MAX_NAME_VARIANTS:
+            # Learn the new spelling so the next lead using it matches exactly.
+            account.names.append(name)
+            self._index_name(account, name, signature)
+        if domain is not None:
+            self._domains.setdefault(domain, account)
+            account.domain = account.domain or domain
+        return LeadMatch(account.account_id, False, matched_by, similarity), account
+
+    def _fuzzy_match(self, grams: frozenset, signature):
+        import numpy as np
+
+        candidates = []
+        for key in self._hasher.band_keys(signature):
+            bucket = self._buckets.get(key)
+            if isinstance(bucket, list):
+                candidates.extend(bucket)
+            elif bucket is not None:
+                candidates.append(bucket)
+        if not candidates:
+            return None, 0.0
+        # The share of equal MinHash values estimates each candidate's Jaccard similarity in one vectorized
+        # step; only the few estimated near the threshold have their trigram sets compared exactly.
+        candidates = np.unique(candidates)
+        estimates = (self._signatures[candidates] == signature).mean(axis=1)
+        order = np.argsort(-estimates)[:MAX_VERIFIED]
+        best, best_similarity = None, self.threshold
+        for slot in candidates[order[estimates[order] >= self.threshold - ESTIMATE_SLACK]].tolist():
+            similarity = jaccard(grams, shingles(self._slot_names[slot]))
+            if similarity >= best_similarity:
+                best, best_similarity = self._slot_accounts[slot], similarity
+        return best, best_similarity
+
+    def _index_name(self, account: Account, name: str, signature=None):
+        if signature is None:
+            signature = self._hasher.signature(shingles(name))
+        slot = len(self._slot_names)
+        if slot == len(self._signatures):
+            import numpy as np
+
+            grown = np.zeros((2 * slot, self._signatures.shape[1]), dtype=self._signatures.dtype)
+            grown[:slot] = self._signatures
+            self._signatures = grown
+        self._signatures[slot] = signature
+        self._slot_names.append(name)
+        self._slot_accounts.append(account)
+        self._names[name] = account
+
+        buckets = self._buckets
+        for key in self._hasher.band_keys(signature):
+            bucket = buckets.get(key)
+            # Most buckets hold one name; store its slot bare rather than in a list to save memory.
+            if bucket is None:
+                buckets[key] = slot
+            elif isinstance(bucket, list):
+                if len(bucket) < MAX_BUCKET_NAMES:
+                    bucket.append(slot)
+            else:
+                buckets[key] = [bucket, slot]
+
+    def _record(self, contact: _Contact, lead: Lead):
+        account = contact.account
+        account.submissions += 1
+        submitted_at = lead.submitted_at
+        total = lead.total_savings_crores
+        if total is not None and (contact.submitted_at is None or submitted_at >= contact.submitted_at):
+            account.total_savings_crores += total - contact.total_savings_crores
+            contact.total_savings_crores = total
+            contact.submitted_at = submitted_at
+        if submitted_at >= account.last_seen:
+            account.last_seen = submitted_at
+            account.latest = lead
+        account.first_seen = min(account.first_seen, submitted_at)
+
+    def account(self, account_id: int) -> Account:
+        """The account with this id."""
+        return self.accounts[account_id]
+
+    def accounts_frame(self):
+        """One row per account: its aggregates and the inputs and savings of its latest scenario."""
+        import pandas as pd
+
+        with self._lock:
+            rows = [
+                {
+                    "account_id": account.account_id,
+                    "company": account.company,
+                    "domain": account.domain,
+                    "contacts": account.contacts,
+                    "submissions": account.submissions,
+                    "total_savings_crores": account.total_savings_crores,
+                    "latest_email": account.latest.email,
+                    "latest_industry": account.latest.industry,
+                    "latest_budget_crores": account.latest.budget_crores,
+                    "latest_downtime_hours": account.latest.downtime_hours,
+                    "latest_loss_per_hour_lakhs": account.latest.loss_per_hour_lakhs,
+                    "latest_total_savings_crores": account.latest.total_savings_crores,
+                    "first_seen": account.first_seen,
+                    "last_seen": account.last_seen,
+                }
+                for account in self.accounts
+            ]
+        frame = pd.DataFrame(rows, columns=ACCOUNT_COLUMNS)
+        for column in ("first_seen", "last_seen"):
+            frame[column] = pd.to_datetime(frame[column], unit="s", utc=True)
+        return frame
+
+
+class LeadIndexLoader:
+    """Rebuilds a LeadIndex from the lead store on a daemon thread, queueing the leads added meanwhile."""
+
+    def __init__(self, path, **index_options):
+        """
+        Args:
+            path (str | Path): SQLite lead store written by LeadWriter.
+            **index_options: Passed to LeadIndex.
+        """
+        self.path = path
+        self.index_options = index_options
+        self.index = None
+        self.seconds = None
+        self.error = None
+        self.done = threading.Event()
+        # Rows stored after this id are leads this process added, which reach the index through add() instead.
+        self.through_id = last_lead_id(path)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=THREAD_NAME, daemon=True)
+
+    def start(self) -> "LeadIndexLoader":
+        """Starts the rebuild and returns immediately."""
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float = None) -> bool:
+        """Blocks until the index is ready (or `timeout` passed); returns whether it is."""
+        return self.done.wait(timeout)
+
+    @property
+    def pending(self) -> int:
+        """Leads queued for the index until the rebuild finishes."""
+        return len(self._pending)
+
+    def add(self, lead: Lead):
+        """
+        Files one lead in the index, or queues it while the rebuild is still running.
+
+        Returns:
+            LeadMatch | None: Where the lead was filed; None when it was queued, so it is not yet known
+            whether the lead is a repeat submission.
+        """
+        with self._lock:
+            if self.index is None:
+                self._pending.append(lead)
+                return None
+        return self.index.add(lead)
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            index = LeadIndex.from_sqlite(self.path, through_id=self.through_id, **self.index_options)
+        except Exception as exc:
+            # Dedup still works for the leads that arrive from now on.
+            self.error = str(exc)
+            LOGGER.exception("Could not rebuild the lead index from %s; starting empty", self.path)
+            index = LeadIndex(**self.index_options)
+        with self._lock:
+            for lead in self._pending:
+                index.add(lead)
+            self._pending.clear()
+            self.index = index
+        self.seconds = time.perf_counter() - started
+        self.done.set()
+        LOGGER.info("Lead index ready: %d leads in %d accounts after %.2f s", len(index), len(index.accounts), self.seconds)
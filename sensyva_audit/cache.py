@@ -0,0 +1,286 @@
+"""Bounded, observable result cache with an optional disk tier shared between processes.
+
+``ResultCache`` keeps at most ``maxsize`` entries in memory, least recently
+used first out, and drops entries older than ``ttl_seconds``; memory use is
+therefore flat no matter how long the app runs or how many distinct
+scenarios it sees. Numeric inputs are quantized before they become keys
+(``QUANTIZATIONS``), so floating-point noise from arithmetic or unit
+conversion (0.1 + 0.2 against 0.3, say) does not split one scenario across
+entries, and the value is computed from the quantized inputs so every caller
+of a key sees the same result. The default ``decimals`` quantization keeps
+DEFAULT_PRECISION (2) decimal places, the resolution the audit form accepts
+its Crores, hours and Lakhs in, so 50.0, 50.00001 and 50.004 share an entry.
+Pass a higher precision (6, say) where inputs are meaningful beyond the
+form's resolution.
+
+With ``disk_path`` set, misses fall through to a SQLite file (WAL journal)
+that every app process on the host can open: a worker that starts cold
+reads what its siblings already computed. Disk values must be
+JSON-serializable; the tier is capped at ``disk_max_entries`` rows and
+honours the same TTL.
+
+Every tier counts hits, misses, evictions and expirations in ``stats``.
+"""
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# The audit form's input resolution: budget and loss per hour are entered to 2 decimals, hours to 0.
+DEFAULT_PRECISION = 2
+DEFAULT_DISK_MAX_ENTRIES = 100_000
+# Expired disk rows are deleted, and the rest trimmed to disk_max_entries, once per this many writes.
+DISK_PRUNE_INTERVAL = 256
+
+QUANTIZATIONS = ("exact", "decimals", "significant")
+
+_MISSING = object()
+
+
+def quantize(values, mode: str = "decimals", precision: int = DEFAULT_PRECISION) -> tuple:
+    """
+    Normalizes numeric inputs into a cache key.
+
+    Args:
+        values (iterable): Numbers to quantize.
+        mode (str): "exact" keeps the floats as given, "decimals" rounds to `precision` decimal
+            places, "significant" rounds to `precision` significant figures.
+        precision (int): Decimal places or significant figures.
+
+    Returns:
+        tuple: Quantized floats, usable as both the cache key and the function arguments.
+    """
+    if mode == "exact":
+        return tuple([float(value) for value in values])
+    if mode == "decimals":
+        return tuple([round(float(value), precision) for value in values])
+    if mode == "significant":
+        values = [float(value) for value in values]
+        return tuple(
+            [
+                round(value, precision - 1 - math.floor(math.log10(abs(value))))
+                if value and math.isfinite(value)
+                else value
+                for value in values
+            ]
+        )
+    raise ValueError(f"Unknown quantization {mode!r}; expected one of {', '.join(QUANTIZATIONS)}.")
+
+
+class DiskTier:
+    """SQLite-backed key/value store shared by every process that opens the same file."""
+
+    def __init__(self, path, max_entries: int = DEFAULT_DISK_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA busy_timeout=1000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)")
+
+    def _oldest(self, now: float) -> float:
+        return now - self.ttl_seconds if self.ttl_seconds is not None else -math.inf
+
+    def get(self, key: str, now: float):
+        """Decoded, unexpired value stored under `key`, or _MISSING."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM results WHERE key = ? AND stored_at > ?", (key, self._oldest(now))
+            ).fetchone()
+        return _MISSING if row is None else json.loads(row[0])
+
+    def put(self, key: str, value, now: float) -> int:
+        """Stores `value` and returns how many rows pruning removed (usually 0)."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, stored_at) VALUES (?, ?, ?)", (key, json.dumps(value), now)
+            )
+            self._writes += 1
+            if self._writes % DISK_PRUNE_INTERVAL:
+                return 0
+            return self._prune(now)
+
+    def _prune(self, now: float) -> int:
+        expired = self._connection.execute("DELETE FROM results WHERE stored_at <= ?", (self._oldest(now),)).rowcount
+        over_cap = self._connection.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        return expired + over_cap
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ResultCache:
+    """Thread-safe LRU + TTL cache of computed results with quantized keys and an optional disk tier."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        quantization: str = "decimals",
+        precision: int = DEFAULT_PRECISION,
+        disk_path=None,
+        disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES,
+        namespace: str = "default",
+        clock=time.time,
+    ):
+        """
+        Args:
+            maxsize (int): Entries kept in memory; the least recently used entry is evicted beyond this.
+            ttl_seconds (float | None): Entry lifetime in both tiers; None keeps entries until evicted.
+            quantization (str): How get_or_compute() keys numeric inputs; one of QUANTIZATIONS.
+            precision (int): Decimal places or significant figures used by the quantization.
+            disk_path (str | Path | None): SQLite file for the shared disk tier; None keeps the cache in memory only.
+            disk_max_entries (int): Rows kept in the disk tier.
+            namespace (str): Prefix for disk keys, so several caches (or result versions) can share one file.
+            clock (callable): Current time in epoch seconds; defaults to time.time.
+        """
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization {quantization!r}; expected one of {', '.join(QUANTIZATIONS)}.")
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.quantization = quantization
+        self.precision = precision
+        self.namespace = namespace
+        self.clock = clock
+        self.disk = DiskTier(disk_path, disk_max_entries, ttl_seconds) if disk_path else None
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "disk_hits": 0,
+            "disk_misses": 0,
+            "disk_writes": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+        }
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + (ttl_seconds or math.inf)
+
+    def key(self, *inputs) -> tuple:
+        """Quantized cache key for numeric `inputs`."""
+        return quantize(inputs, self.quantization, self.precision)
+
+    def get(self, key, default=None):
+        """Value cached under `key` in memory or on disk, or `default`. Disk hits are promoted to memory."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl_seconds is None or now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                del self._entries[key]
+                self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+
+        if self.disk is None:
+            return default
+        try:
+            value = self.disk.get(self._disk_key(key), now)
+        except sqlite3.Error as exc:
+            self._count("disk_errors")
+            LOGGER.warning("Result cache disk read failed: %s", exc)
+            return default
+        if value is _MISSING:
+            self._count("disk_misses")
+            return default
+        self._count("disk_hits")
+        self._remember(key, value, now)
+        return value
+
+    def put(self, key, value):
+        """Caches `value` under `key` in memory and, if configured, on disk."""
+        now = self.clock()
+        self._remember(key, value, now)
+        if self.disk is None:
+            return
+        try:
+            pruned = self.disk.put(self._disk_key(key), value, now)
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            self._count("disk_errors")
+            LOGGER.warning("Result cache disk write failed: %s", exc)
+            return
+        self._count("disk_writes")
+        self._count("disk_evictions", pruned)
+
+    def get_or_compute(self, compute, *inputs):
+        """
+        Cached `compute(*key)` for the quantized `inputs`.
+
+        The function is called with the quantized values, so every input that maps to a key
+        produces the same result.
+        """
+        key = self.key(*inputs)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(*key)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drops every in-memory entry (the disk tier is shared and left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Counters plus current sizes."""
+        with self._lock:
+            stats = dict(self.stats, size=len(self._entries), maxsize=self.maxsize)
+        if self.disk is not None:
+            stats["disk_size"] = len(self.disk)
+        return stats
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _disk_key(self, key) -> str:
+        return f"{self.namespace}:{key!r}"
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _remember(self, key, value, now: float):
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def _sweep(self, now: float):
+        # Hits reorder entries by use, not age, so expired entries can sit anywhere; sweep them all once per TTL.
+        expired = [key for key, (stored_at, _) in self._entries.items() if now - stored_at >= self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        self.stats["expirations"] += len(expired)
+        self._next_sweep = now + self.ttl_seconds
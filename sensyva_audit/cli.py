@@ -0,0 +1,332 @@
+"""Command-line entry point: ``python -m sensyva_audit``.
+
+    python -m sensyva_audit score sites.csv -o scored.csv   # chunked portfolio audit of a site register
+    python -m sensyva_audit export scored.csv -o scored.xlsx  # stream results to Parquet/Arrow/XLSX/CSV
+    python -m sensyva_audit solve targets.csv --solve-for unplanned_downtime_hours -o solved.csv  # inputs needed per site
+    python -m sensyva_audit accounts sensyva_leads.sqlite3 -o accounts.xlsx  # leads deduplicated into accounts
+    python -m sensyva_audit impact 50 800 2 --industry Energy  # one site: budget (Cr), downtime (hrs), loss (Lakhs/hr)
+    python -m sensyva_audit incidents events.parquet -o sites.csv  # audit inputs from a CMMS downtime log
+    python -m sensyva_audit profile dumps/ --review-minutes 10 --every-hours 8 -o gap.json  # measured data gap
+
+Only argparse is imported up front; NumPy/pandas load inside the command
+that needs them, so ``--help`` and argument errors return immediately.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _score(args) -> int:
+    from sensyva_audit.coefficients import load_coefficients
+    from sensyva_audit.formatting import format_crores
+    from sensyva_audit.portfolio import run_portfolio_audit
+
+    source = Path(args.register)
+    if not source.is_file():
+        raise FileNotFoundError(f"No such site register: {source}")
+    output = Path(args.output) if args.output else source.with_name(f"{source.stem}-scored.csv")
+
+    def report_progress(fraction, sites_scored):
+        if not args.quiet:
+            print(f"\r{fraction:6.1%}  {sites_scored:,} sites scored", end="", file=sys.stderr, flush=True)
+
+    coefficients = load_coefficients(args.coefficients) if args.coefficients else None
+    audit = run_portfolio_audit(
+        source, chunk_rows=args.chunk_rows, on_progress=report_progress, results_path=output, coefficients=coefficients
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "sites_scored": audit.sites_scored,
+                    "sites_skipped": audit.sites_skipped,
+                    "unknown_industry_sites": audit.unknown_industry_sites,
+                    "totals": audit.totals,
+                    "industry_totals": audit.industry_totals,
+                    "coefficients_version": audit.coefficients_version,
+                    "results_path": str(audit.results_path),
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(f"Sites scored:            {audit.sites_scored:,} ({audit.sites_skipped:,} skipped)")
+        print(f"Maintenance savings:     {format_crores(audit.totals['potential_maintenance_savings_crores'])}")
+        print(f"Downtime savings:        {format_crores(audit.totals['potential_downtime_savings_crores'])}")
+        print(f"Total potential savings: {format_crores(audit.totals['total_potential_annual_savings_crores'])}")
+        print(f"Coefficients:            {audit.coefficients_version}")
+        print(f"Per-site results:        {audit.results_path}")
+    return 0
+
+
+def _export(args) -> int:
+    from sensyva_audit.export import export_table
+
+    source = Path(args.results)
+    if not source.is_file():
+        raise FileNotFoundError(f"No such results file: {source}")
+
+    def report_progress(fraction, rows_written):
+        if not args.quiet:
+            print(f"\r{fraction:6.1%}  {rows_written:,} rows written", end="", file=sys.stderr, flush=True)
+
+    rows = export_table(source, args.output, fmt=args.format, chunk_rows=args.chunk_rows, on_progress=report_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Rows exported:  {rows:,}")
+    print(f"Output:         {args.output}")
+    return 0
+
+
+def _solve(args) -> int:
+    from sensyva_audit.coefficients import load_coefficients
+    from sensyva_audit.goalseek import solve_register
+    from sensyva_audit.portfolio import default_coefficients
+
+    source = Path(args.register)
+    if not source.is_file():
+        raise FileNotFoundError(f"No such register: {source}")
+    output = Path(args.output) if args.output else source.with_name(f"{source.stem}-solved.csv")
+
+    def report_progress(fraction, sites_solved):
+        if not args.quiet:
+            print(f"\r{fraction:6.1%}  {sites_solved:,} sites solved", end="", file=sys.stderr, flush=True)
+
+    coefficients = load_coefficients(args.coefficients) if args.coefficients else default_coefficients()
+    counts = solve_register(
+        source, output, args.solve_for, chunk_rows=args.chunk_rows, on_progress=report_progress, coefficients=coefficients
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+    for label, count in counts.items():
+        if count:
+            print(f"{label + ':':<42}{count:>12,}")
+    print(f"{'Coefficients:':<42}{coefficients.key}")
+    print(f"{'Per-site results:':<42}{output}")
+    return 0
+
+
+def _accounts(args) -> int:
+    from sensyva_audit.accounts import LeadIndex
+    from sensyva_audit.export import open_result_writer
+    from sensyva_audit.formatting import format_crores
+
+    source = Path(args.leads_db)
+    if not source.is_file():
+        raise FileNotFoundError(f"No such lead store: {source}")
+    output = Path(args.output) if args.output else source.with_name(f"{source.stem}-accounts.csv")
+
+    def report_progress(fraction, leads_read):
+        if not args.quiet:
+            print(f"\r{fraction:6.1%}  {leads_read:,} leads read", end="", file=sys.stderr, flush=True)
+
+    index = LeadIndex.from_sqlite(source, on_progress=report_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    accounts = index.accounts_frame()
+    with open_result_writer(output) as writer:
+        writer.write(accounts)
+    print(f"Leads read:               {len(index):,}")
+    print(f"Contacts / accounts:      {accounts['contacts'].sum():,} / {len(accounts):,}")
+    print(f"Modeled savings:          {format_crores(accounts['total_savings_crores'].sum())}")
+    print(f"Accounts:                 {output}")
+    return 0
+
+
+def _incidents(args) -> int:
+    from sensyva_audit.incidents import ingest_incident_log
+
+    source = Path(args.log)
+    if not source.is_file():
+        raise FileNotFoundError(f"No such incident log: {source}")
+    output = Path(args.output) if args.output else source.with_name(f"{source.stem}-sites.csv")
+
+    def report_progress(fraction, events_read):
+        if not args.quiet:
+            print(f"\r{fraction:6.1%}  {events_read:,} events read", end="", file=sys.stderr, flush=True)
+
+    summary = ingest_incident_log(
+        source,
+        chunk_rows=args.chunk_rows,
+        partitions=args.partitions,
+        window_days=args.window_days,
+        period_days=args.period_days,
+        spill_dir=args.spill_dir,
+        on_progress=report_progress,
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    summary.sites.to_csv(output, index=False)
+    if args.assets:
+        summary.assets.to_csv(args.assets, index=False)
+    print(f"Events read:       {summary.events_read:,} ({summary.events_skipped:,} skipped)")
+    print(f"Period covered:    {summary.period_days:,.1f} days")
+    print(f"Sites / assets:    {len(summary.sites):,} / {len(summary.assets):,}")
+    print(f"Per-site inputs:   {output}")
+    if args.assets:
+        print(f"Per-asset inputs:  {args.assets}")
+    return 0
+
+
+def _profile(args) -> int:
+    from sensyva_audit.datagap import AnalysisWindows, profile_sensor_dump
+
+    intervals = []
+    if args.reviewed:
+        import pandas as pd
+
+        reviewed = pd.read_csv(args.reviewed)
+        intervals = list(zip(reviewed["start"], reviewed["end"]))
+    windows = AnalysisWindows(
+        intervals=intervals,
+        every_seconds=args.every_hours * 3600 if args.review_minutes else None,
+        duration_seconds=args.review_minutes * 60,
+    )
+
+    def report_progress(fraction, samples_read):
+        if not args.quiet:
+            print(f"\r{fraction:6.1%}  {samples_read:,} samples profiled", end="", file=sys.stderr, flush=True)
+
+    profile = profile_sensor_dump(
+        args.dumps,
+        windows=windows,
+        sample_rate_hz=args.rate,
+        start=args.start,
+        gap_factor=args.gap_factor,
+        dropout_value=args.dropout_value,
+        block_samples=args.block_samples,
+        on_progress=report_progress,
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    if args.output:
+        Path(args.output).write_text(profile.to_json(), encoding="utf-8")
+    print(profile.table().to_string(float_format=lambda value: f"{value:,.4g}"))
+    print(f"\nFiles profiled:     {profile.files:,} ({profile.bytes_read / 2**30:,.2f} GB)")
+    print(f"Analysis windows:   {profile.windows}")
+    print(f"Measured data gap:  {profile.data_gap_percentage:.1f}% of expected samples never analyzed")
+    if args.output:
+        print(f"Profile JSON:       {args.output} (upload it in the app to use it in the report)")
+    return 0
+
+
+def _impact(args) -> int:
+    from sensyva_audit.coefficients import load_coefficients
+    from sensyva_audit.engine import calculate_impact
+    from sensyva_audit.industry import INDUSTRY_CONTEXT
+    from sensyva_audit.portfolio import canonical_industries, default_coefficients
+
+    if min(args.budget, args.downtime_hours, args.loss_per_hour) <= 0:
+        print("error: budget, downtime hours and hourly loss must all be greater than zero", file=sys.stderr)
+        return 2
+    table = load_coefficients(args.coefficients) if args.coefficients else default_coefficients()
+    industry = canonical_industries([args.industry.strip()], (*table.industries, *INDUSTRY_CONTEXT))[0]
+    coefficients = table.coefficients(industry, args.asset_class)
+    results = calculate_impact(args.budget, args.downtime_hours, args.loss_per_hour, **coefficients)
+    print(json.dumps({**results, "industry": industry, "coefficients_version": table.key}, indent=2))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m sensyva_audit", description="Sensyva AI Data Gap Audit tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="Score a CSV/Parquet register with one row per site.")
+    score.add_argument("register", help="Path to a .csv or .parquet site register.")
+    score.add_argument(
+        "-o", "--output", help="Per-site results file; .csv, .parquet, .arrow or .xlsx (default: <register>-scored.csv)."
+    )
+    score.add_argument("--chunk-rows", type=int, default=50_000, help="Rows processed per chunk (bounds memory).")
+    score.add_argument("--coefficients", help="Per-industry coefficients JSON (default: the packaged coefficients.json).")
+    score.add_argument("--json", action="store_true", help="Print portfolio totals as JSON.")
+    score.add_argument("-q", "--quiet", action="store_true", help="Suppress progress output.")
+    score.set_defaults(handler=_score)
+
+    export = commands.add_parser("export", help="Stream a CSV/Parquet results table into another format.")
+    export.add_argument("results", help="Path to a .csv or .parquet results table (e.g. from score).")
+    export.add_argument("-o", "--output", required=True, help="Output file; the format follows its suffix.")
+    export.add_argument("--format", choices=["csv", "parquet", "arrow", "xlsx"], help="Override the output format.")
+    export.add_argument("--chunk-rows", type=int, default=50_000, help="Rows held in memory at once.")
+    export.add_argument("-q", "--quiet", action="store_true", help="Suppress progress output.")
+    export.set_defaults(handler=_export)
+
+    solve = commands.add_parser("solve", help="Solve each site for the input needed to reach a target total savings.")
+    solve.add_argument(
+        "register", help="Path to a .csv or .parquet register with target_total_savings_crores and the two known inputs."
+    )
+    solve.add_argument(
+        "--solve-for",
+        choices=["annual_maintenance_budget_crores", "unplanned_downtime_hours", "revenue_loss_per_hour_lakhs"],
+        default="unplanned_downtime_hours",
+        help="The input to solve for (default: unplanned_downtime_hours).",
+    )
+    solve.add_argument(
+        "-o", "--output", help="Per-site results file; .csv, .parquet, .arrow or .xlsx (default: <register>-solved.csv)."
+    )
+    solve.add_argument("--chunk-rows", type=int, default=50_000, help="Rows processed per chunk (bounds memory).")
+    solve.add_argument("--coefficients", help="Per-industry coefficients JSON (default: the packaged coefficients.json).")
+    solve.add_argument("-q", "--quiet", action="store_true", help="Suppress progress output.")
+    solve.set_defaults(handler=_solve)
+
+    accounts = commands.add_parser("accounts", help="Deduplicate the captured leads and roll them up by account.")
+    accounts.add_argument("leads_db", help="SQLite lead store written by the app (data_gap_leads table).")
+    accounts.add_argument(
+        "-o", "--output", help="Account table; .csv, .parquet, .arrow or .xlsx (default: <leads_db>-accounts.csv)."
+    )
+    accounts.add_argument("-q", "--quiet", action="store_true", help="Suppress progress output.")
+    accounts.set_defaults(handler=_accounts)
+
+    incidents = commands.add_parser(
+        "incidents", help="Derive downtime hours and loss per hour from a downtime event log."
+    )
+    incidents.add_argument("log", help="Path to a .csv or .parquet log with start, end and cost_lakhs per event.")
+    incidents.add_argument("-o", "--output", help="Per-site inputs CSV (default: <log>-sites.csv).")
+    incidents.add_argument("--assets", help="Also write per-asset inputs to this CSV.")
+    incidents.add_argument(
+        "--period-days", type=float, help="Days the log covers (default: first start to last end)."
+    )
+    incidents.add_argument("--chunk-rows", type=int, default=500_000, help="Rows parsed per chunk (bounds memory).")
+    incidents.add_argument("--partitions", type=int, default=16, help="Line hash buckets per spill window.")
+    incidents.add_argument("--window-days", type=float, default=7.0, help="Time window of each spill file (days).")
+    incidents.add_argument("--spill-dir", help="Directory for temporary spill files (default: system temp).")
+    incidents.add_argument("-q", "--quiet", action="store_true", help="Suppress progress output.")
+    incidents.set_defaults(handler=_incidents)
+
+    profile = commands.add_parser("profile", help="Measure the unanalyzed fraction of recorded sensor dumps.")
+    profile.add_argument("dumps", nargs="+", help="Parquet, .npy or raw .f32/.f64/.i16/.i32 files, or directories of them.")
+    profile.add_argument("-o", "--output", help="Write the profile as JSON (the app accepts it as an upload).")
+    profile.add_argument("--review-minutes", type=float, default=0.0, help="Minutes of data analyzed per review.")
+    profile.add_argument("--every-hours", type=float, default=8.0, help="Hours between reviews.")
+    profile.add_argument("--reviewed", help="CSV of explicitly reviewed intervals with start and end columns.")
+    profile.add_argument("--rate", type=float, help="Sample rate (Hz) of raw arrays without timestamps.")
+    profile.add_argument("--start", help="Time of the first sample of raw arrays without timestamps.")
+    profile.add_argument("--gap-factor", type=float, default=2.0, help="Spacing, in sample periods, that counts as a gap.")
+    profile.add_argument("--dropout-value", type=float, help="Sentinel value marking a missing reading.")
+    profile.add_argument("--block-samples", type=int, default=1 << 22, help="Samples per block (bounds memory).")
+    profile.add_argument("-q", "--quiet", action="store_true", help="Suppress progress output.")
+    profile.set_defaults(handler=_profile)
+
+    impact = commands.add_parser("impact", help="Score a single site.")
+    impact.add_argument("budget", type=float, help="Annual maintenance & repair budget (Crores INR).")
+    impact.add_argument("downtime_hours", type=float, help="Annual unplanned downtime (hours).")
+    impact.add_argument("loss_per_hour", type=float, help="Revenue/production loss per downtime hour (Lakhs INR).")
+    impact.add_argument("--industry", default="Other", help="Industry whose coefficients apply (default: Other).")
+    impact.add_argument("--asset-class", help="Asset class whose coefficients apply, if the industry defines it.")
+    impact.add_argument("--coefficients", help="Per-industry coefficients JSON (default: the packaged coefficients.json).")
+    impact.set_defaults(handler=_impact)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
@@ -0,0 +1,239 @@
+"""Per-industry (and per-asset-class) reduction coefficients, loaded from a versioned data file.
+
+``coefficients.json`` next to this module holds the maintenance and
+downtime reductions the engine applies. A ``default`` entry sets both;
+each industry may override either, and each industry's ``asset_classes``
+may override them again for one class of equipment::
+
+    {
+      "schema": 1,
+      "version": "2026.10.1",
+      "default": {"maintenance_reduction": 0.65, "downtime_reduction": 0.70},
+      "industries": {
+        "Energy": {"downtime_reduction": 0.72, "asset_classes": {"Turbine": {"downtime_reduction": 0.78}}}
+      }
+    }
+
+``CoefficientTable`` compiles the file once into two dense arrays indexed
+by (industry, asset class), with every inherited value already filled in.
+Scoring a mixed-industry portfolio then costs one hashed lookup per
+distinct name (after ``pandas.factorize``) and one index gather per
+coefficient, rather than a dict lookup per row. Industries missing from
+the file fall back to ``FALLBACK_INDUSTRY``; unknown asset classes fall
+back to the industry's own values.
+
+``CoefficientStore`` hot-reloads the file: ``table`` re-reads it whenever
+its modification time or size changes (checked at most every
+``check_seconds``), and keeps serving the last good table if an edit does
+not parse. Each table's ``key`` changes with its contents, so callers can
+key caches on the coefficients they used and leave everything else alone.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from sensyva_audit.engine import DOWNTIME_REDUCTION_PERCENTAGE, MAINTENANCE_REDUCTION_PERCENTAGE
+
+LOGGER = logging.getLogger(__name__)
+
+COEFFICIENTS_FILE = Path(__file__).resolve().parent / "coefficients.json"
+SCHEMA_VERSION = 1
+COEFFICIENT_NAMES = ("maintenance_reduction", "downtime_reduction")
+FALLBACK_INDUSTRY = "Other"
+# Asset-class slot holding an industry's own values; used when a site has no (or an unknown) class.
+ANY_ASSET_CLASS = ""
+DEFAULT_CHECK_SECONDS = 2.0
+
+
+class CoefficientTable:
+    """Reduction coefficients compiled into (industry, asset class) arrays."""
+
+    def __init__(self, data: dict):
+        """
+        Args:
+            data (dict): Parsed coefficients file (see the module docstring).
+        """
+        import numpy as np
+
+        _mapping(data, "the top level")
+        if data.get("schema", SCHEMA_VERSION) != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported coefficients schema {data.get('schema')!r}; expected {SCHEMA_VERSION}.")
+        self.version = str(data.get("version", "unversioned"))
+        default = {
+            "maintenance_reduction": MAINTENANCE_REDUCTION_PERCENTAGE,
+            "downtime_reduction": DOWNTIME_REDUCTION_PERCENTAGE,
+            **_coefficients(_mapping(data.get("default", {}), "default"), "default"),
+        }
+        industries = dict(_mapping(data.get("industries", {}), "industries"))
+        industries.setdefault(FALLBACK_INDUSTRY, {})
+        # Checked up front, so a file of the wrong shape fails as a ValueError like any other invalid file.
+        for industry, entry in industries.items():
+            _mapping(entry, industry)
+            for asset_class, override in _mapping(entry.get("asset_classes", {}), f"{industry}.asset_classes").items():
+                _mapping(override, f"{industry}/{asset_class}")
+
+        self.industries = tuple(industries)
+        asset_classes = {ANY_ASSET_CLASS: None}
+        for entry in industries.values():
+            asset_classes.update(dict.fromkeys(entry.get("asset_classes", {})))
+        self.asset_classes = tuple(asset_classes)
+
+        values = {name: np.empty((len(self.industries), len(self.asset_classes))) for name in COEFFICIENT_NAMES}
+        for row, (industry, entry) in enumerate(industries.items()):
+            industry_values = {**default, **_coefficients(entry, industry)}
+            overrides = entry.get("asset_classes", {})
+            for column, asset_class in enumerate(self.asset_classes):
+                resolved = {**industry_values, **_coefficients(overrides.get(asset_class, {}), f"{industry}/{asset_class}")}
+                for name in COEFFICIENT_NAMES:
+                    values[name][row, column] = resolved[name]
+        self.maintenance_reduction = values["maintenance_reduction"]
+        self.downtime_reduction = values["downtime_reduction"]
+        self._fallback = self.industries.index(FALLBACK_INDUSTRY)
+
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        self.key = f"{self.version}-{hashlib.sha256(canonical).hexdigest()[:12]}"
+
+    def industry_codes(self, industries):
+        """
+        Row index of each industry name; names not in the table map to FALLBACK_INDUSTRY.
+
+        Returns:
+            tuple: (intp codes, bool mask of names found in the table)
+        """
+        codes = _codes(self.industries, industries)
+        known = codes >= 0
+        codes[~known] = self._fallback
+        return codes, known
+
+    def asset_class_codes(self, asset_classes):
+        """Column index of each asset class name; missing or unknown names map to ANY_ASSET_CLASS."""
+        codes = _codes(self.asset_classes, asset_classes)
+        codes[codes < 0] = 0
+        return codes
+
+    def lookup(self, industries, asset_classes=None) -> dict:
+        """
+        Coefficients for many sites at once, by index gather.
+
+        Args:
+            industries (array-like): Industry name per site.
+            asset_classes (array-like): Optional asset class name per site.
+
+        Returns:
+            dict: "maintenance_reduction" and "downtime_reduction" float64 arrays, plus
+            "known_industry", a bool array marking the sites whose industry is in the table.
+        """
+        rows, known = self.industry_codes(industries)
+        columns = 0 if asset_classes is None else self.asset_class_codes(asset_classes)
+        return {
+            "maintenance_reduction": self.maintenance_reduction[rows, columns],
+            "downtime_reduction": self.downtime_reduction[rows, columns],
+            "known_industry": known,
+        }
+
+    def coefficients(self, industry: str, asset_class: str = None) -> dict:
+        """Coefficients for one site, as floats keyed by COEFFICIENT_NAMES."""
+        row = self.industries.index(industry) if industry in self.industries else self._fallback
+        column = self.asset_classes.index(asset_class) if asset_class in self.asset_classes else 0
+        return {
+            "maintenance_reduction": float(self.maintenance_reduction[row, column]),
+            "downtime_reduction": float(self.downtime_reduction[row, column]),
+        }
+
+
+def _codes(names: tuple, values):
+    """Position of each of `values` in `names` (-1 where absent), hashing each distinct value once."""
+    import numpy as np
+    import pandas as pd
+
+    if not hasattr(values, "dtype"):
+        values = np.asarray(values, dtype=object)
+    # factorize hashes the column once; only its few distinct values are then looked up by name.
+    labels, uniques = pd.factorize(values)
+    positions = pd.Index(names).get_indexer(np.asarray(uniques, dtype=object))
+    return np.where(labels >= 0, np.append(positions, -1)[labels], -1)
+
+
+def _mapping(value, where: str) -> dict:
+    """`value` if it is a JSON object; the file is rejected otherwise."""
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected an object for {where} in the coefficients file, got {type(value).__name__}.")
+    return value
+
+
+def _coefficients(entry: dict, where: str) -> dict:
+    """The coefficients an entry sets, validated as fractions between 0 and 1."""
+    values = {}
+    for name in COEFFICIENT_NAMES:
+        if name in entry:
+            value = entry[name]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0.0 <= value <= 1.0:
+                raise ValueError(f"Coefficient {where}.{name} must be a number between 0 and 1, got {value!r}.")
+            values[name] = float(value)
+    return values
+
+
+def load_coefficients(path=COEFFICIENTS_FILE) -> CoefficientTable:
+    """Reads and compiles a coefficients file."""
+    with open(path, encoding="utf-8") as handle:
+        return CoefficientTable(json.load(handle))
+
+
+class CoefficientStore:
+    """Thread-safe holder of the current CoefficientTable, reloaded when its file changes."""
+
+    def __init__(self, path=COEFFICIENTS_FILE, check_seconds: float = DEFAULT_CHECK_SECONDS, clock=time.monotonic):
+        """
+        Args:
+            path (str | Path): Coefficients file.
+            check_seconds (float): Minimum interval between checks of the file's modification time.
+            clock (callable): Monotonic time in seconds; defaults to time.monotonic.
+        """
+        self.path = Path(path)
+        self.check_seconds = check_seconds
+        self.clock = clock
+        self.reloads = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._table = load_coefficients(self.path)
+        self._checked = clock()
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def table(self) -> CoefficientTable:
+        """The current table, re-read first if the file changed since the last check."""
+        now = self.clock()
+        if now - self._checked < self.check_seconds:
+            return self._table
+        with self._lock:
+            if now - self._checked >= self.check_seconds:
+                self._checked = now
+                self._reload_if_changed()
+            return self._table
+
+    def _reload_if_changed(self):
+        try:
+            signature = self._stat()
+            if signature == self._signature:
+                return
+            table = load_coefficients(self.path)
+        except (OSError, ValueError) as exc:
+            # A half-written or invalid edit must not take the app down; keep the last good table.
+            if str(exc) != self.last_error:
+                LOGGER.error("Keeping coefficients %s; could not reload %s: %s", self._table.key, self.path, exc)
+            self.last_error = str(exc)
+            return
+        self._signature = signature
+        if table.key != self._table.key:
+            LOGGER.info("Reloaded coefficients %s from %s", table.key, self.path)
+            self._table = table
+            self.reloads += 1
+        self.last_error = None
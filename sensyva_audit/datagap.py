@@ -0,0 +1,490 @@
+"""Measure how much of a site's recorded sensor data is ever analyzed.
+
+The audit's headline is that ``DATA_GAP_PERCENTAGE`` (95%) of industrial
+sensor data never gets analyzed. ``profile_sensor_dump`` measures it for one
+site from recorded dumps:
+
+* Parquet: one row per sample, a ``timestamp`` column and one numeric column
+  per channel (vibration, thermal, power, ...), read one batch at a time
+  and restricted to those columns.
+* Raw arrays, one channel per file: ``.npy`` (a 1-D array, or a structured
+  array with ``timestamp`` and ``value`` fields) or headerless ``.f32``,
+  ``.f64``, ``.i16`` and ``.i32`` files. Arrays without timestamps are taken
+  as uniformly sampled at ``sample_rate_hz`` from ``start``. Each block is a
+  fresh read-only ``np.memmap`` of just that slice, so reads are zero-copy
+  and the resident set stays at about one block whatever the file size.
+  Samples are matched to analysis windows by binary search on sorted
+  timestamps (or by arithmetic for uniform arrays) rather than per sample.
+
+Files are profiled in name order, so daily Parquet dumps of the same
+channels accumulate into one channel each. Per channel it reports:
+
+* expected samples: first to last sample at the nominal rate (given, or the
+  median spacing of the first block);
+* sampling gaps: spacings longer than ``gap_factor`` nominal periods, with
+  their count, total and longest missing time;
+* dropouts: samples that arrived without a reading (NaN/null, or
+  ``dropout_value`` for integer ADC dumps);
+* coverage: valid samples / expected samples;
+* analyzed fraction: valid samples inside the ``AnalysisWindows`` (the
+  stretches someone or something actually reviews) / expected samples.
+
+The data gap is one minus the analyzed fraction over all channels: a sample
+that was never recorded, dropped out or fell outside every analysis window
+was never analyzed.
+"""
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from sensyva_audit.engine import DATA_GAP_PERCENTAGE
+
+TIMESTAMP_COLUMN = "timestamp"
+VALUE_FIELD = "value"
+DEFAULT_BLOCK_SAMPLES = 1 << 22
+DEFAULT_GAP_FACTOR = 2.0
+PARQUET_SUFFIXES = (".parquet", ".pq")
+RAW_DTYPES = {".f32": "<f4", ".f64": "<f8", ".i16": "<i2", ".i32": "<i4"}
+SUPPORTED_SUFFIXES = (*PARQUET_SUFFIXES, ".npy", *RAW_DTYPES)
+
+_NS = 1_000_000_000
+_NAT = np.iinfo(np.int64).min
+
+
+def _to_ns(value) -> int:
+    """Epoch nanoseconds from a timestamp-like value; bare numbers are epoch seconds."""
+    import pandas as pd
+
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(round(float(value) * _NS))
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return int(stamp.value)
+
+
+class AnalysisWindows:
+    """Stretches of time in which recorded data is actually analyzed."""
+
+    def __init__(
+        self,
+        intervals=None,
+        every_seconds: float = None,
+        duration_seconds: float = None,
+        offset_seconds: float = 0.0,
+    ):
+        """
+        Args:
+            intervals (iterable): (start, end) pairs reviewed explicitly; timestamps, strings or epoch seconds.
+            every_seconds (float): Period of a recurring review, e.g. 8 hours for a shift-end check.
+            duration_seconds (float): Length of data analyzed in each period.
+            offset_seconds (float): Start of the analyzed stretch within each period, counted from the Unix epoch.
+        """
+        pairs = [(_to_ns(start), _to_ns(end)) for start, end in (intervals or ())]
+        self.starts, self.ends = _merge_spans(
+            np.array([start for start, _ in pairs], dtype=np.int64),
+            np.array([end for _, end in pairs], dtype=np.int64),
+        )
+        self.every_ns = int(every_seconds * _NS) if every_seconds else 0
+        self.duration_ns = min(int((duration_seconds or 0) * _NS), self.every_ns)
+        self.offset_ns = int(offset_seconds * _NS)
+
+    def spans(self, low: int, high: int):
+        """Merged (starts, ends) of the windows overlapping [low, high), in epoch nanoseconds."""
+        first = np.searchsorted(self.ends, low, side="right")
+        last = np.searchsorted(self.starts, high, side="left")
+        starts, ends = self.starts[first:last], self.ends[first:last]
+        if self.duration_ns:
+            # Periods k whose window [offset + k * every, + duration) overlaps [low, high).
+            k_first = (low - self.offset_ns - self.duration_ns) // self.every_ns + 1
+            k_last = (high - 1 - self.offset_ns) // self.every_ns
+            periodic = self.offset_ns + np.arange(k_first, k_last + 1, dtype=np.int64) * self.every_ns
+            starts, ends = _merge_spans(np.r_[starts, periodic], np.r_[ends, periodic + self.duration_ns])
+        return starts, ends
+
+    def count(self, valid, timestamps=None, first_ns: int = None, period_ns: float = None) -> int:
+        """
+        Number of `valid` samples that fall inside a window.
+
+        Args:
+            valid (np.ndarray): Boolean per sample.
+            timestamps (np.ndarray): Sorted epoch nanoseconds per sample; or, for uniform samples, None and:
+            first_ns (int): Time of the first sample.
+            period_ns (float): Sample spacing.
+        """
+        count = len(valid)
+        if timestamps is not None:
+            low, high = int(timestamps[0]), int(timestamps[-1]) + 1
+        else:
+            low, high = first_ns, first_ns + int((count - 1) * period_ns) + 1
+        starts, ends = self.spans(low, high)
+        if not len(starts):
+            return 0
+        if timestamps is not None:
+            lows, highs = np.searchsorted(timestamps, starts), np.searchsorted(timestamps, ends)
+        else:
+            lows = np.clip(np.ceil((starts - first_ns) / period_ns), 0, count).astype(np.int64)
+            highs = np.clip(np.ceil((ends - first_ns) / period_ns), 0, count).astype(np.int64)
+        if len(starts) > 1024:
+            running = np.concatenate(([0], np.cumsum(valid)))
+            return int((running[highs] - running[lows]).sum())
+        return sum(int(np.count_nonzero(valid[a:b])) for a, b in zip(lows.tolist(), highs.tolist()))
+
+    def mask(self, timestamps):
+        """Boolean array: which of `timestamps` (epoch nanoseconds, any order) fall inside a window."""
+        inside = np.zeros(len(timestamps), dtype=bool)
+        if self.duration_ns:
+            inside |= (timestamps - self.offset_ns) % self.every_ns < self.duration_ns
+        if len(self.starts):
+            index = np.searchsorted(self.starts, timestamps, side="right") - 1
+            inside |= (index >= 0) & (timestamps < self.ends[np.maximum(index, 0)])
+        return inside
+
+    def describe(self) -> str:
+        parts = []
+        if self.duration_ns:
+            parts.append(f"{self.duration_ns / _NS / 60:g} min every {self.every_ns / _NS / 3600:g} h")
+        if len(self.starts):
+            parts.append(f"{len(self.starts):,} reviewed interval(s)")
+        return " + ".join(parts) or "none"
+
+
+def _merge_spans(starts, ends):
+    """Sorted, non-overlapping union of [start, end) spans."""
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) < 2:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    first = np.flatnonzero(np.r_[True, starts[1:] > reach[:-1]])
+    return starts[first], np.maximum.reduceat(ends, first)
+
+
+@dataclass
+class ChannelProfile:
+    """Sampling and analysis statistics of one sensor channel."""
+
+    name: str
+    sample_rate_hz: float = 0.0
+    first_ns: int = None
+    last_ns: int = None
+    samples: int = 0
+    dropouts: int = 0
+    gaps: int = 0
+    gap_seconds: float = 0.0
+    longest_gap_seconds: float = 0.0
+    analyzed_samples: int = 0
+
+    @property
+    def expected_samples(self) -> int:
+        if self.first_ns is None or self.sample_rate_hz <= 0:
+            return self.samples
+        span = (self.last_ns - self.first_ns) / _NS
+        return max(self.samples, int(round(span * self.sample_rate_hz)) + 1)
+
+    @property
+    def coverage(self) -> float:
+        expected = self.expected_samples
+        return (self.samples - self.dropouts) / expected if expected else 0.0
+
+    @property
+    def analyzed_fraction(self) -> float:
+        expected = self.expected_samples
+        return self.analyzed_samples / expected if expected else 0.0
+
+    def add(self, timestamps, values, windows, gap_factor: float, dropout_value=None, first_ns: int = None):
+        """
+        Folds in one block of samples; blocks must arrive in time order.
+
+        `timestamps` is None for uniformly sampled raw arrays: the block then starts at `first_ns`
+        and is spaced at the channel's sample rate, and has no sampling gaps by construction.
+        """
+        count = len(values)
+        if count == 0:
+            return
+        valid = np.isfinite(values) if values.dtype.kind == "f" else np.ones(count, dtype=bool)
+        if dropout_value is not None:
+            valid &= values != dropout_value
+        self.samples += count
+        self.dropouts += count - int(np.count_nonzero(valid))
+
+        if timestamps is None:
+            period_ns = _NS / self.sample_rate_hz
+            first, last = first_ns, first_ns + int(round((count - 1) * period_ns))
+            if windows is not None:
+                self.analyzed_samples += windows.count(valid, first_ns=first_ns, period_ns=period_ns)
+        else:
+            previous = timestamps[:1] if self.last_ns is None else np.array([self.last_ns], dtype=np.int64)
+            spacing = np.diff(timestamps, prepend=previous)
+            if self.sample_rate_hz <= 0:
+                positive = spacing[spacing > 0]
+                if len(positive):
+                    self.sample_rate_hz = _NS / float(np.median(positive))
+            if self.sample_rate_hz > 0:
+                period_ns = _NS / self.sample_rate_hz
+                missing = spacing[spacing > gap_factor * period_ns] - period_ns
+                if len(missing):
+                    self.gaps += len(missing)
+                    self.gap_seconds += float(missing.sum()) / _NS
+                    self.longest_gap_seconds = max(self.longest_gap_seconds, float(missing.max()) / _NS)
+            ordered = not (spacing[1:] < 0).any()
+            if ordered:
+                first, last = int(timestamps[0]), int(timestamps[-1])
+            else:
+                first, last = int(timestamps.min()), int(timestamps.max())
+            if windows is not None:
+                if ordered:
+                    self.analyzed_samples += windows.count(valid, timestamps)
+                else:
+                    self.analyzed_samples += int(np.count_nonzero(valid & windows.mask(timestamps)))
+
+        self.first_ns = first if self.first_ns is None else min(self.first_ns, first)
+        self.last_ns = last if self.last_ns is None else max(self.last_ns, last)
+
+
+@dataclass
+class DataGapProfile:
+    """Per-channel statistics and the measured data gap of a site's sensor dumps."""
+
+    channels: list = field(default_factory=list)
+    files: int = 0
+    bytes_read: int = 0
+    windows: str = "none"
+
+    @property
+    def expected_samples(self) -> int:
+        return sum(channel.expected_samples for channel in self.channels)
+
+    @property
+    def analyzed_samples(self) -> int:
+        return sum(channel.analyzed_samples for channel in self.channels)
+
+    @property
+    def data_gap_percentage(self) -> float:
+        """Share of the samples the sensors should have produced that were never analyzed, in percent."""
+        expected = self.expected_samples
+        if not expected:
+            return float(DATA_GAP_PERCENTAGE)
+        return 100.0 * (1.0 - self.analyzed_samples / expected)
+
+    def table(self):
+        """Per-channel statistics as a DataFrame."""
+        import pandas as pd
+
+        rows = [
+            {
+                "channel": channel.name,
+                "sample_rate_hz": channel.sample_rate_hz,
+                "samples": channel.samples,
+                "expected_samples": channel.expected_samples,
+                "coverage": channel.coverage,
+                "dropouts": channel.dropouts,
+                "gaps": channel.gaps,
+                "gap_hours": channel.gap_seconds / 3600.0,
+                "longest_gap_hours": channel.longest_gap_seconds / 3600.0,
+                "analyzed_fraction": channel.analyzed_fraction,
+            }
+            for channel in self.channels
+        ]
+        return pd.DataFrame(rows).set_index("channel") if rows else pd.DataFrame()
+
+    def to_json(self) -> str:
+        payload = asdict(self)
+        payload["data_gap_percentage"] = self.data_gap_percentage
+        return json.dumps(payload, indent=2)
+
+    @classmethod
+    def from_json(cls, text) -> "DataGapProfile":
+        payload = json.loads(text)
+        payload.pop("data_gap_percentage", None)
+        channels = [ChannelProfile(**channel) for channel in payload.pop("channels", [])]
+        return cls(channels=channels, **payload)
+
+
+# --- Readers ---
+
+def _parquet_timestamps(column):
+    import pyarrow as pa
+
+    if pa.types.is_timestamp(column.type) or pa.types.is_date(column.type):
+        return column.cast(pa.timestamp("ns")).to_numpy(zero_copy_only=False).view(np.int64)
+    if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+        seconds = column.to_numpy(zero_copy_only=False).astype(np.float64)
+        return np.where(np.isfinite(seconds), np.rint(seconds * _NS), _NAT).astype(np.int64)
+    import pandas as pd
+
+    stamps = pd.to_datetime(column.to_pandas(), utc=True, errors="coerce").dt.tz_localize(None)
+    return stamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def _parquet_blocks(source, block_samples: int):
+    """Yields (timestamps, {channel: values}, None, fraction of the file read) batches."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet sensor dumps require pyarrow (pip install pyarrow).") from exc
+
+    # Column chunks are compressed, so mapping the file would save no copy and only inflate RSS.
+    parquet = pq.ParquetFile(source, pre_buffer=False)
+    schema = parquet.schema_arrow
+    if TIMESTAMP_COLUMN not in schema.names:
+        raise ValueError(f"Sensor dump {getattr(source, 'name', source)} has no '{TIMESTAMP_COLUMN}' column.")
+    # A DataFrame written with its index stores it as a column (e.g. __index_level_0__); it is not a channel.
+    # RangeIndex entries are dicts describing the range, not stored columns.
+    index_columns = {name for name in (schema.pandas_metadata or {}).get("index_columns", []) if isinstance(name, str)}
+    channels = [
+        item.name
+        for item in schema
+        if item.name != TIMESTAMP_COLUMN
+        and item.name not in index_columns
+        and (pa.types.is_floating(item.type) or pa.types.is_integer(item.type))
+    ]
+    total_rows = max(parquet.metadata.num_rows, 1)
+    rows_read = 0
+    for batch in parquet.iter_batches(batch_size=block_samples, columns=[TIMESTAMP_COLUMN, *channels]):
+        rows_read += batch.num_rows
+        timestamps = _parquet_timestamps(batch.column(0))
+        keep = timestamps != _NAT
+        values = {
+            name: batch.column(index + 1).to_numpy(zero_copy_only=False) for index, name in enumerate(channels)
+        }
+        if not keep.all():
+            timestamps = timestamps[keep]
+            values = {name: array[keep] for name, array in values.items()}
+        yield timestamps, values, None, rows_read / total_rows
+
+
+def _raw_layout(path: Path):
+    """(dtype, byte offset of the data, number of samples) of a raw channel file."""
+    suffix = path.suffix.lower()
+    if suffix in RAW_DTYPES:
+        dtype = np.dtype(RAW_DTYPES[suffix])
+        return dtype, 0, path.stat().st_size // dtype.itemsize
+    with open(path, "rb") as handle:
+        version = np.lib.format.read_magic(handle)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+        offset = handle.tell()
+    if len(shape) != 1:
+        raise ValueError(f"{path.name} has shape {shape}; raw dumps hold one channel per file as a 1-D array.")
+    if dtype.names is not None and not {TIMESTAMP_COLUMN, VALUE_FIELD} <= set(dtype.names):
+        raise ValueError(f"{path.name} is a structured array without '{TIMESTAMP_COLUMN}' and '{VALUE_FIELD}' fields.")
+    return dtype, offset, shape[0]
+
+
+def _raw_timestamps(field_values):
+    if field_values.dtype.kind == "M":
+        return field_values.astype("datetime64[ns]").view(np.int64)
+    if field_values.dtype.kind == "f":
+        return np.rint(field_values * _NS).astype(np.int64)
+    return field_values.astype(np.int64)
+
+
+def _raw_blocks(path: Path, block_samples: int, sample_rate_hz: float, start_ns: int):
+    """
+    Yields (timestamps, {channel: values}, first_ns, fraction of the file read) from a memory-mapped raw file.
+
+    Uniformly sampled arrays yield no timestamps, just the time of each block's first sample.
+    """
+    dtype, offset, count = _raw_layout(path)
+    timed = dtype.names is not None
+    if not timed and (not sample_rate_hz or start_ns is None):
+        raise ValueError(f"{path.name} has no timestamps; give its sample rate and start time.")
+    for first in range(0, count, block_samples):
+        size = min(block_samples, count - first)
+        block = np.memmap(path, dtype=dtype, mode="r", offset=offset + first * dtype.itemsize, shape=(size,))
+        if timed:
+            timestamps, values, first_ns = _raw_timestamps(block[TIMESTAMP_COLUMN]), block[VALUE_FIELD], None
+        else:
+            timestamps, values = None, block
+            first_ns = start_ns + int(round(first * _NS / sample_rate_hz))
+        yield timestamps, {path.stem: values}, first_ns, (first + size) / count
+        del block, values
+
+
+def _expand_sources(sources):
+    if isinstance(sources, (str, Path)) or hasattr(sources, "read"):
+        sources = [sources]
+    expanded = []
+    for source in sources:
+        if hasattr(source, "read"):
+            expanded.append(source)
+        elif Path(source).is_dir():
+            expanded += sorted(path for path in Path(source).iterdir() if path.suffix.lower() in SUPPORTED_SUFFIXES)
+        else:
+            expanded.append(Path(source))
+    return sorted(expanded, key=lambda source: str(getattr(source, "name", source)))
+
+
+def profile_sensor_dump(
+    sources,
+    windows: AnalysisWindows = None,
+    sample_rate_hz: float = None,
+    start=None,
+    gap_factor: float = DEFAULT_GAP_FACTOR,
+    dropout_value=None,
+    block_samples: int = DEFAULT_BLOCK_SAMPLES,
+    on_progress=None,
+) -> DataGapProfile:
+    """
+    Profiles recorded sensor dumps and measures the share of data that is never analyzed.
+
+    Args:
+        sources: A file, a directory of dumps, a list of either, or a binary file-like Parquet upload.
+        windows (AnalysisWindows): When data is analyzed; None means nothing is.
+        sample_rate_hz (float): Rate of raw arrays without timestamps (required for them); timestamped
+            channels infer theirs from the median sample spacing.
+        start: Time of the first sample of raw arrays without timestamps (timestamp, string or epoch seconds).
+        gap_factor (float): A spacing longer than this many nominal periods counts as a sampling gap.
+        dropout_value (number): Sentinel marking a missing reading, e.g. -32768 in int16 ADC dumps.
+        block_samples (int): Samples per block; bounds memory.
+        on_progress (callable): Optional callback taking (fraction of files read, samples read so far).
+
+    Returns:
+        DataGapProfile: Per-channel statistics and the measured data gap.
+    """
+    paths = _expand_sources(sources)
+    if not paths:
+        raise ValueError("No sensor dumps found; expected " + ", ".join(SUPPORTED_SUFFIXES) + " files.")
+    start_ns = _to_ns(start) if start is not None else None
+    profile = DataGapProfile(windows=windows.describe() if windows is not None else "none")
+    channels = {}
+    samples = 0
+
+    for number, source in enumerate(paths):
+        name = str(getattr(source, "name", source)).lower()
+        nominal_rate = 0.0
+        if name.endswith(PARQUET_SUFFIXES):
+            blocks = _parquet_blocks(source, block_samples)
+        elif hasattr(source, "read") or Path(name).suffix not in SUPPORTED_SUFFIXES:
+            raise ValueError(
+                f"Unsupported sensor dump {getattr(source, 'name', source)!r}; "
+                f"use {', '.join(SUPPORTED_SUFFIXES)} files."
+            )
+        else:
+            blocks = _raw_blocks(source, block_samples, sample_rate_hz, start_ns)
+            if _raw_layout(source)[0].names is None:
+                nominal_rate = sample_rate_hz
+
+        for timestamps, values, first_ns, fraction in blocks:
+            for channel_name, array in values.items():
+                channel = channels.get(channel_name)
+                if channel is None:
+                    channel = channels[channel_name] = ChannelProfile(channel_name, nominal_rate)
+                channel.add(timestamps, array, windows, gap_factor, dropout_value, first_ns)
+                samples += len(array)
+            if on_progress is not None:
+                on_progress((number + fraction) / len(paths), samples)
+
+        profile.files += 1
+        profile.bytes_read += int(getattr(source, "size", 0)) if hasattr(source, "read") else source.stat().st_size
+
+    profile.channels = list(channels.values())
+    return profile
@@ -0,0 +1,286 @@
+"""Streaming export of per-site audit results to CSV, Parquet, Arrow IPC and XLSX.
+
+A ``ResultWriter`` takes DataFrame chunks with identical columns and appends
+each one to its file as it arrives, so exporting a portfolio never holds
+more than one chunk in memory, however many sites it has. The portfolio
+audit writes its results through one, and ``export_table`` re-streams an
+existing results file into another format.
+
+Money columns stay numeric at full precision rather than being rendered
+row by row into "₹x.xx Cr" strings. Their units travel with the data
+instead:
+
+* Parquet and Arrow IPC: each field carries ``unit`` metadata
+  (``COLUMN_UNITS``), e.g. ``{"unit": "INR crore"}``;
+* XLSX: cells use an Excel number format that displays the same text as
+  ``format_crores``/``format_lakhs`` while keeping the value a number;
+* CSV: the unit is the column name's suffix (``_crores``, ``_lakhs``, ``_hours``).
+
+CSV goes through pyarrow's writer when it is installed (pandas otherwise).
+Parquet and Arrow IPC need pyarrow; XLSX needs XlsxWriter, whose
+constant-memory mode flushes each row to disk as it is written. An XLSX
+sheet holds at most ``XLSX_MAX_ROWS`` rows, so longer exports continue on
+further sheets.
+"""
+from pathlib import Path
+
+from sensyva_audit.portfolio import DEFAULT_CHUNK_ROWS, INDUSTRY_COLUMN, SITE_COLUMN, iter_table_chunks
+
+# File suffix -> export format.
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".xlsx": "xlsx",
+}
+# Column-name suffix -> unit stored with the column.
+COLUMN_UNITS = {
+    "_crores": "INR crore",
+    "_lakhs": "INR lakh/hour",
+    "_hours": "hours/year",
+}
+# Excel number formats matching format_crores and format_lakhs.
+XLSX_NUMBER_FORMATS = {
+    "INR crore": '"₹"0.00" Cr"',
+    "INR lakh/hour": '"₹"0.00" Lakhs"',
+    "hours/year": "#,##0",
+}
+# Data rows per XLSX sheet (Excel's 1,048,576-row limit, less the header).
+XLSX_MAX_ROWS = 1_048_575
+
+
+def column_unit(column: str):
+    """Unit of a results column, from its name's suffix, or None."""
+    for suffix, unit in COLUMN_UNITS.items():
+        if column.endswith(suffix):
+            return unit
+    return None
+
+
+def export_format(path) -> str:
+    """Export format implied by `path`'s suffix."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {suffix or str(path)!r}; use one of {', '.join(EXPORT_FORMATS)}.")
+    return EXPORT_FORMATS[suffix]
+
+
+def _require_pyarrow(kind: str):
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(f"{kind} export requires pyarrow (pip install pyarrow).") from exc
+    return pyarrow
+
+
+class ResultWriter:
+    """Appends DataFrame chunks with identical columns to one file; use as a context manager."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.rows = 0
+
+    def write(self, frame):
+        """Appends one chunk."""
+        self._write(frame)
+        self.rows += len(frame)
+
+    def _write(self, frame):
+        raise NotImplementedError
+
+    def close(self):
+        """Finishes the file; a writer that never saw a chunk still leaves a valid, empty file."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CSVResultWriter(ResultWriter):
+    """CSV with a header row; each chunk is appended as it arrives."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        try:
+            import pyarrow.csv as pcsv
+        except ImportError:
+            pcsv = None
+        self._pcsv = pcsv
+        self._writer = None
+        self._file = None if pcsv else open(self.path, "w", newline="", encoding="utf-8")
+
+    def _write(self, frame):
+        if self._pcsv is None:
+            frame.to_csv(self._file, header=self._file.tell() == 0, index=False)
+            return
+        # pyarrow's C++ writer formats floats about ten times faster than DataFrame.to_csv.
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pcsv.CSVWriter(str(self.path), table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+        else:
+            Path(self.path).write_text("", encoding="utf-8")
+
+
+class _ArrowResultWriter(ResultWriter):
+    """Shared schema handling for the pyarrow-backed formats; the schema comes from the first chunk."""
+
+    kind = None
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._pa = _require_pyarrow(self.kind)
+        self._writer = None
+        self._schema = None
+
+    def _schema_for(self, frame):
+        schema = self._pa.Schema.from_pandas(frame, preserve_index=False)
+        fields = []
+        for arrow_field in schema:
+            unit = column_unit(arrow_field.name)
+            fields.append(arrow_field.with_metadata({"unit": unit}) if unit else arrow_field)
+        return self._pa.schema(fields, metadata=schema.metadata)
+
+    def _write(self, frame):
+        if self._writer is None:
+            self._schema = self._schema_for(frame)
+            self._writer = self._open(self._schema)
+        self._writer.write_table(self._pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+
+    def _open(self, schema):
+        raise NotImplementedError
+
+    def close(self):
+        if self._writer is None:
+            self._writer = self._open(self._pa.schema([]))
+        self._writer.close()
+
+
+class ParquetResultWriter(_ArrowResultWriter):
+    """Parquet with one row group per chunk."""
+
+    kind = "Parquet"
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.path, schema)
+
+
+class ArrowResultWriter(_ArrowResultWriter):
+    """Arrow IPC file (Feather v2) with one record batch per chunk."""
+
+    kind = "Arrow IPC"
+
+    def _open(self, schema):
+        return self._pa.ipc.new_file(str(self.path), schema)
+
+
+class XLSXResultWriter(ResultWriter):
+    """XLSX written row by row in XlsxWriter's constant-memory mode, with unit number formats."""
+
+    def __init__(self, path, max_rows: int = XLSX_MAX_ROWS):
+        super().__init__(path)
+        try:
+            import xlsxwriter
+        except ImportError as exc:
+            raise ImportError("XLSX export requires XlsxWriter (pip install XlsxWriter).") from exc
+        self._workbook = xlsxwriter.Workbook(str(self.path), {"constant_memory": True, "nan_inf_to_errors": True})
+        self._header = self._workbook.add_format({"bold": True})
+        self._formats = {unit: self._workbook.add_format({"num_format": code}) for unit, code in XLSX_NUMBER_FORMATS.items()}
+        self.max_rows = max_rows
+        self._columns = None
+        self._sheet = None
+        self._sheet_row = 0
+
+    def _new_sheet(self):
+        sheets = len(self._workbook.worksheets())
+        self._sheet = self._workbook.add_worksheet("Results" if sheets == 0 else f"Results {sheets + 1}")
+        self._sheet.write_row(0, 0, self._columns, self._header)
+        self._sheet.freeze_panes(1, 0)
+        self._sheet_row = 0
+
+    def _write(self, frame):
+        import pandas as pd
+
+        if self._columns is None:
+            self._columns = [str(column) for column in frame.columns]
+            self._new_sheet()
+        formats = [self._formats.get(column_unit(column)) for column in self._columns]
+        numeric = [pd.api.types.is_numeric_dtype(dtype) for dtype in frame.dtypes]
+        columns = [
+            frame[column].tolist() if is_numeric else frame[column].astype(object).where(frame[column].notna(), None).tolist()
+            for column, is_numeric in zip(frame.columns, numeric)
+        ]
+        for row in zip(*columns):
+            if self._sheet_row == self.max_rows:
+                self._new_sheet()
+            self._sheet_row += 1
+            for index, value in enumerate(row):
+                if numeric[index]:
+                    self._sheet.write_number(self._sheet_row, index, value, formats[index])
+                elif value is not None:
+                    self._sheet.write_string(self._sheet_row, index, str(value))
+
+    def close(self):
+        if self._sheet is None:
+            self._workbook.add_worksheet("Results")
+        self._workbook.close()
+
+
+WRITERS = {
+    "csv": CSVResultWriter,
+    "parquet": ParquetResultWriter,
+    "arrow": ArrowResultWriter,
+    "xlsx": XLSXResultWriter,
+}
+
+
+def open_result_writer(path, fmt: str = None) -> ResultWriter:
+    """
+    A ResultWriter for `path`.
+
+    Args:
+        path (str | Path): Output file.
+        fmt (str): "csv", "parquet", "arrow" or "xlsx"; taken from the suffix of `path` by default.
+    """
+    fmt = fmt or export_format(path)
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported export format {fmt!r}; use one of {', '.join(WRITERS)}.")
+    return WRITERS[fmt](path)
+
+
+def export_table(source, path, fmt: str = None, chunk_rows: int = DEFAULT_CHUNK_ROWS, on_progress=None) -> int:
+    """
+    Streams a CSV or Parquet results table (e.g. a portfolio audit's results file) into another format.
+
+    Args:
+        source: Path or binary file-like object holding the CSV or Parquet table.
+        path (str | Path): Output file.
+        fmt (str): Output format; taken from the suffix of `path` by default.
+        chunk_rows (int): Rows held in memory at once.
+        on_progress (callable): Optional callback taking (fraction of the source read, rows written).
+
+    Returns:
+        int: Rows written.
+    """
+    # Identifier columns are read as strings so every chunk gets the same schema.
+    dtype = {SITE_COLUMN: "string", INDUSTRY_COLUMN: "string"}
+    with open_result_writer(path, fmt) as writer:
+        for chunk, fraction in iter_table_chunks(source, None, chunk_rows, dtype=dtype):
+            writer.write(chunk)
+            if on_progress is not None:
+                on_progress(fraction, writer.rows)
+    return writer.rows
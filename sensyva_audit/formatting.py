@@ -0,0 +1,67 @@
+"""Presentation helpers shared by the Streamlit report, downloads and the CLI.
+
+pandas is imported inside the chart-frame helpers, so the string formatters stay import-light.
+"""
+
+
+def format_crores(value):
+    """Formats a number into a readable Crores INR string."""
+    return f"₹{value:.2f} Cr"
+
+
+def format_lakhs(value):
+    """Formats a number into a readable Lakhs INR string."""
+    return f"₹{value:.2f} Lakhs"
+
+
+def format_payback(payback_month, horizon_years):
+    """Describes a projection's payback month, or that it does not pay back within the horizon."""
+    if payback_month is None:
+        return f"No payback within {horizon_years} years"
+    if payback_month == 0:
+        return "Pays back immediately"
+    return f"Pays back in month {payback_month}"
+
+
+def downtime_chart_frame(results):
+    """
+    Current versus projected downtime loss, as drawn by the report's "Downtime Loss Compression" chart.
+
+    Args:
+        results (dict): Output of calculate_impact.
+
+    Returns:
+        pd.DataFrame: "Cost (Crores)" indexed by "Scenario".
+    """
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "Scenario": ["Current Downtime Loss", "Projected Loss with Sensyva"],
+            "Cost (Crores)": [
+                results["estimated_total_downtime_cost_crores"],
+                results["estimated_total_downtime_cost_crores"] - results["potential_downtime_savings_crores"],
+            ],
+        }
+    ).set_index("Scenario")
+
+
+def projection_chart_frame(projection):
+    """
+    Yearly and cumulative net cash flow of a multi-year projection, from the up-front outlay in year 0.
+
+    Args:
+        projection (dict): Output of project_site.
+
+    Returns:
+        pd.DataFrame: "Net Cash Flow (Crores)" and "Cumulative Cash Flow (Crores)" indexed by "Year".
+    """
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "Year": [0, *projection["years"]],
+            "Net Cash Flow (Crores)": [-projection["upfront_crores"], *projection["net_cash_flow_crores"]],
+            "Cumulative Cash Flow (Crores)": [-projection["upfront_crores"], *projection["cumulative_cash_flow_crores"]],
+        }
+    ).set_index("Year")
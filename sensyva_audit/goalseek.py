@@ -0,0 +1,319 @@
+"""Goal seek: the input (or rate) needed to reach a target, for one site or every site at once.
+
+The audit formula is linear in each input,
+
+    total = budget * m + hours * (loss_lakhs / 100) * d
+
+(``m`` and ``d`` being the maintenance and downtime reductions), so with a
+target total and two inputs known, ``solve_required_input`` gets the third
+in closed form, broadcasting over any number of sites. The multi-year NPV of
+``sensyva_audit.projection`` is linear in annual savings too, so
+``required_savings_for_npv`` is closed form as well (its slope and intercept
+come from projecting savings of 1 and of 0).
+
+The internal rate of return is not linear: ``internal_rate_of_return``
+finds, per site, the discount rate at which the projected NPV is zero with
+``bisect``, a vectorized bisection that advances every site's bracket in
+one NumPy step per iteration.
+
+Every solver returns a ``status`` array alongside its values. A target that
+cannot be reached with positive inputs is never silently clipped: its value
+is NaN and its status says why (see ``STATUS_LABELS``).
+
+``solve_register`` applies ``solve_required_input`` to a whole site register
+chunk by chunk, with each site's industry (and asset class) coefficients as
+in a portfolio audit, streaming the solved values through a
+``ResultWriter``.
+"""
+from sensyva_audit.engine import DOWNTIME_REDUCTION_PERCENTAGE, INPUT_COLUMNS, MAINTENANCE_REDUCTION_PERCENTAGE
+from sensyva_audit.industry import INDUSTRY_CONTEXT
+from sensyva_audit.portfolio import (
+    ASSET_CLASS_COLUMN,
+    DEFAULT_CHUNK_ROWS,
+    INDUSTRY_COLUMN,
+    SITE_COLUMN,
+    canonical_industries,
+    default_coefficients,
+    iter_table_chunks,
+)
+
+# Status codes returned alongside solved values.
+SOLVED = 0
+TARGET_ALREADY_MET = 1
+NO_EFFECT = 2
+INVALID_INPUT = 3
+NOT_BRACKETED = 4
+STATUS_LABELS = (
+    "solved",
+    "target already met by the other inputs",
+    "this input has no effect on the target",
+    "missing, non-finite or negative input",
+    "no solution in the search range",
+)
+
+# Search range for the internal rate of return (-99% to 1,000% a year).
+IRR_BRACKET = (-0.99, 10.0)
+IRR_TOLERANCE = 1e-8
+DEFAULT_TOLERANCE = 1e-10
+DEFAULT_MAX_ITERATIONS = 200
+# Register column holding each site's target, and the status column added to solved registers.
+TARGET_COLUMN = "target_total_savings_crores"
+STATUS_COLUMN = "goal_seek_status"
+
+
+def status_labels(status):
+    """Human-readable label for each status code in `status`."""
+    import numpy as np
+
+    return np.asarray(STATUS_LABELS, dtype=object)[np.asarray(status)]
+
+
+def solve_required_input(
+    target_total_savings_crores,
+    solve_for: str,
+    annual_maintenance_budget_crores=None,
+    unplanned_downtime_hours=None,
+    revenue_loss_per_hour_lakhs=None,
+    maintenance_reduction=MAINTENANCE_REDUCTION_PERCENTAGE,
+    downtime_reduction=DOWNTIME_REDUCTION_PERCENTAGE,
+):
+    """
+    Solves the audit formula for one input, given a target total and the other two inputs.
+
+    Args:
+        target_total_savings_crores (array-like): Target total annual savings per site in Crores INR.
+        solve_for (str): The unknown input, one of INPUT_COLUMNS.
+        annual_maintenance_budget_crores (array-like): Known budget (ignored when it is the unknown).
+        unplanned_downtime_hours (array-like): Known downtime hours (ignored when it is the unknown).
+        revenue_loss_per_hour_lakhs (array-like): Known loss per hour (ignored when it is the unknown).
+        maintenance_reduction (float | array-like): Fraction of the maintenance budget saved.
+        downtime_reduction (float | array-like): Fraction of the downtime cost avoided.
+
+    All arguments broadcast against each other.
+
+    Returns:
+        dict: `solve_for` -> required values (NaN where unreachable) and "status" -> int8 status codes.
+    """
+    import numpy as np
+
+    if solve_for not in INPUT_COLUMNS:
+        raise ValueError(f"Cannot solve for {solve_for!r}; choose one of {', '.join(INPUT_COLUMNS)}.")
+    known = {
+        "annual_maintenance_budget_crores": annual_maintenance_budget_crores,
+        "unplanned_downtime_hours": unplanned_downtime_hours,
+        "revenue_loss_per_hour_lakhs": revenue_loss_per_hour_lakhs,
+    }
+    missing = [name for name, value in known.items() if name != solve_for and value is None]
+    if missing:
+        raise ValueError(f"Solving for {solve_for} needs {' and '.join(missing)}.")
+    target, budget, hours, loss_lakhs, maintenance, downtime = np.broadcast_arrays(
+        *(
+            np.asarray(np.nan if value is None else value, dtype=np.float64)
+            for value in (target_total_savings_crores, *known.values(), maintenance_reduction, downtime_reduction)
+        )
+    )
+
+    # total = fixed + slope * unknown, with `fixed` the savings the two known inputs already deliver.
+    if solve_for == "annual_maintenance_budget_crores":
+        fixed, slope = hours * (loss_lakhs / 100.0) * downtime, maintenance
+        inputs = (target, hours, loss_lakhs)
+    elif solve_for == "unplanned_downtime_hours":
+        fixed, slope = budget * maintenance, (loss_lakhs / 100.0) * downtime
+        inputs = (target, budget, loss_lakhs)
+    else:
+        fixed, slope = budget * maintenance, hours / 100.0 * downtime
+        inputs = (target, budget, hours)
+
+    shortfall = target - fixed
+    valid = np.logical_and.reduce([np.isfinite(values) & (values >= 0) for values in inputs + (maintenance, downtime)])
+    status = np.full(target.shape, SOLVED, dtype=np.int8)
+    status[shortfall <= 0] = TARGET_ALREADY_MET
+    status[(shortfall > 0) & (slope <= 0)] = NO_EFFECT
+    status[~valid] = INVALID_INPUT
+    solved = status == SOLVED
+    value = np.full(target.shape, np.nan)
+    np.divide(shortfall, slope, out=value, where=solved)
+    return {solve_for: value, "status": status}
+
+
+def required_savings_for_npv(target_npv_crores, hardware_cost_crores=0.0, subscription_crores=0.0, **settings):
+    """
+    Steady-state annual savings needed for a multi-year projection to reach a target NPV.
+
+    Args:
+        target_npv_crores (array-like): Target NPV per site in Crores INR.
+        hardware_cost_crores (float | array-like): Up-front cost per site.
+        subscription_crores (float | array-like): Subscription cost per site per year.
+        **settings: Horizon, discount rate, ramp-up and escalation arguments of project_cash_flows.
+
+    Returns:
+        dict: "annual_savings_crores" (NaN where unreachable) and "status" -> int8 status codes.
+    """
+    import numpy as np
+
+    from sensyva_audit.projection import project_cash_flows
+
+    target = np.atleast_1d(np.asarray(target_npv_crores, dtype=np.float64))
+    # NPV = slope * savings + intercept, so projecting savings of 0 and 1 gives both terms. They depend
+    # only on the costs, so with scalar costs one projected site serves every target.
+    hardware, subscription = np.broadcast_arrays(np.atleast_1d(hardware_cost_crores), np.atleast_1d(subscription_crores))
+    intercept = project_cash_flows(np.zeros(hardware.shape), hardware, subscription, **settings)["npv_crores"]
+    slope = project_cash_flows(np.ones(hardware.shape), hardware, subscription, **settings)["npv_crores"] - intercept
+    shortfall, slope = np.broadcast_arrays(target - intercept, slope)
+
+    status = np.full(shortfall.shape, SOLVED, dtype=np.int8)
+    status[shortfall <= 0] = TARGET_ALREADY_MET
+    status[(shortfall > 0) & (slope <= 0)] = NO_EFFECT
+    status[~np.isfinite(shortfall) | ~np.isfinite(slope)] = INVALID_INPUT
+    savings = np.full(shortfall.shape, np.nan)
+    np.divide(shortfall, slope, out=savings, where=status == SOLVED)
+    return {"annual_savings_crores": savings, "status": status}
+
+
+def bisect(function, target, low, high, tolerance: float = DEFAULT_TOLERANCE, max_iterations: int = DEFAULT_MAX_ITERATIONS):
+    """
+    Vectorized bisection: for every element, x in [low, high] with function(x) == target.
+
+    `function` maps an array of x values to an array of results element by element and must be
+    monotonic (in either direction) on each element's bracket. All elements advance together.
+
+    Args:
+        function (callable): Vectorized function of one array argument.
+        target (array-like): Value to reach per element.
+        low (array-like): Lower end of each bracket.
+        high (array-like): Upper end of each bracket.
+        tolerance (float): Stop once every bracket is narrower than this.
+        max_iterations (int): Upper bound on iterations.
+
+    Returns:
+        tuple: (roots, NaN where the target is not inside the bracket; status codes)
+    """
+    import numpy as np
+
+    target, low, high = (np.array(values, dtype=np.float64) for values in np.broadcast_arrays(target, low, high))
+    f_low = function(low) - target
+    f_high = function(high) - target
+    bracketed = (np.isfinite(f_low) & np.isfinite(f_high) & (np.sign(f_low) != np.sign(f_high))) | (f_low == 0) | (f_high == 0)
+    rising = f_high > f_low
+    for _ in range(max_iterations):
+        if not np.any(high - low > tolerance):
+            break
+        middle = 0.5 * (low + high)
+        below = (function(middle) - target < 0) == rising
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    status = np.where(bracketed, SOLVED, NOT_BRACKETED).astype(np.int8)
+    return np.where(bracketed, 0.5 * (low + high), np.nan), status
+
+
+def internal_rate_of_return(
+    annual_savings_crores,
+    hardware_cost_crores=0.0,
+    subscription_crores=0.0,
+    bracket=IRR_BRACKET,
+    tolerance: float = IRR_TOLERANCE,
+    **settings,
+):
+    """
+    Discount rate at which each site's projected NPV is zero.
+
+    Args:
+        annual_savings_crores (array-like): Steady-state annual savings per site.
+        hardware_cost_crores (float | array-like): Up-front cost per site.
+        subscription_crores (float | array-like): Subscription cost per site per year.
+        bracket (tuple): (lowest, highest) rate searched.
+        tolerance (float): Width, as a yearly rate, at which the search stops.
+        **settings: Horizon, ramp-up and escalation arguments of project_cash_flows (not discount_rate).
+
+    Returns:
+        dict: "irr" (NaN where there is no rate in `bracket`) and "status" -> int8 status codes.
+    """
+    import numpy as np
+
+    from sensyva_audit.projection import project_cash_flows
+
+    projection = project_cash_flows(annual_savings_crores, hardware_cost_crores, subscription_crores, **settings)
+    # One contiguous row per year, so each Horner step below reads a single block.
+    net_by_year = np.ascontiguousarray(projection["net_cash_flow_crores"].T)
+    upfront = projection["upfront_crores"]
+
+    def npv(rate):
+        # Horner's rule in the discount factor 1 / (1 + rate): no powers, one multiply-add per year.
+        factor = 1.0 / (1.0 + rate)
+        value = np.zeros_like(factor)
+        for year_net in net_by_year[::-1]:
+            value = (value + year_net) * factor
+        return value - upfront
+
+    irr, status = bisect(npv, 0.0, np.full(len(upfront), bracket[0]), np.full(len(upfront), bracket[1]), tolerance=tolerance)
+    # Without an up-front cost there is no investment to earn a rate on.
+    no_outlay = upfront <= 0
+    status[no_outlay] = NO_EFFECT
+    irr[no_outlay] = np.nan
+    return {"irr": irr, "status": status}
+
+
+def solve_register(
+    source, path, solve_for: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, on_progress=None, coefficients=None
+) -> dict:
+    """
+    Solves every site of a register for one input and streams the results to `path`.
+
+    The register needs TARGET_COLUMN and the two INPUT_COLUMNS other than `solve_for`; site, industry
+    and asset class columns are passed through, and the last two pick each site's coefficients.
+
+    Args:
+        source: Path or binary file-like object holding a CSV or Parquet register.
+        path (str | Path): Output file; its suffix picks the format (see open_result_writer).
+        solve_for (str): The unknown input, one of INPUT_COLUMNS.
+        chunk_rows (int): Rows held in memory at once.
+        on_progress (callable): Optional callback taking (fraction of the source read, sites solved).
+        coefficients (CoefficientTable): Reduction coefficients; the packaged table by default.
+
+    Returns:
+        dict: Site counts per status label.
+    """
+    import numpy as np
+
+    from sensyva_audit.export import open_result_writer
+
+    if solve_for not in INPUT_COLUMNS:
+        raise ValueError(f"Cannot solve for {solve_for!r}; choose one of {', '.join(INPUT_COLUMNS)}.")
+    known = [column for column in INPUT_COLUMNS if column != solve_for]
+    required = [TARGET_COLUMN, *known]
+    identifiers = (SITE_COLUMN, INDUSTRY_COLUMN, ASSET_CLASS_COLUMN)
+    coefficients = coefficients or default_coefficients()
+    industry_names = (*coefficients.industries, *INDUSTRY_CONTEXT)
+    counts = np.zeros(len(STATUS_LABELS), dtype=np.int64)
+    dtype = dict.fromkeys(identifiers, "string")
+    with open_result_writer(path) as writer:
+        for chunk, fraction in iter_table_chunks(source, {*identifiers, *required}, chunk_rows, dtype=dtype):
+            missing = [column for column in required if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Register is missing required column(s): {', '.join(missing)}")
+            chunk = chunk[[column for column in identifiers if column in chunk.columns] + required]
+            # Float columns throughout, so every chunk shares one schema whatever the source inferred.
+            values = {column: chunk[column].to_numpy(dtype=np.float64, na_value=np.nan) for column in required}
+            chunk = chunk.assign(**values)
+            names = {
+                column: chunk[column].fillna("").str.strip().to_numpy(dtype=object)
+                for column in (INDUSTRY_COLUMN, ASSET_CLASS_COLUMN)
+                if column in chunk.columns
+            }
+            industries = names.get(INDUSTRY_COLUMN, np.full(len(chunk), "Other", dtype=object))
+            reductions = coefficients.lookup(canonical_industries(industries, industry_names), names.get(ASSET_CLASS_COLUMN))
+            solved = solve_required_input(
+                values[TARGET_COLUMN],
+                solve_for,
+                **{column: values[column] for column in known},
+                maintenance_reduction=reductions["maintenance_reduction"],
+                downtime_reduction=reductions["downtime_reduction"],
+            )
+            chunk[solve_for] = solved[solve_for]
+            chunk[STATUS_COLUMN] = status_labels(solved["status"])
+            chunk[STATUS_COLUMN] = chunk[STATUS_COLUMN].astype("string")
+            writer.write(chunk)
+            counts += np.bincount(solved["status"], minlength=len(STATUS_LABELS))
+            if on_progress is not None:
+                on_progress(fraction, writer.rows)
+    return {label: int(count) for label, count in zip(STATUS_LABELS, counts)}
@@ -0,0 +1,277 @@
+"""Derive downtime hours and loss per hour from raw CMMS downtime event logs.
+
+An incident log has one row per downtime event: ``start`` and ``end``
+timestamps, the ``cost_lakhs`` booked against it and, optionally, the
+``site``, ``line`` and ``asset`` it hit (a site > line > asset hierarchy).
+``ingest_incident_log`` turns it into the audit inputs
+``unplanned_downtime_hours`` and ``revenue_loss_per_hour_lakhs`` per site
+and per asset.
+
+Overlapping events are merged before hours are counted: two assets failing
+on the same line at once stop the line once. A site's downtime is the sum of
+its lines' merged downtime; an asset's is the union of its own events.
+Hours are annualized over the log's time span (or ``period_days``).
+
+Logs can be many GB, so the work is an external sort in two passes with
+bounded memory:
+
+1. Chunks are parsed (see ``iter_table_chunks``), keys are encoded as
+   integers and fixed-width records are appended to spill files keyed by
+   the time window the event starts in and a hash of its line.
+2. Spill files are loaded one at a time in window order, sorted with NumPy
+   and swept once to merge intervals. Each line and asset carries the end
+   of its latest interval (its reach) into the next window; an event that
+   starts before that reach only counts from the reach onwards, because
+   everything between its start and the reach is already covered.
+
+Peak memory is one parsed chunk or one spill file, whichever is larger, so
+it depends on event density rather than on the length of the log, and the
+run time grows linearly with the number of events.
+"""
+import math
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from sensyva_audit.portfolio import SITE_COLUMN, iter_table_chunks
+
+START_COLUMN = "start"
+END_COLUMN = "end"
+LINE_COLUMN = "line"
+ASSET_COLUMN = "asset"
+COST_COLUMN = "cost_lakhs"
+DEFAULT_CHUNK_ROWS = 500_000
+DEFAULT_PARTITIONS = 16
+DEFAULT_WINDOW_DAYS = 7
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+_KEY_SEPARATOR = "\x1f"
+_RECORD = np.dtype([("line", "<i8"), ("asset", "<i8"), ("start", "<i8"), ("end", "<i8"), ("cost", "<f8")])
+
+
+@dataclass
+class IncidentSummary:
+    """Audit inputs derived from an incident log, per site and per asset."""
+
+    events_read: int = 0
+    events_skipped: int = 0
+    period_days: float = 0.0
+    sites: object = None
+    assets: object = None
+    spill_bytes: int = 0
+
+
+class _KeyCodes:
+    """Stable integer codes for string keys seen across chunks."""
+
+    def __init__(self):
+        self.codes = {}
+        self.keys = []
+
+    def encode(self, values):
+        import pandas as pd
+
+        inverse, uniques = pd.factorize(values)
+        mapping = np.fromiter((self._code(key) for key in uniques), dtype=np.int64, count=len(uniques))
+        return mapping[inverse]
+
+    def _code(self, key):
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.keys)
+            self.keys.append(key)
+        return code
+
+
+def _epoch_seconds(column):
+    import pandas as pd
+
+    # Naive timestamps are taken as UTC; only differences matter.
+    stamps = pd.to_datetime(column, utc=True, errors="coerce").dt.tz_localize(None)
+    return stamps.to_numpy(dtype="datetime64[s]").astype(np.int64), stamps.isna().to_numpy()
+
+
+def _encode_chunk(chunk, lines: _KeyCodes, assets: _KeyCodes):
+    """Fixed-width records for one chunk and the number of rows dropped as invalid."""
+    import pandas as pd
+
+    missing = [column for column in (START_COLUMN, END_COLUMN, COST_COLUMN) if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Incident log is missing required column(s): {', '.join(missing)}")
+
+    start, bad_start = _epoch_seconds(chunk[START_COLUMN])
+    end, bad_end = _epoch_seconds(chunk[END_COLUMN])
+    cost = pd.to_numeric(chunk[COST_COLUMN], errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~bad_start & ~bad_end & (end > start) & np.isfinite(cost) & (cost >= 0)
+
+    def key_column(name):
+        if name not in chunk.columns:
+            return pd.Series("", index=chunk.index)
+        return chunk[name].astype("string").fillna("")
+
+    valid_index = chunk.index[valid]
+    line_keys = key_column(SITE_COLUMN)[valid_index] + _KEY_SEPARATOR + key_column(LINE_COLUMN)[valid_index]
+    asset_keys = line_keys + _KEY_SEPARATOR + key_column(ASSET_COLUMN)[valid_index]
+
+    records = np.empty(int(valid.sum()), dtype=_RECORD)
+    records["line"] = lines.encode(line_keys.to_numpy())
+    records["asset"] = assets.encode(asset_keys.to_numpy())
+    records["start"] = start[valid]
+    records["end"] = end[valid]
+    records["cost"] = cost[valid]
+    return records, int((~valid).sum())
+
+
+def merged_seconds(groups, start, end):
+    """
+    Length of the union of each group's [start, end) intervals.
+
+    Args:
+        groups (np.ndarray): Integer group code per interval.
+        start (np.ndarray): Interval starts in integer seconds.
+        end (np.ndarray): Interval ends in integer seconds (greater than `start`).
+
+    Returns:
+        tuple: (unique group codes, merged seconds per group)
+    """
+    if len(groups) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    unique, rank = np.unique(groups, return_inverse=True)
+    # Shift each group onto its own stretch of the time axis so one running maximum
+    # over the sorted intervals never carries an end across a group boundary.
+    origin = int(start.min())
+    span = int(end.max()) - origin + 1
+    if len(unique) * span >= 2**62:
+        raise ValueError("Incident log spans too long a time range to merge in one partition; use more partitions.")
+    shifted_start = start - origin + rank * span
+    shifted_end = end - origin + rank * span
+    order = np.argsort(shifted_start, kind="stable")
+    shifted_start, shifted_end, rank = shifted_start[order], shifted_end[order], rank[order]
+
+    reach = np.maximum.accumulate(shifted_end)
+    opens = np.empty(len(order), dtype=bool)
+    opens[0] = True
+    opens[1:] = shifted_start[1:] > reach[:-1]
+    first = np.flatnonzero(opens)
+    block_end = np.maximum.reduceat(shifted_end, first)
+    lengths = block_end - shifted_start[first]
+    totals = np.bincount(rank[first], weights=lengths, minlength=len(unique))
+    return unique, np.rint(totals).astype(np.int64)
+
+
+class _LevelTotals:
+    """Running per-group totals for one level (line or asset), with each group's reach."""
+
+    def __init__(self, size: int):
+        self.events = np.zeros(size, dtype=np.int64)
+        self.seconds = np.zeros(size, dtype=np.int64)
+        self.cost = np.zeros(size, dtype=np.float64)
+        self.reach = np.full(size, np.iinfo(np.int64).min, dtype=np.int64)
+
+    def add(self, codes, start, end, cost):
+        """Adds one spill file's events; every earlier call must hold events that started no later."""
+        size = len(self.events)
+        self.events += np.bincount(codes, minlength=size)
+        self.cost += np.bincount(codes, weights=cost, minlength=size)
+        start = np.maximum(start, self.reach[codes])
+        fresh = end > start
+        groups, seconds = merged_seconds(codes[fresh], start[fresh], end[fresh])
+        self.seconds[groups] += seconds
+        np.maximum.at(self.reach, codes, end)
+
+
+def ingest_incident_log(
+    source,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    partitions: int = DEFAULT_PARTITIONS,
+    window_days: float = DEFAULT_WINDOW_DAYS,
+    period_days: float = None,
+    spill_dir=None,
+    on_progress=None,
+):
+    """
+    Streams an incident log into per-site and per-asset audit inputs.
+
+    Args:
+        source: Path or binary file-like object holding a CSV or Parquet incident log.
+        chunk_rows (int): Rows parsed per chunk; bounds peak memory of the first pass.
+        partitions (int): Line hash buckets per time window; more buckets mean smaller spill files.
+        window_days (float): Width of the time windows events are spilled by.
+        period_days (float): Length of the period the log covers; defaults to its first start to last end.
+        spill_dir (str | Path): Where spill files go (needs about 40 bytes per event); a temp dir by default.
+        on_progress (callable): Optional callback taking (fraction of the file read, events read so far).
+
+    Returns:
+        IncidentSummary: Counts, the period used and DataFrames of per-site and per-asset inputs.
+    """
+    import pandas as pd
+
+    summary = IncidentSummary()
+    lines, assets = _KeyCodes(), _KeyCodes()
+    first_start, last_end = math.inf, -math.inf
+    wanted = {SITE_COLUMN, LINE_COLUMN, ASSET_COLUMN, START_COLUMN, END_COLUMN, COST_COLUMN}
+    dtype = {SITE_COLUMN: "string", LINE_COLUMN: "string", ASSET_COLUMN: "string"}
+
+    window_seconds = max(int(window_days * 86400), 1)
+
+    with tempfile.TemporaryDirectory(prefix="sensyva-incidents-", dir=spill_dir) as workdir:
+        spills = {}
+        for chunk, fraction in iter_table_chunks(source, wanted, chunk_rows, dtype=dtype):
+            records, skipped = _encode_chunk(chunk, lines, assets)
+            summary.events_read += len(chunk)
+            summary.events_skipped += skipped
+            if len(records):
+                first_start = min(first_start, int(records["start"].min()))
+                last_end = max(last_end, int(records["end"].max()))
+                targets = (records["start"] // window_seconds) * partitions + records["line"] % partitions
+                order = np.argsort(targets, kind="stable")
+                targets, records = targets[order], records[order]
+                bounds = np.flatnonzero(np.diff(targets)) + 1
+                for first, last in zip(np.r_[0, bounds], np.r_[bounds, len(records)]):
+                    target = int(targets[first])
+                    path = spills.setdefault(target, Path(workdir) / f"spill-{target}.bin")
+                    # Appending per chunk keeps the number of open files at one, however long the log.
+                    with open(path, "ab") as handle:
+                        records[first:last].tofile(handle)
+            if on_progress is not None:
+                on_progress(fraction, summary.events_read)
+        summary.spill_bytes = sum(path.stat().st_size for path in spills.values())
+
+        totals = {"line": _LevelTotals(len(lines.keys)), "asset": _LevelTotals(len(assets.keys))}
+        for target in sorted(spills):
+            records = np.fromfile(spills[target], dtype=_RECORD)
+            for level, level_totals in totals.items():
+                level_totals.add(records[level], records["start"], records["end"], records["cost"])
+            del records
+
+    if period_days is None:
+        period_days = (last_end - first_start) / 86400 if summary.events_read > summary.events_skipped else 0.0
+    summary.period_days = float(period_days)
+    scale = SECONDS_PER_YEAR / (period_days * 86400) if period_days > 0 else math.nan
+
+    def level_frame(level, keys, names):
+        if not keys:
+            return pd.DataFrame(columns=[*names, "events", "downtime_hours_observed", "total_cost_lakhs"])
+        level_totals = totals[level]
+        labels = pd.Series(keys, dtype=object).str.split(_KEY_SEPARATOR, expand=True, regex=False)
+        labels.columns = names
+        return labels.assign(
+            events=level_totals.events,
+            downtime_hours_observed=level_totals.seconds / 3600.0,
+            total_cost_lakhs=level_totals.cost,
+        )
+
+    line_frame = level_frame("line", lines.keys, [SITE_COLUMN, LINE_COLUMN])
+    asset_frame = level_frame("asset", assets.keys, [SITE_COLUMN, LINE_COLUMN, ASSET_COLUMN])
+    site_frame = line_frame.groupby(SITE_COLUMN, as_index=False)[
+        ["events", "downtime_hours_observed", "total_cost_lakhs"]
+    ].sum()
+
+    for frame in (site_frame, asset_frame):
+        frame["unplanned_downtime_hours"] = frame["downtime_hours_observed"] * scale
+        frame["revenue_loss_per_hour_lakhs"] = frame["total_cost_lakhs"] / frame["downtime_hours_observed"]
+    summary.sites = site_frame.sort_values(SITE_COLUMN, ignore_index=True)
+    summary.assets = asset_frame.sort_values([SITE_COLUMN, LINE_COLUMN, ASSET_COLUMN], ignore_index=True)
+    return summary
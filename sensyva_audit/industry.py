@@ -0,0 +1,29 @@
+"""Industry narrative context shared by the single-site report and portfolio audits."""
+
+INDUSTRY_CONTEXT = {
+    "Manufacturing": {
+        "savings_hook": "Machining and assembly lines that analyze vibration, temperature, and acoustic signatures early see dramatic scrap and warranty reductions.",
+        "hero_stat": "Top Tier 1 auto supplier cut downtime response from 45 minutes to 6 minutes with edge anomaly detection.",
+    },
+    "Energy": {
+        "savings_hook": "Utilities avoid cascading failures by fusing transformer, weather, and SCADA feeds at the edge.",
+        "hero_stat": "Combined-cycle plant prevented two turbine trips, protecting ₹34 Cr in output within the first quarter.",
+    },
+    "Logistics": {
+        "savings_hook": "Fleet-wide telemetry fused in real-time avoids cold-chain spoilage and loading bay gridlock.",
+        "hero_stat": "National logistics operator improved asset utilization by 18% after deploying Sensyva nodes to yards.",
+    },
+    "Defense": {
+        "savings_hook": "Multi-sensor fusion enables mission-critical systems to go from reactive maintenance to pre-emptive readiness.",
+        "hero_stat": "A radar OEM reduced mission aborts by 72% by pairing Sensyva’s edge stack with existing BMS sensors.",
+    },
+    "Other": {
+        "savings_hook": "Sensor-rich environments—from pharmaceuticals to mining—gain clarity when silent data streams become decisions.",
+        "hero_stat": "Sensyva deployments routinely surface ROI within 90 days by turning dormant data into actionable foresight.",
+    },
+}
+
+
+def get_industry_context(industry: str) -> dict:
+    """Return narrative context for the selected industry."""
+    return INDUSTRY_CONTEXT.get(industry, INDUSTRY_CONTEXT["Other"])
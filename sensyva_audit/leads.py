@@ -0,0 +1,217 @@
+"""Write-behind lead capture backed by a local SQLite store.
+
+``LeadWriter.submit`` only puts the lead on an in-process queue and returns
+immediately, so the person filling in ``lead_form`` never waits on the
+database. A single background worker owns one long-lived SQLite connection
+(WAL journal, NORMAL sync), drains the queue in batches with one
+transaction per batch, retries locked/busy errors with exponential backoff
+and flushes whatever is still queued on ``close()`` (registered with
+``atexit``). If the worker cannot open the store, or stops, ``submit``
+refuses every lead from then on, so callers never report a lead as saved
+when nothing will write it. Rows use the same columns as the website's ``data_gap_leads``
+table.
+"""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, fields
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_QUEUE_SIZE = 100_000
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_SECONDS = 0.05
+DEFAULT_OPEN_TIMEOUT_SECONDS = 5.0
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Lead:
+    """One lead_form submission together with the scenario it was modelled on."""
+
+    name: str
+    email: str
+    company: str
+    phone: str = None
+    region: str = None
+    industry: str = None
+    budget_crores: float = None
+    downtime_hours: float = None
+    loss_per_hour_lakhs: float = None
+    maintenance_savings_crores: float = None
+    downtime_savings_crores: float = None
+    total_savings_crores: float = None
+    submitted_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_results(cls, name, email, company, phone, region, industry, results):
+        """Builds a lead from the form fields and a calculate_impact results dict."""
+        return cls(
+            name=name,
+            email=email,
+            company=company,
+            phone=phone or None,
+            region=region or None,
+            industry=industry,
+            budget_crores=results["annual_maintenance_budget_crores"],
+            downtime_hours=results["unplanned_downtime_hours"],
+            loss_per_hour_lakhs=results["revenue_loss_per_hour_lakhs"],
+            maintenance_savings_crores=results["potential_maintenance_savings_crores"],
+            downtime_savings_crores=results["potential_downtime_savings_crores"],
+            total_savings_crores=results["total_potential_annual_savings_crores"],
+        )
+
+
+LEAD_COLUMNS = tuple(f.name for f in fields(Lead))
+
+_CREATE_TABLE = f"""
+CREATE TABLE IF NOT EXISTS data_gap_leads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {", ".join(LEAD_COLUMNS)}
+)
+"""
+_INSERT = f"INSERT INTO data_gap_leads ({', '.join(LEAD_COLUMNS)}) VALUES ({', '.join('?' * len(LEAD_COLUMNS))})"
+
+
+class LeadWriter:
+    """Queues leads in memory and persists them from one background thread."""
+
+    def __init__(
+        self,
+        path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    ):
+        """
+        Args:
+            path (str | Path): SQLite database file; created with the data_gap_leads table if missing.
+            batch_size (int): Maximum leads written per transaction.
+            queue_size (int): Leads buffered in memory before submit() starts refusing new ones.
+            max_retries (int): Attempts per batch on locked/busy errors before the batch is logged and dropped.
+            backoff_seconds (float): First retry delay; doubles on every attempt.
+        """
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.stats = {"submitted": 0, "rejected": 0, "written": 0, "batches": 0, "retries": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._dead = False
+        self._opened = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="sensyva-lead-writer", daemon=True)
+        self._worker.start()
+        # Opening the store is quick; waiting for it means submit() already knows whether leads can be kept.
+        self._opened.wait(DEFAULT_OPEN_TIMEOUT_SECONDS)
+        atexit.register(self.close)
+
+    def submit(self, lead: Lead) -> bool:
+        """Queues a lead without blocking. Returns False if the writer is closed or dead, or the queue is full."""
+        try:
+            if self._closed or self._dead:
+                raise queue.Full
+            self._queue.put_nowait(lead)
+        except queue.Full:
+            self._count("rejected")
+            LOGGER.warning("Lead queue full, closed or without a worker; dropping lead for %s", lead.email)
+            return False
+        self._count("submitted")
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Stops accepting leads, flushes everything queued and closes the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._dead:
+            return
+        # A full queue must not hang shutdown; the worker only needs the marker to stop early.
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            LOGGER.error("Lead queue still full after %s s; %d leads not flushed", timeout, self.pending())
+            return
+        self._worker.join(timeout)
+
+
+    def pending(self) -> int:
+        """Approximate number of leads waiting to be written."""
+        return self._queue.qsize()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=1000")
+        connection.execute(_CREATE_TABLE)
+        return connection
+
+    def _write(self, connection, batch):
+        rows = [tuple(getattr(lead, column) for column in LEAD_COLUMNS) for lead in batch]
+        delay = self.backoff_seconds
+        for attempt in range(self.max_retries + 1):
+            try:
+                connection.execute("BEGIN")
+                connection.executemany(_INSERT, rows)
+                connection.execute("COMMIT")
+                self._count("written", len(rows))
+                self._count("batches")
+                return
+            except sqlite3.Error as exc:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                # Only locked/busy style errors are worth retrying; anything else fails the batch now.
+                if attempt == self.max_retries or not isinstance(exc, sqlite3.OperationalError):
+                    self._count("failed", len(rows))
+                    LOGGER.error("Dropping %d leads after %d attempts: %s", len(rows), attempt + 1, exc)
+                    return
+                self._count("retries")
+                time.sleep(delay)
+                delay *= 2
+
+    def _run(self):
+        try:
+            connection = self._connect()
+        except sqlite3.Error:
+            self._dead = True
+            LOGGER.exception("Could not open lead store at %s; leads will not be persisted", self.path)
+            return
+        finally:
+            self._opened.set()
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                # Drain whatever else is already waiting, up to one batch.
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _STOP in batch:
+                    stopping = True
+                    batch.remove(_STOP)
+                    while True:
+                        try:
+                            batch.append(self._queue.get_nowait())
+                        except queue.Empty:
+                            break
+                for start in range(0, len(batch), self.batch_size):
+                    self._write(connection, batch[start:start + self.batch_size])
+        except Exception:
+            LOGGER.exception("Lead writer for %s stopped; leads will not be persisted", self.path)
+        finally:
+            self._dead = True
+            connection.close()
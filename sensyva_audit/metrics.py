@@ -0,0 +1,251 @@
+"""Per-rerun instrumentation for the Streamlit app, exported in Prometheus text format.
+
+``Metrics`` holds counters and histograms keyed by label sets and renders
+them in the Prometheus exposition format. It can write them to a file (for
+node_exporter's textfile collector or a sidecar) and serve them at
+``/metrics`` from a background thread.
+
+A script run is timed with ``Metrics.rerun()``: like ``StageTimer``, each
+``lap(section)`` closes the section that began at the previous lap, and
+``finish()`` records the whole run. Sections a run never reaches (no form
+submitted, say) are simply not observed.
+
+When metrics are disabled, ``rerun()`` returns a shared do-nothing timer
+and ``inc``/``observe`` return on their first line, so the hooks cost about
+a microsecond per rerun in total (see ``benchmarks/bench_metrics.py``).
+"""
+import bisect
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+NAMESPACE = "sensyva_audit"
+RERUN_SECTIONS = ("css", "form", "compute", "chart", "narrative", "download")
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_WRITE_INTERVAL = 5.0
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric name (without namespace) -> (type, help)
+METRICS = {
+    "rerun_seconds": ("histogram", "Wall time of a complete gab.py script run."),
+    "section_seconds": ("histogram", "Wall time of each gab.py section within a script run."),
+    "submissions_total": ("counter", "Form submissions, by form."),
+    "validation_failures_total": ("counter", "Submissions rejected by input validation, by form."),
+    "exceptions_total": ("counter", "Exceptions caught while rendering, by section."),
+    "leads_refused_total": ("counter", "Lead form submissions the lead writer refused (queue full, closed or no worker)."),
+    "lead_matches_total": ("counter", "Lead form submissions by what matched them to a known contact or account (pending while the index rebuilds)."),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RerunTimer:
+    """Times the sections of one script run; call lap(section) as each finishes and finish() at the end."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._started = self._last = time.perf_counter()
+
+    def lap(self, section: str) -> float:
+        """Closes `section` and records its duration in seconds."""
+        now = time.perf_counter()
+        duration = now - self._last
+        self._last = now
+        self.metrics.observe("section_seconds", duration, section=section)
+        return duration
+
+    def finish(self) -> float:
+        """Records the whole run and lets the metrics file catch up."""
+        total = time.perf_counter() - self._started
+        self.metrics.observe("rerun_seconds", total)
+        self.metrics.flush()
+        return total
+
+
+class _NullRerunTimer:
+    """Stand-in for RerunTimer when metrics are disabled."""
+
+    def lap(self, section: str) -> float:
+        return 0.0
+
+    def finish(self) -> float:
+        return 0.0
+
+
+_NULL_RERUN = _NullRerunTimer()
+
+
+class Metrics:
+    """Thread-safe counters and histograms with Prometheus text export."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        path=None,
+        write_interval: float = DEFAULT_WRITE_INTERVAL,
+        buckets=DEFAULT_BUCKETS,
+    ):
+        """
+        Args:
+            enabled (bool): When False every hook is a no-op.
+            path (str | Path | None): File rewritten with the current metrics by flush().
+            write_interval (float): Minimum seconds between file writes; flush(force=True) ignores it.
+            buckets (tuple): Histogram upper bounds in seconds.
+        """
+        self.enabled = enabled
+        self.path = Path(path) if path else None
+        self.write_interval = write_interval
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._server = None
+
+    # --- Hooks ---
+
+    def rerun(self):
+        """Timer for the current script run (a shared no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_RERUN
+        return RerunTimer(self)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Adds `amount` to counter `name` with `labels`."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        """Records `value` in histogram `name` with `labels`."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            histogram[0][index] += 1
+            histogram[1] += value
+
+    def add_collector(self, name: str, kind: str, help_text: str, collect):
+        """
+        Registers a metric whose samples are read at export time, e.g. cache statistics.
+
+        Args:
+            name (str): Metric name without the namespace prefix.
+            kind (str): "counter" or "gauge".
+            help_text (str): HELP line.
+            collect (callable): Returns a list of (labels dict, value) samples.
+        """
+        self._collectors.append((name, kind, help_text, collect))
+
+    # --- Export ---
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(counts), total) for key, (counts, total) in self._histograms.items()}
+
+        families = {}
+        for (name, labels), value in counters.items():
+            families.setdefault(name, []).append(f"{NAMESPACE}_{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), (counts, total) in histograms.items():
+            lines = families.setdefault(name, [])
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{NAMESPACE}_{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+            lines.append(f"{NAMESPACE}_{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{NAMESPACE}_{name}_count{_labels(labels)} {cumulative}")
+
+        out = []
+        for name, lines in families.items():
+            kind, help_text = METRICS.get(name, ("untyped", name))
+            out += [f"# HELP {NAMESPACE}_{name} {help_text}", f"# TYPE {NAMESPACE}_{name} {kind}", *lines]
+        for name, kind, help_text, collect in self._collectors:
+            try:
+                samples = collect()
+            except Exception:
+                LOGGER.exception("Metrics collector %s failed", name)
+                continue
+            out += [f"# HELP {NAMESPACE}_{name} {help_text}", f"# TYPE {NAMESPACE}_{name} {kind}"]
+            out += [
+                f"{NAMESPACE}_{name}{_labels(sorted(labels.items()))} {_number(value)}" for labels, value in samples
+            ]
+        return "\n".join(out) + "\n"
+
+    def flush(self, force: bool = False):
+        """Atomically rewrites the metrics file, at most once per write_interval unless forced."""
+        if not self.enabled or self.path is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_write < self.write_interval:
+                return
+            self._last_write = now
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.path.parent, suffix=".tmp", delete=False, encoding="utf-8"
+            ) as tmp:
+                tmp.write(self.render())
+            os.replace(tmp.name, self.path)
+        except OSError as exc:
+            LOGGER.warning("Could not write metrics to %s: %s", self.path, exc)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Serves GET /metrics from a daemon thread.
+
+        Returns:
+            ThreadingHTTPServer | None: The server, or None if the port is taken (e.g. by another app process).
+        """
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as exc:
+            LOGGER.warning("Metrics endpoint not started on %s:%d: %s", host, port, exc)
+            return None
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="sensyva-metrics", daemon=True).start()
+        return self._server
@@ -0,0 +1,328 @@
+"""Bounded-memory portfolio audits over CSV/Parquet site registers.
+
+A register has one row per site with the three engine input columns
+(see ``INPUT_COLUMNS``), an ``industry`` column matching the
+``INDUSTRY_CONTEXT`` keys, an optional ``site`` identifier and an optional
+``asset_class``. Each site is scored with its industry's (and asset
+class's) reduction coefficients from ``sensyva_audit.coefficients``. Files are read
+in fixed-size chunks restricted to those columns, each chunk is scored with
+the vectorized engine, and only running totals plus a capped preview stay in
+memory. Full per-site results are appended to a file on disk as they are
+produced: CSV by default, or Parquet, Arrow IPC or XLSX by the results
+path's suffix (see ``sensyva_audit.export``).
+
+Results written to the default location go to one managed directory
+(``RESULTS_DIR``) that keeps the newest ``MAX_RESULT_FILES`` results files
+and drops the oldest, together with any exports made beside them.
+"""
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from sensyva_audit.engine import INPUT_COLUMNS, OUTPUT_COLUMNS, calculate_impact_batch
+from sensyva_audit.industry import INDUSTRY_CONTEXT
+
+SITE_COLUMN = "site"
+INDUSTRY_COLUMN = "industry"
+ASSET_CLASS_COLUMN = "asset_class"
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_PREVIEW_ROWS = 1_000
+RESULTS_DIR = Path(tempfile.gettempdir()) / "sensyva-portfolio"
+RESULTS_PREFIX = "sensyva-portfolio-"
+MAX_RESULT_FILES = 16
+
+# Packaged coefficient table, loaded on first use (see default_coefficients).
+_DEFAULT_COEFFICIENTS = None
+
+# Columns rolled up into the portfolio and per-industry totals.
+SUMMED_COLUMNS = ("annual_maintenance_budget_crores", *OUTPUT_COLUMNS)
+
+
+@dataclass
+class PortfolioAudit:
+    """Outcome of a portfolio audit: running totals, a capped preview and the on-disk results file."""
+
+    sites_scored: int = 0
+    sites_skipped: int = 0
+    unknown_industry_sites: int = 0
+    coefficients_version: str = None
+    totals: dict = field(default_factory=lambda: dict.fromkeys(SUMMED_COLUMNS, 0.0))
+    industry_totals: dict = field(default_factory=dict)
+    preview: object = None
+    results_path: Path = None
+    managed: bool = False
+
+    def discard(self):
+        """Deletes the results file and its exports if they live in the managed RESULTS_DIR."""
+        if self.managed:
+            remove_results(self.results_path)
+
+    def industry_table(self):
+        """Per-industry site counts and savings as a DataFrame."""
+        import pandas as pd
+
+        table = pd.DataFrame.from_dict(self.industry_totals, orient="index")
+        table.index.name = INDUSTRY_COLUMN
+        return table.sort_values("total_potential_annual_savings_crores", ascending=False)
+
+
+def _source_name(source) -> str:
+    return str(getattr(source, "name", source))
+
+
+def _source_size(source) -> int:
+    if hasattr(source, "size"):
+        return int(source.size)
+    if hasattr(source, "seek"):
+        position = source.tell()
+        size = source.seek(0, 2)
+        source.seek(position)
+        return int(size)
+    return Path(source).stat().st_size
+
+
+def iter_table_chunks(source, wanted, chunk_rows: int = DEFAULT_CHUNK_ROWS, dtype=None):
+    """
+    Yields (DataFrame chunk, fraction of the source consumed) from a CSV or Parquet file.
+
+    Only the `wanted` columns that the file actually has are parsed.
+
+    Args:
+        source: Path or binary file-like object (e.g. a Streamlit UploadedFile); the format is taken from its name.
+        wanted (set | None): Column names to read; None reads every column.
+        chunk_rows (int): Maximum number of rows held in memory at once.
+        dtype (dict): Optional CSV dtypes by column name (Parquet files carry their own types).
+    """
+    import pandas as pd
+
+    name = _source_name(source).lower()
+
+    if name.endswith(".parquet") or name.endswith(".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet uploads require pyarrow (pip install pyarrow).") from exc
+        # Pre-buffering keeps every row group's column chunks alive until the file closes,
+        # so memory would grow with the file instead of staying at one batch.
+        parquet = pq.ParquetFile(source, pre_buffer=False)
+        columns = None if wanted is None else [column for column in parquet.schema_arrow.names if column in wanted]
+        total_rows = max(parquet.metadata.num_rows, 1)
+        rows_read = 0
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+            rows_read += batch.num_rows
+            yield batch.to_pandas(), rows_read / total_rows
+        return
+
+    if not name.endswith(".csv"):
+        raise ValueError(f"Unsupported file format for {_source_name(source)!r}; use a .csv or .parquet file.")
+
+    total_bytes = max(_source_size(source), 1)
+    handle = open(source, "rb") if isinstance(source, (str, Path)) else source
+    handle.seek(0)
+    try:
+        usecols = None if wanted is None else (lambda column: column in wanted)
+        reader = pd.read_csv(handle, usecols=usecols, dtype=dtype, chunksize=chunk_rows)
+        with reader:
+            for chunk in reader:
+                # The parser reads ahead in blocks, so this runs slightly ahead of the rows processed.
+                yield chunk, min(handle.tell() / total_bytes, 1.0)
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def remove_results(results_path):
+    """Deletes a results file and every export written beside it (same name, other suffix)."""
+    results_path = Path(results_path)
+    for path in results_path.parent.glob(f"{results_path.stem}.*"):
+        path.unlink(missing_ok=True)
+
+
+def prune_results(directory=RESULTS_DIR, keep: int = MAX_RESULT_FILES):
+    """Keeps the `keep` newest results files in `directory`, removing older ones and their exports."""
+    results = []
+    for path in Path(directory).glob(f"{RESULTS_PREFIX}*.csv"):
+        try:
+            results.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    results.sort(reverse=True)
+    for _, path in results[keep:]:
+        remove_results(path)
+
+
+def canonical_industries(industries, names):
+    """
+    Maps industry names onto the spelling used in `names`, ignoring case; unmatched names are kept as given.
+
+    Args:
+        industries (array-like): Industry name per site.
+        names (iterable): Canonical industry names.
+
+    Returns:
+        np.ndarray: Industry name per site, canonical where one matches.
+    """
+    import pandas as pd
+
+    industries = np.asarray(industries, dtype=object)
+    by_folded = {name.casefold(): name for name in names}
+    # Only the chunk's few distinct spellings are case-folded.
+    labels, uniques = pd.factorize(industries)
+    canonical = np.array([by_folded.get(name.casefold(), name) for name in uniques], dtype=object)
+    return canonical[labels] if len(canonical) else industries
+
+
+def default_coefficients():
+    """The packaged coefficient table, compiled once per process."""
+    global _DEFAULT_COEFFICIENTS
+    if _DEFAULT_COEFFICIENTS is None:
+        from sensyva_audit.coefficients import load_coefficients
+
+        _DEFAULT_COEFFICIENTS = load_coefficients()
+    return _DEFAULT_COEFFICIENTS
+
+
+def iter_site_chunks(source, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yields (DataFrame chunk, fraction of the source consumed) from a CSV or Parquet register.
+
+    Only the engine input, industry, asset class and site columns are parsed; see iter_table_chunks.
+    """
+    return iter_table_chunks(
+        source,
+        set(INPUT_COLUMNS) | {INDUSTRY_COLUMN, ASSET_CLASS_COLUMN, SITE_COLUMN},
+        chunk_rows,
+        dtype={INDUSTRY_COLUMN: "string", ASSET_CLASS_COLUMN: "string", SITE_COLUMN: "string"},
+    )
+
+
+def score_site_chunk(chunk, coefficients=None):
+    """
+    Scores one chunk of a site register.
+
+    Rows with missing or non-positive inputs are dropped, mirroring the single-site form's validation.
+    Industry names are matched without regard to case; industries found in neither INDUSTRY_CONTEXT nor the coefficient table are reported as "Other".
+
+    Args:
+        chunk (pd.DataFrame): Register rows.
+        coefficients (CoefficientTable): Reduction coefficients; the packaged table by default.
+
+    Returns:
+        tuple: (scored DataFrame, rows skipped, rows with an unknown industry)
+    """
+    import pandas as pd
+
+    missing = [column for column in INPUT_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Register is missing required column(s): {', '.join(missing)}")
+
+    inputs = [pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=np.float64) for column in INPUT_COLUMNS]
+    valid = np.logical_and.reduce([np.isfinite(values) & (values > 0) for values in inputs])
+
+    if INDUSTRY_COLUMN in chunk.columns:
+        industries = chunk[INDUSTRY_COLUMN].fillna("").str.strip().to_numpy(dtype=object)[valid]
+    else:
+        industries = np.full(int(valid.sum()), "Other", dtype=object)
+    asset_classes = None
+    if ASSET_CLASS_COLUMN in chunk.columns:
+        asset_classes = chunk[ASSET_CLASS_COLUMN].fillna("").str.strip().to_numpy(dtype=object)[valid]
+
+    coefficients = coefficients or default_coefficients()
+    industries = canonical_industries(industries, (*coefficients.industries, *INDUSTRY_CONTEXT))
+
+    # One gather per coefficient for the whole chunk, however many industries it mixes.
+    reductions = coefficients.lookup(industries, asset_classes)
+    scored = pd.DataFrame(
+        calculate_impact_batch(
+            *(values[valid] for values in inputs),
+            maintenance_reduction=reductions["maintenance_reduction"],
+            downtime_reduction=reductions["downtime_reduction"],
+        )
+    )
+    if SITE_COLUMN in chunk.columns:
+        scored.insert(0, SITE_COLUMN, chunk[SITE_COLUMN].to_numpy()[valid])
+
+    known = reductions["known_industry"] | np.isin(industries, list(INDUSTRY_CONTEXT))
+    industries[~known] = "Other"
+    position = 1 if SITE_COLUMN in scored.columns else 0
+    scored.insert(position, INDUSTRY_COLUMN, industries)
+    if asset_classes is not None:
+        scored.insert(position + 1, ASSET_CLASS_COLUMN, asset_classes)
+
+    return scored, int((~valid).sum()), int((~known).sum())
+
+
+def run_portfolio_audit(
+    source,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    preview_rows: int = DEFAULT_PREVIEW_ROWS,
+    on_progress=None,
+    results_path=None,
+    coefficients=None,
+):
+    """
+    Streams a site register through the engine chunk by chunk.
+
+    Args:
+        source: Path or binary file-like object holding a CSV or Parquet register.
+        chunk_rows (int): Rows parsed and scored per chunk; bounds peak memory.
+        preview_rows (int): Number of per-site result rows kept in memory for display.
+        on_progress (callable): Optional callback taking (fraction complete, sites scored so far).
+        results_path (str | Path): Where to write the full per-site results, in the format its suffix names
+            (.csv, .parquet, .arrow or .xlsx); by default a CSV in RESULTS_DIR, which is pruned to
+            MAX_RESULT_FILES results files (oldest first) before each run.
+        coefficients (CoefficientTable): Reduction coefficients; the packaged table by default.
+
+    Returns:
+        PortfolioAudit: Portfolio totals, per-industry totals, a preview and the results file path.
+    """
+    import pandas as pd
+
+    from sensyva_audit.export import open_result_writer
+
+    managed = results_path is None
+    if managed:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        # Leaves room for this run's file within the cap.
+        prune_results(RESULTS_DIR, MAX_RESULT_FILES - 1)
+        with tempfile.NamedTemporaryFile(prefix=RESULTS_PREFIX, suffix=".csv", dir=RESULTS_DIR, delete=False) as tmp:
+            results_path = tmp.name
+    coefficients = coefficients or default_coefficients()
+    audit = PortfolioAudit(results_path=Path(results_path), coefficients_version=coefficients.key, managed=managed)
+    preview_chunks = []
+    preview_count = 0
+
+    try:
+        with open_result_writer(audit.results_path) as results_writer:
+            for chunk, fraction in iter_site_chunks(source, chunk_rows):
+                scored, skipped, unknown = score_site_chunk(chunk, coefficients)
+                audit.sites_scored += len(scored)
+                audit.sites_skipped += skipped
+                audit.unknown_industry_sites += unknown
+
+                for column in audit.totals:
+                    audit.totals[column] += float(scored[column].sum())
+                grouped = scored.groupby(INDUSTRY_COLUMN)[list(SUMMED_COLUMNS)].sum()
+                counts = scored.groupby(INDUSTRY_COLUMN).size()
+                for industry, row in grouped.iterrows():
+                    entry = audit.industry_totals.setdefault(industry, dict.fromkeys(["sites", *SUMMED_COLUMNS], 0))
+                    entry["sites"] += int(counts[industry])
+                    for column in SUMMED_COLUMNS:
+                        entry[column] += float(row[column])
+
+                results_writer.write(scored)
+                if preview_count < preview_rows:
+                    preview_chunks.append(scored.head(preview_rows - preview_count))
+                    preview_count += len(preview_chunks[-1])
+
+                if on_progress is not None:
+                    on_progress(fraction, audit.sites_scored)
+    except BaseException:
+        # A half-written file in the managed directory would never be read again.
+        audit.discard()
+        raise
+
+    audit.preview = pd.concat(preview_chunks, ignore_index=True) if preview_chunks else pd.DataFrame()
+    return audit
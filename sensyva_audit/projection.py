@@ -0,0 +1,157 @@
+"""Multi-year cash-flow, NPV and payback projections for one site or a whole portfolio.
+
+``project_cash_flows`` turns steady-state annual savings (the engine's
+``total_potential_annual_savings_crores``) into a sites x years cash-flow
+array in a single NumPy pass:
+
+* savings ramp up after deployment along ``ramp_curve`` ("s-curve",
+  "linear" or "immediate") and reach 100% after ``ramp_months``; a year's
+  realised share is the mean of its twelve monthly values;
+* realised savings can grow each year by ``savings_escalation``;
+* hardware is paid up front (year 0) and the subscription every year;
+* net cash flows are discounted at ``discount_rate`` (end-of-year
+  convention) into an NPV;
+* the payback month is the first month in which cumulative undiscounted
+  cash flow turns non-negative. Monthly net flow never falls within a year,
+  so only each site's payback year is expanded to months.
+
+Site-level arguments broadcast against each other, so a portfolio of any
+size is one call; the ramp is shared by every site. ``project_site`` is the
+scalar wrapper the Streamlit app uses.
+"""
+RAMP_CURVES = ("s-curve", "linear", "immediate")
+DEFAULT_YEARS = 5
+DEFAULT_DISCOUNT_RATE = 0.12
+DEFAULT_RAMP_MONTHS = 12
+DEFAULT_RAMP_CURVE = "s-curve"
+
+
+def ramp_shares(years: int, ramp_months: float = DEFAULT_RAMP_MONTHS, ramp_curve: str = DEFAULT_RAMP_CURVE):
+    """
+    Share of steady-state savings realised in each month and each year after deployment.
+
+    Returns:
+        tuple: (monthly shares, shape (years, 12); yearly shares, shape (years,))
+    """
+    import numpy as np
+
+    if ramp_curve not in RAMP_CURVES:
+        raise ValueError(f"Unknown ramp curve {ramp_curve!r}; use one of {', '.join(RAMP_CURVES)}.")
+    months = np.arange(years * 12, dtype=np.float64)
+    if ramp_curve == "immediate" or ramp_months <= 0:
+        monthly = np.ones_like(months)
+    else:
+        # Evaluated at each month's midpoint.
+        progress = np.clip((months + 0.5) / ramp_months, 0.0, 1.0)
+        monthly = progress if ramp_curve == "linear" else progress * progress * (3.0 - 2.0 * progress)
+    monthly = monthly.reshape(years, 12)
+    return monthly, monthly.mean(axis=1)
+
+
+def project_cash_flows(
+    annual_savings_crores,
+    hardware_cost_crores=0.0,
+    subscription_crores=0.0,
+    years: int = DEFAULT_YEARS,
+    discount_rate=DEFAULT_DISCOUNT_RATE,
+    ramp_months: float = DEFAULT_RAMP_MONTHS,
+    ramp_curve: str = DEFAULT_RAMP_CURVE,
+    savings_escalation=0.0,
+):
+    """
+    Projects yearly cash flows, NPV, ROI and payback month for many sites in one vectorized pass.
+
+    Args:
+        annual_savings_crores (array-like): Steady-state annual savings per site in Crores INR.
+        hardware_cost_crores (float | array-like): Up-front edge hardware and deployment cost per site.
+        subscription_crores (float | array-like): Subscription cost per site per year.
+        years (int): Projection horizon in years.
+        discount_rate (float | array-like): Annual discount rate (0.12 = 12%).
+        ramp_months (float): Months until savings reach steady state; shared by every site.
+        ramp_curve (str): "s-curve", "linear" or "immediate".
+        savings_escalation (float | array-like): Yearly growth of realised savings (0.05 = 5%).
+
+    Returns:
+        dict: "years", "ramp" (yearly share), (sites, years) arrays "savings_crores",
+        "net_cash_flow_crores", "cumulative_cash_flow_crores" and "discounted_cash_flow_crores",
+        and per-site "upfront_crores", "npv_crores", "roi" and "payback_month" (NaN if not within the horizon).
+    """
+    import numpy as np
+
+    if years < 1:
+        raise ValueError("The projection needs at least one year.")
+    savings, hardware, subscription, rate, escalation = (
+        column[:, None]
+        for column in np.broadcast_arrays(
+            np.atleast_1d(np.asarray(annual_savings_crores, dtype=np.float64)),
+            np.atleast_1d(np.asarray(hardware_cost_crores, dtype=np.float64)),
+            np.atleast_1d(np.asarray(subscription_crores, dtype=np.float64)),
+            np.atleast_1d(np.asarray(discount_rate, dtype=np.float64)),
+            np.atleast_1d(np.asarray(savings_escalation, dtype=np.float64)),
+        )
+    )
+    monthly_ramp, yearly_ramp = ramp_shares(years, ramp_months, ramp_curve)
+    offsets = np.arange(years, dtype=np.float64)
+    growth = (1.0 + escalation) ** offsets
+
+    realised = savings * growth * yearly_ramp
+    net = realised - subscription
+    cumulative = np.cumsum(net, axis=1) - hardware
+    discounted = net / (1.0 + rate) ** (offsets + 1.0)
+    npv = discounted.sum(axis=1) - hardware[:, 0]
+    total_cost = hardware[:, 0] + subscription[:, 0] * years
+    gain = cumulative[:, -1]
+    roi = np.divide(gain, total_cost, out=np.full_like(gain, np.nan), where=total_cost > 0)
+
+    # Payback: first year whose closing cumulative is non-negative, then the month within it.
+    paid = cumulative >= 0.0
+    ever = paid.any(axis=1)
+    year = np.where(ever, paid.argmax(axis=1), 0)
+    rows = np.arange(len(year))
+    opening = np.where(year > 0, cumulative[rows, year - 1], -hardware[:, 0])
+    month_net = (savings[:, 0, None] * growth[rows, year][:, None] * monthly_ramp[year] - subscription) / 12.0
+    within = (opening[:, None] + np.cumsum(month_net, axis=1)) >= 0.0
+    payback = np.where(ever, year * 12 + within.argmax(axis=1) + 1, np.nan)
+    # Nothing to recover and the first month already nets positive: paid back from the start. A site with no
+    # outlay whose costs run ahead of its ramping savings still has to earn the shortfall back (or never does).
+    first_month = (savings[:, 0] * monthly_ramp[0, 0] - subscription[:, 0]) / 12.0
+    payback = np.where((hardware[:, 0] <= 0.0) & (first_month >= 0.0), 0.0, payback)
+
+    return {
+        "years": np.arange(1, years + 1),
+        "ramp": yearly_ramp,
+        "savings_crores": realised,
+        "upfront_crores": hardware[:, 0],
+        "net_cash_flow_crores": net,
+        "cumulative_cash_flow_crores": cumulative,
+        "discounted_cash_flow_crores": discounted,
+        "npv_crores": npv,
+        "roi": roi,
+        "payback_month": payback,
+    }
+
+
+def project_site(annual_savings_crores: float, hardware_cost_crores: float = 0.0, subscription_crores: float = 0.0, **kwargs):
+    """
+    Projection for a single site, as plain floats and lists.
+
+    Thin wrapper over project_cash_flows; see it for argument details.
+
+    Returns:
+        dict: "years" and per-year lists plus scalar "upfront_crores", "npv_crores", "roi" and
+        "payback_month" (None if the site does not pay back within the horizon).
+    """
+    import math
+
+    projection = project_cash_flows(annual_savings_crores, hardware_cost_crores, subscription_crores, **kwargs)
+    site = {}
+    for name, values in projection.items():
+        if name in ("years", "ramp"):
+            site[name] = values.tolist()
+        elif values.ndim == 2:
+            site[name] = values[0].tolist()
+        else:
+            site[name] = float(values[0])
+    site["payback_month"] = None if math.isnan(site["payback_month"]) else int(site["payback_month"])
+    site["horizon_years"] = len(site["years"])
+    return site
@@ -0,0 +1,160 @@
+"""Precompiled CSS and report narrative for the Streamlit UI.
+
+Everything static about the rendered page is built once, at import, instead
+of on every Streamlit rerun:
+
+* The stylesheets in ``styles/`` are minified (comments and redundant
+  whitespace stripped, exact duplicate rules dropped) into ready-to-emit
+  ``<style>`` blocks. ``app.css`` already includes the audit form's submit
+  button rules, so the page sends one global block rather than two.
+* The result-box narrative and the forecast intro are compiled per industry
+  from ``INDUSTRY_CONTEXT``. The industry copy is baked in and the markup is
+  minified, leaving a ``str.format`` template with only the numeric fields.
+
+Because the compiled strings are byte-identical across reruns, Streamlit's
+forward-message cache (see ``.streamlit/config.toml``) can send each element
+to a browser once and only a short hash reference afterwards.
+"""
+import re
+from pathlib import Path
+from string import Template
+
+from sensyva_audit.engine import DATA_GAP_PERCENTAGE
+from sensyva_audit.formatting import format_crores
+from sensyva_audit.industry import INDUSTRY_CONTEXT
+from sensyva_audit.scoring import latency_sentence, load_latency_claim
+
+STYLES_DIR = Path(__file__).with_name("styles")
+
+# --- CSS ---
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+
+def minify_css(css: str) -> str:
+    """
+    Minifies a flat stylesheet (plain rules, no @media/@supports nesting).
+
+    Comments and insignificant whitespace are removed and exact duplicate rules
+    collapse to their last occurrence, which leaves the cascade unchanged.
+
+    Args:
+        css (str): Stylesheet source.
+
+    Returns:
+        str: Equivalent minified stylesheet.
+    """
+    rules = []
+    for selector, body in _CSS_RULE.findall(_CSS_COMMENT.sub("", css)):
+        selector = re.sub(r"\s*([,>+~])\s*", r"\1", " ".join(selector.split()))
+        declarations = []
+        for declaration in body.split(";"):
+            name, _, value = declaration.partition(":")
+            if value.strip():
+                value = re.sub(r"\s*,\s*", ",", " ".join(value.split()))
+                declarations.append(f"{name.strip()}:{value.replace(' !important', '!important')}")
+        if declarations:
+            rules.append(f"{selector}{{{';'.join(declarations)}}}")
+    deduplicated = list(reversed(dict.fromkeys(reversed(rules))))
+    return "".join(deduplicated)
+
+
+def compile_stylesheet(*names: str) -> str:
+    """Reads stylesheets from ``styles/`` in order and returns one minified ``<style>`` block."""
+    css = "\n".join((STYLES_DIR / name).read_text(encoding="utf-8") for name in names)
+    return f"<style>{minify_css(css)}</style>"
+
+
+APP_STYLE = compile_stylesheet("app.css")
+LEAD_FORM_STYLE = compile_stylesheet("lead_form.css")
+
+# --- Narrative templates ---
+
+# Cites the recorded reference-scorer latency (see benchmarks/bench_scoring.py) next to the 10 ms claim.
+LATENCY_NOTE = latency_sentence(load_latency_claim())
+
+_INTRO = """
+<p style='color: #e3f2fd;'>
+Based on Sensyva’s edge deployments in $industry_lower environments, here’s the risk you can pull back into revenue.
+</p>
+"""
+
+_NARRATIVE = """
+<div class="result-box">
+    <h4 style="color: #48bb78; margin-bottom: 10px;">The {data_gap:.0f}% Data Gap: A Hidden Cost in $industry</h4>
+    <p style="font-size: 1em;">
+    Your current losses of <strong>{total_savings}</strong> are tied to the
+    <strong>{data_gap:.0f}% of {data_gap_subject}</strong> that never gets analyzed in time. This blind spot drives:</p>
+    <ul>
+        <li><strong style='color: #ccc;'>Late Detection:</strong> Waiting for data to reach the cloud means failures are detected too late, resulting in {downtime_hours:.0f} hours/year of hard downtime.</li>
+        <li><strong style='color: #ccc;'>Incomplete Picture:</strong> Traditional monitoring and {maintenance_budget} in spend still miss cross-sensor context.</li>
+        <li><strong style='color: #ccc;'>Industry Reality:</strong> $savings_hook</li>
+    </ul>
+    <br>
+    <h4 style="color: #48bb78; margin-bottom: 10px;">Sensyva AI: The Path to Real-Time Intelligence</h4>
+    <p style="font-size: 1em;">Sensyva’s hardware-agnostic Edge AI framework fuses and scores sensor streams <em>in 10ms</em>, so your teams act before faults cascade.</p>
+    <ul>
+        <li><strong style='color: #ccc;'>10 Millisecond Decisions:</strong> We analyze vibration, thermal, acoustic, and power data together to surface actionable alerts.$latency_note</li>
+        <li><strong style='color: #ccc;'>Proven Reliability:</strong> Clients routinely see maintenance savings of up to {maintenance_reduction_percentage}% and near-zero unplanned downtime.</li>
+    </ul>
+    <p style="font-size: 0.95em; margin-top: 16px; color: #bbdefb;">
+        📊 $hero_stat
+    </p>
+</div>
+"""
+
+
+def minify_html(html: str) -> str:
+    """Drops line breaks and indentation at tag boundaries and collapses other whitespace runs to one space."""
+    html = re.sub(r">\s*\n\s*", ">", html.strip())
+    # Text followed by a line break keeps a single space before an opening tag, not before a closing one.
+    html = re.sub(r"\s*\n\s*</", "</", html)
+    return " ".join(html.split())
+
+
+def _compile(template: str, industry: str) -> str:
+    context = INDUSTRY_CONTEXT[industry]
+    # Braces in the industry copy must survive the later str.format call.
+    copy = {
+        "industry": industry,
+        "industry_lower": industry.lower(),
+        "savings_hook": context["savings_hook"],
+        "hero_stat": context["hero_stat"],
+        "latency_note": f" {LATENCY_NOTE}" if LATENCY_NOTE else "",
+    }
+    escaped = {name: text.replace("{", "{{").replace("}", "}}") for name, text in copy.items()}
+    return minify_html(Template(template).substitute(escaped))
+
+
+# Forecast intros have no numeric fields, so they are final strings.
+INTROS = {industry: _compile(_INTRO, industry).format() for industry in INDUSTRY_CONTEXT}
+NARRATIVES = {industry: _compile(_NARRATIVE, industry) for industry in INDUSTRY_CONTEXT}
+
+
+def render_intro(industry: str) -> str:
+    """Forecast intro paragraph for `industry` (unknown industries use the "Other" copy)."""
+    return INTROS.get(industry, INTROS["Other"])
+
+
+def render_narrative(industry: str, results: dict) -> str:
+    """
+    Fills the precompiled result-box narrative for `industry` with the audit's numbers.
+
+    Args:
+        industry (str): Selected industry; unknown industries use the "Other" copy.
+        results (dict): Output of calculate_impact, plus "data_gap_percentage" when the site's gap was measured.
+
+    Returns:
+        str: Minified HTML for ``st.markdown(..., unsafe_allow_html=True)``.
+    """
+    template = NARRATIVES.get(industry, NARRATIVES["Other"])
+    measured = "data_gap_percentage" in results
+    return template.format(
+        data_gap=results.get("data_gap_percentage", DATA_GAP_PERCENTAGE),
+        data_gap_subject="your own recorded sensor data" if measured else "industrial sensor data",
+        total_savings=format_crores(results["total_potential_annual_savings_crores"]),
+        downtime_hours=results["unplanned_downtime_hours"],
+        maintenance_budget=format_crores(results["annual_maintenance_budget_crores"]),
+        maintenance_reduction_percentage=results["maintenance_reduction_percentage"],
+    )
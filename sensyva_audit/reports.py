@@ -0,0 +1,307 @@
+"""Background PDF report rendering with a content-addressed disk cache.
+
+``render_report_pdf`` builds the one-page audit PDF from a results dict and
+the selected industry's ``INDUSTRY_CONTEXT``. It is a pure function with a
+small, dependency-free PDF writer, so it can run in a worker process.
+
+``ReportRenderer`` hands renders to a process pool (never the Streamlit
+script thread) and stores the bytes in a ``PDFReportCache``: files named by
+a hash of the normalized inputs, narrative and ``TEMPLATE_VERSION``, capped
+at a total size with least-recently-used eviction. Identical audits return
+straight from disk, concurrent requests for the same report share a single
+render, and both objects expose hit/miss/render-time statistics.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import textwrap
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from sensyva_audit.engine import DATA_GAP_PERCENTAGE, INPUT_COLUMNS, OUTPUT_COLUMNS
+from sensyva_audit.formatting import format_crores
+from sensyva_audit.industry import get_industry_context
+from sensyva_audit.scoring import latency_sentence, load_latency_claim
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump whenever the PDF layout or copy changes so cached reports are not reused.
+TEMPLATE_VERSION = 3
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_WORKERS = 2
+KEY_DECIMALS = 6
+LATENCY_NOTE = latency_sentence(load_latency_claim())
+
+# --- Minimal PDF writer (standard Helvetica, WinAnsi text) ---
+
+_PAGE_WIDTH, _PAGE_HEIGHT, _MARGIN = 595, 842, 56  # A4 in points
+_PDF_TEXT = str.maketrans({"₹": "Rs. ", "’": "'", "‘": "'", "“": '"', "”": '"', "—": "-", "–": "-", "…": "...", "•": "-"})
+
+
+def _pdf_text(text: str) -> str:
+    text = text.translate(_PDF_TEXT).encode("cp1252", "replace").decode("cp1252")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(lines) -> bytes:
+    """
+    Lays out a single-page PDF.
+
+    Args:
+        lines (list): (text, font size, bold) tuples, top to bottom; long text is wrapped, "" adds a gap.
+
+    Returns:
+        bytes: A complete PDF document. Output is deterministic for identical input.
+    """
+    y = _PAGE_HEIGHT - _MARGIN
+    commands = []
+    for text, size, bold in lines:
+        if not text:
+            y -= size
+            continue
+        width_chars = int((_PAGE_WIDTH - 2 * _MARGIN) / (size * 0.5))
+        for wrapped in textwrap.wrap(text, width_chars) or [""]:
+            y -= size * 1.35
+            commands.append(f"BT /{'F2' if bold else 'F1'} {size} Tf {_MARGIN} {y:.1f} Td ({_pdf_text(wrapped)}) Tj ET")
+    stream = "\n".join(commands).encode("cp1252")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PAGE_WIDTH} {_PAGE_HEIGHT}] "
+        f"/Resources << /Font << /F1 4 0 R /F2 5 0 R >> >> /Contents 6 0 R >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+# --- Report template ---
+
+def render_report_pdf(results: dict, industry: str) -> tuple:
+    """
+    Renders the one-page audit report. Runs inside a worker process.
+
+    Returns:
+        tuple: (PDF bytes, render time in seconds)
+    """
+    start = time.perf_counter()
+    context = get_industry_context(industry)
+    data_gap = results.get("data_gap_percentage")
+    if data_gap is None:
+        gap_title = f"The {DATA_GAP_PERCENTAGE}% Data Gap in {industry}"
+        gap_text = f"{DATA_GAP_PERCENTAGE}% of industrial sensor data never gets analyzed in time."
+    else:
+        gap_title = f"Your Measured Data Gap: {data_gap:.0f}%"
+        gap_text = f"{data_gap:.1f}% of the sensor data your site recorded (or should have) never gets analyzed in time."
+    lines = [
+        ("Sensyva AI | 95% Data Gap Audit Report", 18, True),
+        (f"Industry: {industry}", 11, False),
+        ("", 10, False),
+        ("Your Operational Baseline", 13, True),
+        (f"Annual Maintenance Budget: {format_crores(results['annual_maintenance_budget_crores'])}", 11, False),
+        (f"Unplanned Downtime: {results['unplanned_downtime_hours']:.0f} hours/year", 11, False),
+        (f"Downtime Cost per Hour: ₹{results['revenue_loss_per_hour_lakhs']:.2f} Lakhs", 11, False),
+        (f"Current Downtime Loss: {format_crores(results['estimated_total_downtime_cost_crores'])}", 11, False),
+        ("", 10, False),
+        ("Quantified Impact Forecast", 13, True),
+        (
+            f"Maintenance Cost Reduction (up to {results['maintenance_reduction_percentage']}%): "
+            f"{format_crores(results['potential_maintenance_savings_crores'])}",
+            11,
+            False,
+        ),
+        (
+            f"Downtime Risk Reduction (up to {results['downtime_reduction_percentage']}%): "
+            f"{format_crores(results['potential_downtime_savings_crores'])}",
+            11,
+            False,
+        ),
+        (f"Potential Total Annual Savings: {format_crores(results['total_potential_annual_savings_crores'])}", 12, True),
+        ("", 10, False),
+        (gap_title, 13, True),
+        (
+            f"{gap_text} Waiting for data to reach the cloud means "
+            "failures are detected too late, and traditional monitoring still misses cross-sensor context.",
+            10,
+            False,
+        ),
+        (f"Industry reality: {context['savings_hook']}", 10, False),
+        (context["hero_stat"], 10, False),
+        ("", 10, False),
+        ("Sensyva AI: The Path to Real-Time Intelligence", 13, True),
+        (
+            "Sensyva's hardware-agnostic Edge AI framework fuses and scores vibration, thermal, acoustic and power "
+            "streams in 10 ms, so your teams act before faults cascade.",
+            10,
+            False,
+        ),
+        *([(LATENCY_NOTE, 10, False)] if LATENCY_NOTE else []),
+        ("", 10, False),
+        ("Next Step: Share your operations context so we can model the first 90 days with Sensyva Edge AI.", 10, True),
+    ]
+    pdf = build_pdf(lines)
+    return pdf, time.perf_counter() - start
+
+
+def report_key(results: dict, industry: str) -> str:
+    """
+    Content address of a report: hash of the rounded inputs and figures, narrative context and template version.
+
+    The figures and reduction percentages are part of the key because they also depend on the coefficients
+    the inputs were scored with, which can change (per industry, or on a coefficient file reload) while the
+    inputs stay the same.
+    """
+    payload = {
+        "template": TEMPLATE_VERSION,
+        "industry": industry,
+        "context": get_industry_context(industry),
+        "latency": LATENCY_NOTE,
+        "inputs": [round(float(results[column]), KEY_DECIMALS) for column in INPUT_COLUMNS],
+        "outputs": [round(float(results[column]), KEY_DECIMALS) for column in OUTPUT_COLUMNS],
+        "reductions": [results["maintenance_reduction_percentage"], results["downtime_reduction_percentage"]],
+        "data_gap": round(float(results["data_gap_percentage"]), 1) if "data_gap_percentage" in results else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# --- Disk cache ---
+
+class PDFReportCache:
+    """Size-capped, content-addressed directory of rendered PDFs with LRU eviction by access time."""
+
+    def __init__(self, directory, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def get(self, key: str):
+        """Cached PDF bytes, or None. A hit refreshes the entry's position in the LRU order."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            self.stats["hits"] += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Atomically stores `data` under `key`, then evicts least-recently-used files over the size cap."""
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, self._path(key))
+        with self._lock:
+            self.stats["writes"] += 1
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.stats["evictions"] += 1
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*.pdf"))
+
+
+class ReportRenderer:
+    """Renders PDFs in a process pool, backed by a PDFReportCache, deduplicating in-flight requests."""
+
+    def __init__(self, cache: PDFReportCache, max_workers: int = DEFAULT_WORKERS):
+        self.cache = cache
+        # spawn, not fork: the host process (a Streamlit server) is multi-threaded.
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "renders": 0, "render_seconds": 0.0, "last_render_seconds": 0.0}
+
+    def request(self, results: dict, industry: str) -> Future:
+        """
+        Future resolving to the report's PDF bytes.
+
+        Cached reports resolve immediately; otherwise the render is queued on the pool
+        (or joined, if the same report is already rendering).
+        """
+        key = report_key(results, industry)
+        with self._lock:
+            self.stats["requests"] += 1
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                return pending
+
+        data = self.cache.get(key)
+        if data is not None:
+            done = Future()
+            done.set_result(data)
+            return done
+
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                return pending
+            future = Future()
+            self._in_flight[key] = future
+        render = self._pool.submit(render_report_pdf, dict(results), industry)
+        render.add_done_callback(lambda finished: self._finish(key, future, finished))
+        return future
+
+    def _finish(self, key: str, future: Future, render: Future):
+        try:
+            data, seconds = render.result()
+            self.cache.put(key, data)
+        except Exception as exc:
+            LOGGER.exception("PDF render failed for report %s", key)
+            future.set_exception(exc)
+        else:
+            with self._lock:
+                self.stats["renders"] += 1
+                self.stats["render_seconds"] += seconds
+                self.stats["last_render_seconds"] = seconds
+            future.set_result(data)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def snapshot(self) -> dict:
+        """Combined renderer and cache statistics."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({f"cache_{name}": value for name, value in self.cache.stats.items()})
+        return stats
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
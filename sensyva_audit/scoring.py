@@ -0,0 +1,238 @@
+"""Reference streaming anomaly scorer for multichannel sensor frames.
+
+``EdgeScorer`` is the kind of per-frame scoring the report's "scores sensor
+streams in 10 ms" refers to, small enough to read and to benchmark
+(``benchmarks/bench_scoring.py`` replays a recording through it and reports
+per-frame latency percentiles and sustained frames per second).
+
+Each call to ``score(frame)`` takes one ``(channels, frame_samples)`` block
+and:
+
+1. copies it into a ring buffer of the last ``window_samples`` samples per
+   channel (the capacity is a whole number of frames, so a frame never
+   wraps) and updates running sums for the rolling mean and variance,
+   subtracting the samples it overwrites;
+2. computes time-domain features per channel: the frame's RMS deviation
+   and peak deviation from the rolling mean, in rolling standard deviations;
+3. computes spectral features per channel: log band energies of a
+   Hann-windowed FFT over the last ``fft_size`` samples;
+4. scores the frame as the largest absolute z-score of any feature against
+   an exponentially weighted baseline, which only learns from frames below
+   the alarm threshold so a developing fault does not become the new normal.
+
+Every array the hot path touches is allocated once in ``__init__`` and
+written with ``out=`` arguments, so scoring a frame allocates no per-sample
+Python objects. Running sums are recomputed from the ring once per lap to
+stop floating-point drift.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_SAMPLE_RATE_HZ = 10_000
+DEFAULT_FRAME_SAMPLES = 100
+DEFAULT_WINDOW_SAMPLES = 10_000
+DEFAULT_FFT_SIZE = 1024
+# Band edges as fractions of the Nyquist frequency.
+DEFAULT_BANDS = (0.0, 0.02, 0.05, 0.1, 0.2, 0.4, 1.0)
+DEFAULT_THRESHOLD = 6.0
+DEFAULT_BASELINE_ALPHA = 0.01
+DEFAULT_WARMUP_FRAMES = 200
+
+# Latest reference measurement written by ``python -m benchmarks.bench_scoring --record``.
+LATENCY_FILE = Path(__file__).resolve().parent / "scoring_latency.json"
+
+_EPSILON = 1e-12
+
+
+class EdgeScorer:
+    """Scores fixed-size multichannel frames as they arrive, with every buffer preallocated."""
+
+    def __init__(
+        self,
+        channels: int,
+        sample_rate_hz: float = DEFAULT_SAMPLE_RATE_HZ,
+        frame_samples: int = DEFAULT_FRAME_SAMPLES,
+        window_samples: int = DEFAULT_WINDOW_SAMPLES,
+        fft_size: int = DEFAULT_FFT_SIZE,
+        bands=DEFAULT_BANDS,
+        threshold: float = DEFAULT_THRESHOLD,
+        baseline_alpha: float = DEFAULT_BASELINE_ALPHA,
+        warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+    ):
+        """
+        Args:
+            channels (int): Channels per frame.
+            sample_rate_hz (float): Sample rate of every channel.
+            frame_samples (int): Samples per channel in each frame.
+            window_samples (int): Rolling-statistics window; rounded up to whole frames and at least fft_size.
+            fft_size (int): Samples per spectral transform.
+            bands (tuple): Spectral band edges as fractions of the Nyquist frequency.
+            threshold (float): Score (in baseline standard deviations) above which a frame is an alarm.
+            baseline_alpha (float): Weight of each new normal frame in the feature baseline.
+            warmup_frames (int): Frames used to learn the baseline before any alarm is raised.
+        """
+        self.channels = channels
+        self.sample_rate_hz = float(sample_rate_hz)
+        self.frame_samples = frame_samples
+        self.fft_size = fft_size
+        self.threshold = threshold
+        self.baseline_alpha = baseline_alpha
+        self.warmup_frames = warmup_frames
+        frames_per_lap = -(-max(window_samples, fft_size) // frame_samples)
+        self.capacity = frames_per_lap * frame_samples
+
+        # Ring buffer and running sums for the rolling mean/variance.
+        self._ring = np.zeros((channels, self.capacity))
+        self._position = 0
+        self._filled = 0
+        self._sum = np.zeros(channels)
+        self._sum_squares = np.zeros(channels)
+        self._frame_sum = np.zeros(channels)
+        self._frame_squares = np.zeros(channels)
+
+        # Spectral work buffers and the band-summing matrix (bins x bands).
+        self._taper = np.hanning(fft_size)
+        self._segment = np.zeros((channels, fft_size))
+        self._spectrum = np.zeros((channels, fft_size // 2 + 1), dtype=np.complex128)
+        self._power = np.zeros((channels, fft_size // 2 + 1))
+        self._power_imag = np.zeros_like(self._power)
+        edges = np.unique(np.round(np.asarray(bands) * (fft_size // 2)).astype(int))
+        self._band_matrix = np.zeros((fft_size // 2 + 1, len(edges) - 1))
+        for band, (low, high) in enumerate(zip(edges[:-1], edges[1:])):
+            self._band_matrix[low + (band > 0):high + 1, band] = 1.0
+        self._rfft_out = _rfft_supports_out()
+
+        # Features: [rms deviation, peak deviation, band energies...] per channel, and their baseline.
+        self.features = np.zeros((channels, 2 + self._band_matrix.shape[1]))
+        self._mean = np.zeros(channels)
+        self._std = np.zeros(channels)
+        self._deviation = np.zeros((channels, frame_samples))
+        self._baseline_mean = np.zeros_like(self.features)
+        self._baseline_var = np.ones_like(self.features)
+        self._z = np.zeros_like(self.features)
+        self._delta = np.zeros_like(self.features)
+
+        self.frames = 0
+        self.alarms = 0
+        self.last_score = 0.0
+
+    @property
+    def frame_seconds(self) -> float:
+        """Seconds of signal in one frame: the time budget for scoring it in real time."""
+        return self.frame_samples / self.sample_rate_hz
+
+    def _push(self, frame):
+        start, stop = self._position, self._position + self.frame_samples
+        slot = self._ring[:, start:stop]
+        if self._filled == self.capacity:
+            np.sum(slot, axis=1, out=self._frame_sum)
+            self._sum -= self._frame_sum
+            self._sum_squares -= np.einsum("ij,ij->i", slot, slot)
+        np.copyto(slot, frame)
+        np.sum(slot, axis=1, out=self._frame_sum)
+        self._sum += self._frame_sum
+        self._sum_squares += np.einsum("ij,ij->i", slot, slot)
+        self._filled = min(self._filled + self.frame_samples, self.capacity)
+        self._position = stop % self.capacity
+        if self._position == 0:
+            # Once per lap: recompute the sums exactly so rounding error cannot accumulate.
+            np.sum(self._ring, axis=1, out=self._sum)
+            np.einsum("ij,ij->i", self._ring, self._ring, out=self._sum_squares)
+
+    def _time_features(self, frame):
+        count = self._filled
+        np.divide(self._sum, count, out=self._mean)
+        np.divide(self._sum_squares, count, out=self._std)
+        self._std -= self._mean * self._mean
+        np.maximum(self._std, _EPSILON, out=self._std)
+        np.sqrt(self._std, out=self._std)
+        np.subtract(frame, self._mean[:, None], out=self._deviation)
+        np.einsum("ij,ij->i", self._deviation, self._deviation, out=self._frame_squares)
+        self._frame_squares /= self.frame_samples
+        np.sqrt(self._frame_squares, out=self.features[:, 0])
+        self.features[:, 0] /= self._std
+        np.abs(self._deviation, out=self._deviation)
+        np.max(self._deviation, axis=1, out=self.features[:, 1])
+        self.features[:, 1] /= self._std
+
+    def _spectral_features(self):
+        # The last fft_size samples end at the write position and may wrap around the ring.
+        end = self._position or self.capacity
+        head = min(self.fft_size, end)
+        self._segment[:, self.fft_size - head:] = self._ring[:, end - head:end]
+        if head < self.fft_size:
+            self._segment[:, :self.fft_size - head] = self._ring[:, self.capacity - (self.fft_size - head):]
+        self._segment -= self._mean[:, None]
+        self._segment *= self._taper
+        if self._rfft_out:
+            np.fft.rfft(self._segment, axis=1, out=self._spectrum)
+        else:
+            self._spectrum[...] = np.fft.rfft(self._segment, axis=1)
+        np.square(self._spectrum.real, out=self._power)
+        np.square(self._spectrum.imag, out=self._power_imag)
+        self._power += self._power_imag
+        np.matmul(self._power, self._band_matrix, out=self.features[:, 2:])
+        np.log1p(self.features[:, 2:], out=self.features[:, 2:])
+
+    def score(self, frame) -> float:
+        """
+        Scores one frame.
+
+        Args:
+            frame (np.ndarray): (channels, frame_samples) array of the newest samples.
+
+        Returns:
+            float: Largest absolute feature z-score against the baseline (0.0 during warm-up).
+        """
+        self._push(frame)
+        self._time_features(frame)
+        self._spectral_features()
+        self.frames += 1
+
+        np.subtract(self.features, self._baseline_mean, out=self._delta)
+        np.divide(self._delta, np.sqrt(self._baseline_var, out=self._z), out=self._z)
+        np.abs(self._z, out=self._z)
+        score = float(self._z.max()) if self.frames > self.warmup_frames else 0.0
+
+        if score < self.threshold:
+            # Exponentially weighted mean and variance of normal frames.
+            alpha = 1.0 / self.frames if self.frames <= self.warmup_frames else self.baseline_alpha
+            self._delta *= alpha
+            self._baseline_mean += self._delta
+            self._baseline_var *= 1.0 - alpha
+            np.subtract(self.features, self._baseline_mean, out=self._z)
+            self._z *= self._delta
+            self._baseline_var += self._z
+            np.maximum(self._baseline_var, _EPSILON, out=self._baseline_var)
+        else:
+            self.alarms += 1
+        self.last_score = score
+        return score
+
+
+def _rfft_supports_out() -> bool:
+    try:
+        np.fft.rfft(np.zeros(4), out=np.zeros(3, dtype=np.complex128))
+    except TypeError:
+        return False
+    return True
+
+
+def load_latency_claim(path=LATENCY_FILE):
+    """The recorded reference latency measurement, or None if none has been recorded."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def latency_sentence(claim) -> str:
+    """One sentence citing a recorded latency measurement for the report, or "" without one."""
+    if not claim:
+        return ""
+    return (
+        f"Our reference scorer handles each {claim['channels']}-channel, {claim['frame_ms']:g} ms frame in "
+        f"{claim['p99_ms']:.2f} ms at p99 ({claim['p999_ms']:.2f} ms at p99.9) on one CPU core."
+    )
@@ -0,0 +1,141 @@
+"""Sensitivity sweeps over the audit inputs.
+
+``savings_grid`` evaluates total savings on a dense downtime-hours x
+loss-per-hour grid in one broadcast call to the engine. Grid extents are
+snapped to "nice" bounds so nearby form values share a grid, and
+``interpolate_grid`` turns a what-if slider position into a bilinear lookup
+on that grid instead of a recompute. ``tornado`` ranks which input moves
+total savings most.
+"""
+import math
+
+import numpy as np
+
+from sensyva_audit.engine import (
+    DOWNTIME_REDUCTION_PERCENTAGE,
+    MAINTENANCE_REDUCTION_PERCENTAGE,
+    calculate_impact_batch,
+)
+
+DEFAULT_RESOLUTION = 200
+DEFAULT_SWING = 0.20
+
+# Display labels, in calculate_impact_batch argument order.
+TORNADO_INPUTS = (
+    "Maintenance Budget",
+    "Downtime Hours",
+    "Loss per Hour",
+    "Maintenance Reduction %",
+    "Downtime Reduction %",
+)
+
+
+def nice_ceiling(value: float) -> float:
+    """Smallest number of the form {1, 2, 5} x 10^k that is >= value."""
+    if value <= 0:
+        return 1.0
+    exponent = math.floor(math.log10(value))
+    for step in (1.0, 2.0, 5.0, 10.0):
+        bound = step * 10.0 ** exponent
+        if bound >= value:
+            return bound
+    return 10.0 ** (exponent + 1)
+
+
+def grid_extent(value: float, headroom: float = 2.0) -> float:
+    """Upper grid bound covering `headroom` x the entered value, snapped so nearby values share a grid."""
+    return nice_ceiling(value * headroom)
+
+
+def savings_grid(
+    annual_maintenance_budget_crores: float,
+    max_downtime_hours: float,
+    max_loss_per_hour_lakhs: float,
+    resolution: int = DEFAULT_RESOLUTION,
+    maintenance_reduction: float = MAINTENANCE_REDUCTION_PERCENTAGE,
+    downtime_reduction: float = DOWNTIME_REDUCTION_PERCENTAGE,
+):
+    """
+    Total savings over a resolution x resolution grid of downtime hours x loss per hour.
+
+    Args:
+        annual_maintenance_budget_crores (float): Budget held fixed across the grid.
+        max_downtime_hours (float): Upper bound of the downtime-hours axis (lower bound is 0).
+        max_loss_per_hour_lakhs (float): Upper bound of the loss-per-hour axis (lower bound is 0).
+        resolution (int): Points per axis.
+        maintenance_reduction (float): Fraction of the maintenance budget saved.
+        downtime_reduction (float): Fraction of the downtime cost avoided.
+
+    Returns:
+        dict: "hours" and "loss" axes and a "total" array of shape (len(hours), len(loss)).
+    """
+    hours = np.linspace(0.0, max_downtime_hours, resolution)
+    loss = np.linspace(0.0, max_loss_per_hour_lakhs, resolution)
+    batch = calculate_impact_batch(
+        annual_maintenance_budget_crores, hours[:, None], loss[None, :], maintenance_reduction, downtime_reduction
+    )
+    return {"hours": hours, "loss": loss, "total": batch["total_potential_annual_savings_crores"]}
+
+
+def interpolate_grid(grid, downtime_hours, loss_per_hour_lakhs):
+    """
+    Bilinear lookup of total savings on a precomputed grid.
+
+    Points outside the grid are clamped to its edges. Accepts scalars or arrays.
+    """
+    hours_axis, loss_axis, total = grid["hours"], grid["loss"], grid["total"]
+    h = np.clip(np.asarray(downtime_hours, dtype=np.float64), hours_axis[0], hours_axis[-1])
+    l = np.clip(np.asarray(loss_per_hour_lakhs, dtype=np.float64), loss_axis[0], loss_axis[-1])
+
+    i = np.clip(np.searchsorted(hours_axis, h, side="right") - 1, 0, len(hours_axis) - 2)
+    j = np.clip(np.searchsorted(loss_axis, l, side="right") - 1, 0, len(loss_axis) - 2)
+    th = (h - hours_axis[i]) / (hours_axis[i + 1] - hours_axis[i])
+    tl = (l - loss_axis[j]) / (loss_axis[j + 1] - loss_axis[j])
+
+    top = total[i, j] * (1.0 - tl) + total[i, j + 1] * tl
+    bottom = total[i + 1, j] * (1.0 - tl) + total[i + 1, j + 1] * tl
+    return top * (1.0 - th) + bottom * th
+
+
+def tornado(
+    annual_maintenance_budget_crores: float,
+    unplanned_downtime_hours: float,
+    revenue_loss_per_hour_lakhs: float,
+    swing: float = DEFAULT_SWING,
+    maintenance_reduction: float = MAINTENANCE_REDUCTION_PERCENTAGE,
+    downtime_reduction: float = DOWNTIME_REDUCTION_PERCENTAGE,
+):
+    """
+    One-at-a-time sensitivity of total savings to each input moving by ±swing.
+
+    All 2 x len(TORNADO_INPUTS) scenarios are scored in one batch call. The reductions
+    are the base point of their own bars.
+
+    Returns:
+        list[dict]: One entry per input with "input", "low", "high" and "range" totals,
+        sorted by descending range.
+    """
+    base = np.array(
+        [
+            annual_maintenance_budget_crores,
+            unplanned_downtime_hours,
+            revenue_loss_per_hour_lakhs,
+            maintenance_reduction,
+            downtime_reduction,
+        ],
+        dtype=np.float64,
+    )
+    count = len(TORNADO_INPUTS)
+    scenarios = np.tile(base, (2 * count, 1))
+    rows = np.arange(count)
+    scenarios[rows, rows] *= 1.0 - swing
+    scenarios[rows + count, rows] *= 1.0 + swing
+    # Reduction percentages cannot exceed 100%.
+    scenarios[:, 3:] = np.minimum(scenarios[:, 3:], 1.0)
+
+    totals = calculate_impact_batch(*scenarios.T)["total_potential_annual_savings_crores"]
+    bars = [
+        {"input": label, "low": float(totals[k]), "high": float(totals[k + count]), "range": float(totals[k + count] - totals[k])}
+        for k, label in enumerate(TORNADO_INPUTS)
+    ]
+    return sorted(bars, key=lambda bar: abs(bar["range"]), reverse=True)
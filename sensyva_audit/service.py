@@ -0,0 +1,300 @@
+"""Headless JSON API for the audit calculation.
+
+A dependency-free HTTP service (standard library server plus the NumPy
+engine; Streamlit is never imported) exposing:
+
+    GET  /healthz            liveness probe and cache statistics
+    POST /v1/impact          one scenario  -> the calculate_impact dict
+    POST /v1/impact/batch    up to MAX_BATCH_SCENARIOS scenarios -> columnar results and totals
+
+A batch body is either {"scenarios": [{...}, ...]} or columnar
+{"annual_maintenance_budget_crores": [...], ...}. Either endpoint accepts
+optional "industry" and "asset_class" fields (per scenario, per column, or
+one string for the whole batch); their reduction coefficients come from the
+same hot-reloaded CoefficientStore as the app, and unknown or missing
+industries fall back to "Other". Responses are kept in an LRU cache keyed on
+the normalized inputs (values rounded to NORMALIZE_DECIMALS places), the
+resolved coefficients and the coefficient table version, so 50, 50.0 and
+"50.0000001" share an entry while a coefficient edit never serves stale
+results.
+
+Run with ``python -m sensyva_audit.service --port 8502 [--coefficients path]``.
+"""
+import argparse
+import hashlib
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from sensyva_audit.cache import ResultCache
+from sensyva_audit.coefficients import COEFFICIENT_NAMES, COEFFICIENTS_FILE, FALLBACK_INDUSTRY, CoefficientStore
+from sensyva_audit.engine import INPUT_COLUMNS, OUTPUT_COLUMNS, calculate_impact, calculate_impact_batch
+from sensyva_audit.industry import INDUSTRY_CONTEXT
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_BATCH_SCENARIOS = 100_000
+MAX_BODY_BYTES = 64 * 1024 * 1024
+NORMALIZE_DECIMALS = 6
+SINGLE_CACHE_SIZE = 10_000
+BATCH_CACHE_SIZE = 32
+LABEL_FIELDS = ("industry", "asset_class")
+
+
+class RequestError(ValueError):
+    """A client error, reported as a JSON body with the given HTTP status."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _validated(values, name: str, ndim: int = 0):
+    """
+    Float64 array of `values`, rejecting anything non-finite or not greater than zero like the audit form.
+
+    Args:
+        values: A JSON number (ndim 0) or list of numbers (ndim 1).
+        name (str): Field name used in error messages.
+        ndim (int): Required number of dimensions; nested lists and objects are rejected.
+    """
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise RequestError(f"{name} must be numeric.") from None
+    if array.ndim != ndim:
+        raise RequestError(f"{name} must be {'a number' if ndim == 0 else 'a flat list of numbers'}.")
+    invalid = ~(np.isfinite(array) & (array > 0))
+    if invalid.any():
+        where = f" (first at index {int(np.flatnonzero(invalid)[0])})" if array.ndim else ""
+        raise RequestError(f"{name} must be a number greater than zero{where}.")
+    return np.round(array, NORMALIZE_DECIMALS)
+
+
+def _label(value, name: str):
+    """A stripped industry or asset class name, or None when absent or blank."""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise RequestError(f"{name} must be a string.")
+    return value.strip() or None
+
+
+def _labels(values, name: str, count: int):
+    """Per-scenario names from a list, one string applied to every scenario, or None when absent."""
+    if values is None or isinstance(values, str):
+        label = _label(values, name)
+        return None if label is None else [label] * count
+    if not isinstance(values, list) or len(values) != count:
+        raise RequestError(f"{name} must be a string or a list with one entry per scenario.")
+    return [_label(value, name) for value in values]
+
+
+def _canonical_industry(industry, table):
+    """The table's (or the app's) spelling of `industry`, ignoring case, as the CLI and portfolio audit do."""
+    if industry is None:
+        return FALLBACK_INDUSTRY
+    folded = industry.casefold()
+    return next((name for name in (*table.industries, *INDUSTRY_CONTEXT) if name.casefold() == folded), industry)
+
+
+def _scenario_labels(payload, count: int) -> dict:
+    """Industry and asset class per scenario (None where not given) from a batch payload."""
+    if "scenarios" in payload:
+        return {
+            field: _labels([scenario.get(field) for scenario in payload["scenarios"]], field, count)
+            for field in LABEL_FIELDS
+        }
+    return {field: _labels(payload.get(field), field, count) for field in LABEL_FIELDS}
+
+
+def _scenario_columns(payload):
+    """Normalized input columns from a batch payload in either accepted shape."""
+    if not isinstance(payload, dict):
+        raise RequestError("Request body must be a JSON object.")
+    if "scenarios" in payload:
+        scenarios = payload["scenarios"]
+        if not isinstance(scenarios, list):
+            raise RequestError("scenarios must be a list of objects.")
+        try:
+            raw = {column: [scenario[column] for scenario in scenarios] for column in INPUT_COLUMNS}
+        except (KeyError, TypeError) as exc:
+            raise RequestError(f"Every scenario needs {', '.join(INPUT_COLUMNS)} (missing {exc}).") from None
+    else:
+        missing = [column for column in INPUT_COLUMNS if column not in payload]
+        if missing:
+            raise RequestError(f"Missing column(s): {', '.join(missing)}.")
+        raw = {column: payload[column] for column in INPUT_COLUMNS}
+
+    count = len(raw[INPUT_COLUMNS[0]]) if isinstance(raw[INPUT_COLUMNS[0]], list) else -1
+    if count < 0 or any(not isinstance(raw[column], list) or len(raw[column]) != count for column in INPUT_COLUMNS):
+        raise RequestError("Batch columns must be lists of equal length.")
+    if count > MAX_BATCH_SCENARIOS:
+        raise RequestError(f"A batch may hold at most {MAX_BATCH_SCENARIOS:,} scenarios.", status=413)
+    return [_validated(raw[column], column, ndim=1) for column in INPUT_COLUMNS]
+
+
+class AuditService:
+    """Request handling and caching, independent of the HTTP transport."""
+
+    def __init__(
+        self,
+        single_cache_size: int = SINGLE_CACHE_SIZE,
+        batch_cache_size: int = BATCH_CACHE_SIZE,
+        coefficients: CoefficientStore = None,
+    ):
+        """
+        Args:
+            single_cache_size (int): Maximum cached single-scenario responses.
+            batch_cache_size (int): Maximum cached batch responses.
+            coefficients (CoefficientStore): Source of the per-industry reductions; defaults to the packaged file.
+        """
+        self.coefficients = coefficients or CoefficientStore(COEFFICIENTS_FILE)
+        # Responses are pure functions of the normalized inputs and the coefficient table version (both in the
+        # key), so entries never expire.
+        self.single_cache = ResultCache(single_cache_size, ttl_seconds=None)
+        self.batch_cache = ResultCache(batch_cache_size, ttl_seconds=None)
+
+    def single(self, payload) -> bytes:
+        if not isinstance(payload, dict):
+            raise RequestError("Request body must be a JSON object.")
+        missing = [column for column in INPUT_COLUMNS if column not in payload]
+        if missing:
+            raise RequestError(f"Missing field(s): {', '.join(missing)}.")
+        inputs = tuple(float(_validated(payload[column], column)) for column in INPUT_COLUMNS)
+        table = self.coefficients.table
+        industry = _canonical_industry(_label(payload.get("industry"), "industry"), table)
+        coefficients = table.coefficients(industry, _label(payload.get("asset_class"), "asset_class"))
+        key = (table.key, *(coefficients[name] for name in COEFFICIENT_NAMES), *inputs)
+        body = self.single_cache.get(key)
+        if body is None:
+            results = calculate_impact(*inputs, **coefficients)
+            body = json.dumps(
+                {**results, **coefficients, "industry": industry, "coefficients_version": table.key}
+            ).encode("utf-8")
+            self.single_cache.put(key, body)
+        return body
+
+    def batch(self, payload) -> bytes:
+        columns = _scenario_columns(payload)
+        labels = _scenario_labels(payload, columns[0].size)
+        table = self.coefficients.table
+        if labels["industry"] is None and labels["asset_class"] is None:
+            # The common unlabelled batch skips the per-scenario name lookup.
+            fallback = table.coefficients(FALLBACK_INDUSTRY)
+            reductions = {name: np.full(columns[0].size, fallback[name]) for name in COEFFICIENT_NAMES}
+        else:
+            industries = labels["industry"] or [None] * columns[0].size
+            by_label = {label: _canonical_industry(label, table) for label in set(industries)}
+            reductions = table.lookup([by_label[label] for label in industries], labels["asset_class"])
+        coefficients = {name: reductions[name] for name in COEFFICIENT_NAMES}
+        digest = hashlib.blake2b(table.key.encode("utf-8"), digest_size=16)
+        for column in (*columns, *coefficients.values()):
+            # Raw bytes alone would let arrays of another shape or dtype with the same buffer share a key.
+            digest.update(f"{column.dtype.str}{column.shape};".encode("ascii"))
+            digest.update(column.tobytes())
+        key = digest.digest()
+        body = self.batch_cache.get(key)
+        if body is None:
+            results = calculate_impact_batch(*columns, **coefficients)
+            body = json.dumps(
+                {
+                    "count": int(columns[0].size),
+                    "results": {name: results[name].tolist() for name in OUTPUT_COLUMNS},
+                    "totals": {name: float(results[name].sum()) for name in OUTPUT_COLUMNS},
+                    "coefficients_version": table.key,
+                }
+            ).encode("utf-8")
+            self.batch_cache.put(key, body)
+        return body
+
+    def health(self) -> bytes:
+        return json.dumps(
+            {"status": "ok", "cache": {"single": self.single_cache.snapshot(), "batch": self.batch_cache.snapshot()}}
+        ).encode("utf-8")
+
+
+class AuditRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the server's AuditService; keep-alive is supported."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "SensyvaAudit/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY keep-alive clients stall on delayed ACKs.
+    disable_nagle_algorithm = True
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send(status, json.dumps({"error": message}).encode("utf-8"))
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, self.server.service.health())
+        else:
+            self._send_error(404, f"No route for GET {self.path}")
+
+    def do_POST(self):
+        routes = {"/v1/impact": self.server.service.single, "/v1/impact/batch": self.server.service.batch}
+        handler = routes.get(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_error(413, "Request body too large.")
+            return
+        raw = self.rfile.read(length)
+        if handler is None:
+            self._send_error(404, f"No route for POST {self.path}")
+            return
+        try:
+            self._send(200, handler(json.loads(raw or b"null")))
+        except json.JSONDecodeError as exc:
+            self._send_error(400, f"Invalid JSON: {exc}")
+        except RequestError as exc:
+            self._send_error(exc.status, str(exc))
+        except Exception:
+            LOGGER.exception("Unhandled error serving %s", self.path)
+            self._send_error(500, "Internal server error.")
+
+    def log_message(self, format, *args):
+        LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8502, service: AuditService = None) -> ThreadingHTTPServer:
+    """Builds (but does not start) a threaded HTTP server bound to host:port."""
+    server = ThreadingHTTPServer((host, port), AuditRequestHandler)
+    server.daemon_threads = True
+    server.service = service or AuditService()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Sensyva audit calculation as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument(
+        "--coefficients",
+        default=COEFFICIENTS_FILE,
+        help="Per-industry coefficients JSON, re-read when it changes (default: the packaged coefficients.json).",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = make_server(args.host, args.port, AuditService(coefficients=CoefficientStore(args.coefficients)))
+    LOGGER.info("Sensyva audit API listening on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
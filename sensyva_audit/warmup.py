@@ -0,0 +1,196 @@
+"""Background cache warm-up from the scenarios users actually ran.
+
+After a deploy every cache in the app starts empty and the first visitors
+pay for each calculation and chart in full. ``CacheWarmup`` replays the most
+common recorded scenarios through the app's own cached functions on a
+daemon thread, so the server serves requests straight away while the
+caches fill behind it.
+
+``common_scenarios`` ranks the (industry, budget, downtime, loss)
+combinations of a history source by frequency. Inputs are quantized the
+same way ``ResultCache`` quantizes its keys, so spellings of one scenario
+that would share a cache entry count together. A source is either
+
+* the SQLite lead store (its ``data_gap_leads`` table records the scenario
+  behind every lead), or
+* a CSV/Parquet file with the ``INPUT_COLUMNS`` and optionally ``industry``,
+
+read in chunks either way. Rows the audit form would reject (a missing or
+non-positive input) are skipped.
+
+Each warm-up step is a callable taking (industry, budget, downtime hours,
+loss per hour) and an optional entry limit, usually the size of the cache
+it fills: there is no point computing more entries than the cache keeps.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from sensyva_audit.cache import DEFAULT_PRECISION, quantize
+from sensyva_audit.engine import INPUT_COLUMNS
+from sensyva_audit.portfolio import DEFAULT_CHUNK_ROWS, INDUSTRY_COLUMN, iter_table_chunks
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WARMUP_SCENARIOS = 256
+THREAD_NAME = "sensyva-cache-warmup"
+DEFAULT_INDUSTRY = "Other"
+COUNT_COLUMN = "count"
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+# data_gap_leads column -> history column.
+LEAD_STORE_COLUMNS = {
+    "industry": INDUSTRY_COLUMN,
+    "budget_crores": "annual_maintenance_budget_crores",
+    "downtime_hours": "unplanned_downtime_hours",
+    "loss_per_hour_lakhs": "revenue_loss_per_hour_lakhs",
+}
+HISTORY_COLUMNS = (INDUSTRY_COLUMN, *INPUT_COLUMNS)
+
+
+def iter_history_chunks(source, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """Yields DataFrame chunks with HISTORY_COLUMNS from a lead store or a CSV/Parquet history file."""
+    import pandas as pd
+
+    if Path(source).suffix.lower() in SQLITE_SUFFIXES:
+        connection = sqlite3.connect(f"file:{Path(source).resolve()}?mode=ro", uri=True)
+        try:
+            exists = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'data_gap_leads'").fetchone()
+            if not exists:
+                return
+            query = f"SELECT {', '.join(LEAD_STORE_COLUMNS)} FROM data_gap_leads"
+            for chunk in pd.read_sql_query(query, connection, chunksize=chunk_rows):
+                yield chunk.rename(columns=LEAD_STORE_COLUMNS)
+        finally:
+            connection.close()
+        return
+    for chunk, _ in iter_table_chunks(source, set(HISTORY_COLUMNS), chunk_rows, dtype={INDUSTRY_COLUMN: "string"}):
+        missing = [column for column in INPUT_COLUMNS if column not in chunk]
+        if missing:
+            raise ValueError(f"History file {source} is missing column(s): {', '.join(missing)}.")
+        if INDUSTRY_COLUMN not in chunk:
+            chunk[INDUSTRY_COLUMN] = DEFAULT_INDUSTRY
+        yield chunk
+
+
+def common_scenarios(
+    source,
+    limit: int = DEFAULT_WARMUP_SCENARIOS,
+    quantization: str = "decimals",
+    precision: int = DEFAULT_PRECISION,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+):
+    """
+    The most frequent scenarios in a history source.
+
+    Args:
+        source (str | Path): Lead store (.sqlite/.sqlite3/.db) or CSV/Parquet history file.
+        limit (int): Scenarios returned at most.
+        quantization (str): ResultCache quantization applied to the inputs before counting.
+        precision (int): ResultCache precision applied to the inputs before counting.
+        chunk_rows (int): Rows read at once.
+
+    Returns:
+        pd.DataFrame: HISTORY_COLUMNS plus COUNT_COLUMN, most common first.
+    """
+    import numpy as np
+    import pandas as pd
+
+    counts = []
+    for chunk in iter_history_chunks(source, chunk_rows):
+        inputs = chunk[list(INPUT_COLUMNS)].apply(pd.to_numeric, errors="coerce")
+        valid = (inputs > 0).all(axis=1) & np.isfinite(inputs).all(axis=1)
+        if not valid.any():
+            continue
+        frame = pd.DataFrame(
+            [quantize(row, quantization, precision) for row in inputs[valid].itertuples(index=False)],
+            columns=list(INPUT_COLUMNS),
+        )
+        frame.insert(0, INDUSTRY_COLUMN, chunk.loc[valid, INDUSTRY_COLUMN].fillna(DEFAULT_INDUSTRY).astype(str).to_numpy())
+        counts.append(frame.value_counts())
+    if not counts:
+        return pd.DataFrame(columns=[*HISTORY_COLUMNS, COUNT_COLUMN])
+    # Each chunk's top entries are not the overall top, so the per-chunk counts are summed first.
+    totals = pd.concat(counts).groupby(level=list(range(len(HISTORY_COLUMNS)))).sum()
+    top = totals.sort_values(ascending=False, kind="stable").head(limit)
+    return top.rename(COUNT_COLUMN).reset_index()
+
+
+class CacheWarmup:
+    """Replays common scenarios through cache-priming steps on a daemon thread."""
+
+    def __init__(self, source, steps: dict, limit: int = DEFAULT_WARMUP_SCENARIOS, **scenario_options):
+        """
+        Args:
+            source (str | Path): History source for common_scenarios.
+            steps (dict): Step name -> (callable taking industry, budget, hours and loss, entry limit or None).
+            limit (int): Scenarios replayed at most.
+            **scenario_options: quantization, precision or chunk_rows for common_scenarios.
+        """
+        self.source = source
+        self.steps = steps
+        self.limit = limit
+        self.scenario_options = scenario_options
+        self.scenarios = 0
+        self.warmed = dict.fromkeys(steps, 0)
+        self.failed = 0
+        self.seconds = None
+        self.error = None
+        self.done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=THREAD_NAME, daemon=True)
+
+    def start(self) -> "CacheWarmup":
+        """Starts the warm-up and returns immediately."""
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float = None) -> bool:
+        """Blocks until the warm-up has finished (or `timeout` passed); returns whether it finished."""
+        return self.done.wait(timeout)
+
+    @property
+    def entries(self) -> int:
+        """Cache entries primed so far, over every step."""
+        return sum(self.warmed.values())
+
+    def summary(self) -> str:
+        """One line describing what the warm-up did."""
+        if not self.done.is_set():
+            return f"Cache warm-up running: {self.entries:,} entries primed so far"
+        if self.error is not None:
+            return f"Cache warm-up failed after {self.seconds:.2f} s: {self.error}"
+        steps = ", ".join(f"{count:,} {name}" for name, count in self.warmed.items())
+        failed = f", {self.failed:,} failed" if self.failed else ""
+        return f"Cache warm-up primed {self.entries:,} entries ({steps}{failed}) from {self.scenarios:,} scenarios in {self.seconds:.2f} s"
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            if not Path(self.source).is_file():
+                LOGGER.info("No scenario history at %s; skipping the cache warm-up", self.source)
+                return
+            scenarios = common_scenarios(self.source, self.limit, **self.scenario_options)
+            self.scenarios = len(scenarios)
+            rows = scenarios[list(HISTORY_COLUMNS)].itertuples(index=False)
+            for position, (industry, *inputs) in enumerate(rows):
+                # Plain floats, so the keys match what the form passes to the same cached functions.
+                scenario = (str(industry), *(float(value) for value in inputs))
+                for name, (step, step_limit) in self.steps.items():
+                    if step_limit is not None and position >= step_limit:
+                        continue
+                    # One bad scenario must not stop the warm-up.
+                    try:
+                        step(*scenario)
+                        self.warmed[name] += 1
+                    except Exception as exc:
+                        self.failed += 1
+                        LOGGER.warning("Cache warm-up step %s failed for %s: %s", name, scenario, exc)
+        except Exception as exc:
+            self.error = str(exc)
+            LOGGER.exception("Cache warm-up from %s failed", self.source)
+        finally:
+            self.seconds = time.perf_counter() - started
+            self.done.set()
+        if self.error is None and self.scenarios:
+            LOGGER.info(self.summary())
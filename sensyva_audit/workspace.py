@@ -0,0 +1,280 @@
+"""Named what-if scenarios whose derived values are recomputed only when their inputs change.
+
+A ``DependencyGraph`` holds input values and derived nodes, each a function
+of other nodes. Reading a node first brings its dependencies up to date,
+then recomputes it only if one of them changed since the node was last
+computed; otherwise the stored value is reused and the read counts as
+skipped. Every node carries a version that is bumped only when its value
+actually changes, so a recomputation that lands on the same number (or an
+input set to the value it already had) stops there instead of invalidating
+everything downstream.
+
+``scenario_graph`` lays the engine's formulas out as such a graph, one node
+per intermediate quantity, so that changing the maintenance budget
+recomputes the maintenance savings and the total but leaves the
+downtime-cost chain and the chart frame alone. The two reduction
+coefficients are inputs too, so switching to another industry's
+coefficients recomputes only what they feed. The arithmetic is the same as
+``calculate_impact_batch``, so a scenario's results match the form's.
+
+``ScenarioWorkspace`` keeps several named scenarios side by side, one graph
+each, and reports after every ``evaluate()`` how many nodes it recomputed
+and how many it skipped.
+"""
+from sensyva_audit.engine import (
+    DOWNTIME_REDUCTION_PERCENTAGE,
+    INPUT_COLUMNS,
+    MAINTENANCE_REDUCTION_PERCENTAGE,
+    OUTPUT_COLUMNS,
+)
+from sensyva_audit.formatting import downtime_chart_frame
+
+# Nodes every scenario exposes to the workspace.
+SCENARIO_OUTPUTS = ("results", "downtime_chart")
+# Coefficient inputs of every scenario, named like calculate_impact's keyword arguments.
+REDUCTION_INPUTS = ("maintenance_reduction", "downtime_reduction")
+
+
+def _unchanged(old, new) -> bool:
+    """True only when `new` is known to equal `old`; arrays and frames count as changed."""
+    if old is new:
+        return True
+    try:
+        return (old == new) is True
+    except (TypeError, ValueError):
+        return False
+
+
+class DependencyGraph:
+    """Input values and derived nodes, recomputed lazily and only when a dependency changed."""
+
+    def __init__(self):
+        self._functions = {}
+        self._dependencies = {}
+        self._values = {}
+        self._versions = {}
+        # Dependency versions each derived node was last computed from.
+        self._computed_from = {}
+        # Derived nodes already counted in stats, so a node read by several dependants counts once.
+        self._counted = set()
+        self.stats = {"computed": 0, "skipped": 0}
+
+    def __contains__(self, name) -> bool:
+        return name in self._versions or name in self._functions
+
+    @property
+    def derived(self) -> tuple:
+        """Names of the derived (non-input) nodes."""
+        return tuple(self._functions)
+
+    def set_input(self, name: str, value):
+        """Sets input `name`; its dependants are invalidated only if the value differs."""
+        if name in self._functions:
+            raise ValueError(f"{name!r} is a derived node, not an input.")
+        if name in self._versions and _unchanged(self._values[name], value):
+            return
+        self._values[name] = value
+        self._versions[name] = self._versions.get(name, 0) + 1
+
+    def add_node(self, name: str, function, *dependencies: str):
+        """
+        Adds a derived node.
+
+        Args:
+            name (str): Node name.
+            function (callable): Called with the dependencies' values, in order.
+            *dependencies (str): Names of the inputs or nodes `function` reads; they must already exist.
+        """
+        if name in self:
+            raise ValueError(f"Node {name!r} already exists.")
+        missing = [dependency for dependency in dependencies if dependency not in self]
+        if missing:
+            raise ValueError(f"Node {name!r} depends on unknown node(s): {', '.join(missing)}")
+        self._functions[name] = function
+        self._dependencies[name] = dependencies
+
+    def get(self, name: str):
+        """Value of `name`, recomputing it (and anything it depends on) only where needed."""
+        if name not in self._functions:
+            if name not in self._versions:
+                raise KeyError(name)
+            return self._values[name]
+        dependencies = self._dependencies[name]
+        arguments = [self.get(dependency) for dependency in dependencies]
+        seen = tuple(self._versions[dependency] for dependency in dependencies)
+        if self._computed_from.get(name) == seen:
+            if name not in self._counted:
+                self._counted.add(name)
+                self.stats["skipped"] += 1
+            return self._values[name]
+
+        value = self._functions[name](*arguments)
+        self._counted.add(name)
+        self.stats["computed"] += 1
+        self._computed_from[name] = seen
+        if name not in self._versions or not _unchanged(self._values[name], value):
+            self._values[name] = value
+            self._versions[name] = self._versions.get(name, 0) + 1
+        return self._values[name]
+
+    def reset_stats(self):
+        """Zeroes the computed/skipped counters, e.g. at the start of an interaction."""
+        self.stats = {"computed": 0, "skipped": 0}
+        self._counted.clear()
+
+
+def _results(
+    budget, hours, loss_lakhs, maintenance_reduction, downtime_reduction, downtime_cost, maintenance_savings, downtime_savings, total
+):
+    results = dict(zip(INPUT_COLUMNS, (budget, hours, loss_lakhs)))
+    results.update(zip(OUTPUT_COLUMNS, (maintenance_savings, downtime_savings, total, downtime_cost)))
+    results["maintenance_reduction_percentage"] = round(maintenance_reduction * 100)
+    results["downtime_reduction_percentage"] = round(downtime_reduction * 100)
+    return results
+
+
+def _downtime_chart(downtime_cost, downtime_savings):
+    return downtime_chart_frame(
+        {"estimated_total_downtime_cost_crores": downtime_cost, "potential_downtime_savings_crores": downtime_savings}
+    )
+
+
+def scenario_graph(
+    annual_maintenance_budget_crores: float,
+    unplanned_downtime_hours: float,
+    revenue_loss_per_hour_lakhs: float,
+    maintenance_reduction: float = MAINTENANCE_REDUCTION_PERCENTAGE,
+    downtime_reduction: float = DOWNTIME_REDUCTION_PERCENTAGE,
+) -> DependencyGraph:
+    """
+    The impact calculation for one site as a DependencyGraph.
+
+    Inputs are named after INPUT_COLUMNS and REDUCTION_INPUTS; "results" holds the same dict as
+    calculate_impact and "downtime_chart" the downtime_chart_frame DataFrame.
+    """
+    budget, hours, loss_lakhs = INPUT_COLUMNS
+    maintenance, downtime = REDUCTION_INPUTS
+    graph = DependencyGraph()
+    graph.set_input(budget, float(annual_maintenance_budget_crores))
+    graph.set_input(hours, float(unplanned_downtime_hours))
+    graph.set_input(loss_lakhs, float(revenue_loss_per_hour_lakhs))
+    graph.set_input(maintenance, float(maintenance_reduction))
+    graph.set_input(downtime, float(downtime_reduction))
+
+    graph.add_node("revenue_loss_per_hour_crores", lambda loss: loss / 100.0, loss_lakhs)
+    graph.add_node("downtime_cost", lambda hours, loss: hours * loss, hours, "revenue_loss_per_hour_crores")
+    graph.add_node("maintenance_savings", lambda budget, reduction: budget * reduction, budget, maintenance)
+    graph.add_node("downtime_savings", lambda cost, reduction: cost * reduction, "downtime_cost", downtime)
+    graph.add_node("total_savings", lambda maintenance, downtime: maintenance + downtime, "maintenance_savings", "downtime_savings")
+    graph.add_node(
+        "results",
+        _results,
+        budget,
+        hours,
+        loss_lakhs,
+        maintenance,
+        downtime,
+        "downtime_cost",
+        "maintenance_savings",
+        "downtime_savings",
+        "total_savings",
+    )
+    graph.add_node("downtime_chart", _downtime_chart, "downtime_cost", "downtime_savings")
+    return graph
+
+
+class ScenarioWorkspace:
+    """Several named scenarios side by side, each an incrementally recomputed scenario_graph."""
+
+    def __init__(self):
+        self.scenarios = {}
+        self.last_stats = {"computed": 0, "skipped": 0}
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def __contains__(self, name) -> bool:
+        return name in self.scenarios
+
+    @property
+    def names(self) -> list:
+        return list(self.scenarios)
+
+    def add(
+        self,
+        name: str,
+        annual_maintenance_budget_crores: float,
+        unplanned_downtime_hours: float,
+        revenue_loss_per_hour_lakhs: float,
+        **coefficients,
+    ):
+        """Adds scenario `name` with the given inputs and, optionally, REDUCTION_INPUTS coefficients."""
+        name = name.strip()
+        if not name:
+            raise ValueError("Scenario names cannot be empty.")
+        if name in self.scenarios:
+            raise ValueError(f"A scenario named {name!r} already exists.")
+        self.scenarios[name] = scenario_graph(
+            annual_maintenance_budget_crores, unplanned_downtime_hours, revenue_loss_per_hour_lakhs, **coefficients
+        )
+
+    def remove(self, name: str):
+        """Drops scenario `name`."""
+        del self.scenarios[name]
+
+    def inputs(self, name: str) -> dict:
+        """Current inputs of scenario `name`, keyed by INPUT_COLUMNS."""
+        graph = self.scenarios[name]
+        return {column: graph.get(column) for column in INPUT_COLUMNS}
+
+    def update(self, name: str, **inputs):
+        """Sets any of INPUT_COLUMNS or REDUCTION_INPUTS on scenario `name`; unchanged values invalidate nothing."""
+        unknown = set(inputs) - set(INPUT_COLUMNS) - set(REDUCTION_INPUTS)
+        if unknown:
+            raise ValueError(f"Unknown scenario input(s): {', '.join(sorted(unknown))}")
+        graph = self.scenarios[name]
+        for column, value in inputs.items():
+            graph.set_input(column, float(value))
+
+    def set_coefficients(self, **coefficients):
+        """Applies REDUCTION_INPUTS coefficients to every scenario, e.g. after the industry changes."""
+        for name in self.scenarios:
+            self.update(name, **coefficients)
+
+    def evaluate(self, outputs=SCENARIO_OUTPUTS) -> dict:
+        """
+        Brings every scenario's outputs up to date.
+
+        Args:
+            outputs (tuple): Node names to read from each scenario.
+
+        Returns:
+            dict: Scenario name -> {output name: value}. Counts of recomputed and skipped
+            nodes for this call are left in last_stats.
+        """
+        stats = {"computed": 0, "skipped": 0}
+        evaluated = {}
+        for name, graph in self.scenarios.items():
+            graph.reset_stats()
+            evaluated[name] = {output: graph.get(output) for output in outputs}
+            stats["computed"] += graph.stats["computed"]
+            stats["skipped"] += graph.stats["skipped"]
+        self.last_stats = stats
+        return evaluated
+
+    def comparison_frame(self, evaluated: dict):
+        """
+        Scenarios as rows, inputs and outputs as columns.
+
+        Args:
+            evaluated (dict): Output of evaluate().
+
+        Returns:
+            pd.DataFrame: INPUT_COLUMNS and OUTPUT_COLUMNS indexed by "Scenario".
+        """
+        import pandas as pd
+
+        rows = {name: {column: values["results"][column] for column in INPUT_COLUMNS + OUTPUT_COLUMNS} for name, values in evaluated.items()}
+        frame = pd.DataFrame.from_dict(rows, orient="index", columns=list(INPUT_COLUMNS + OUTPUT_COLUMNS))
+        frame.index.name = "Scenario"
+        return frame